@@ -15,6 +15,7 @@ from multiprocessing import cpu_count
 from pathlib import Path
 from typing import Final
 
+from rflx import process_pool
 from rflx.common import assert_never
 from rflx.converter import iana
 from rflx.error import (
@@ -36,6 +37,9 @@ from rflx.version import version
 DEFAULT_PREFIX = "RFLX"
 DOC_DIR: Final[Path] = Path(str(importlib.resources.files("rflx"))) / "doc"
 
+# Caches whose statistics are reported at the end of the run
+_REPORTED_CACHES: list[Cache] = []
+
 py_logging.basicConfig(level=py_logging.INFO, format="%(message)s")
 
 
@@ -144,11 +148,24 @@ def main(  # noqa: PLR0915
         action="store_true",
         help=("ignore verification cache"),
     )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help=("report the hits and misses of the caches and the reuse of worker processes"),
+    )
     parser.add_argument(
         "--no-verification",
         action="store_true",
         help=("skip time-consuming verification of model"),
     )
+    parser.add_argument(
+        "--summarize-paths",
+        action="store_true",
+        help=(
+            "verify messages without enumerating all paths (properties which cannot be proven"
+            " this way are reported as warnings)"
+        ),
+    )
     parser.add_argument(
         "--max-errors",
         action=UniqueStore,
@@ -163,7 +180,10 @@ def main(  # noqa: PLR0915
         type=int,
         default=cpu_count(),
         metavar=("NUM"),
-        help="parallelize proofs among NUM workers (default: %(default)d)",
+        help=(
+            "parallelize parsing, proofs and validation among NUM workers"
+            " (default: %(default)d)"
+        ),
     )
     parser.add_argument(
         "--unsafe",
@@ -473,12 +493,22 @@ def main(  # noqa: PLR0915
             else:
                 e.print_messages()
             return 1
+        finally:
+            if args.cache_stats:
+                print_statistics()
 
     return 0
 
 
 def check(args: argparse.Namespace) -> None:
-    parse(args.files, args.no_caching, args.no_verification, args.workers)
+    parse(
+        args.files,
+        args.no_caching,
+        args.no_verification,
+        args.workers,
+        summarize_paths=args.summarize_paths,
+        cache_stats=args.cache_stats,
+    )
 
 
 def generate(args: argparse.Namespace) -> None:
@@ -497,6 +527,8 @@ def generate(args: argparse.Namespace) -> None:
         args.no_verification,
         args.workers,
         args.integration_files_dir,
+        args.summarize_paths,
+        args.cache_stats,
     )
 
     Generator(
@@ -531,11 +563,15 @@ def parse(
     no_verification: bool,
     workers: int = 1,
     integration_files_dir: Path | None = None,
+    summarize_paths: bool = False,
+    cache_stats: bool = False,
 ) -> tuple[Model, Integration]:
+    verification_cache = cache(no_caching, no_verification, cache_stats)
     parser = Parser(
-        cache(no_caching, no_verification),
+        verification_cache,
         workers=workers,
         integration_files_dir=integration_files_dir,
+        summarize_paths=summarize_paths,
     )
     error = RecordFluxError()
     present_files = []
@@ -557,15 +593,48 @@ def parse(
     except RecordFluxError as e:
         error.extend(e.entries)
 
+    if cache_stats:
+        _REPORTED_CACHES.append(verification_cache)
+
     error.propagate()
     return model, parser.get_integration()
 
 
+def print_statistics() -> None:
+    """Print the statistics of the caches used in this run and of the process pools."""
+    # The changes of the proof cache in the processes of the pools are written when the processes
+    # exit
+    process_pool.shutdown()
+    for c in _REPORTED_CACHES:
+        print_cache_statistics(c)
+    _REPORTED_CACHES.clear()
+    print(f"Process pool statistics: {process_pool.statistics()}")  # noqa: T201
+
+
+def print_cache_statistics(cache: Cache) -> None:
+    specifications = cache.specifications
+    proofs = cache.proofs
+    for name, statistics in [
+        ("specifications", specifications.statistics() if specifications else None),
+        ("verification", cache.statistics()),
+        ("proofs", proofs.statistics() if proofs else None),
+    ]:
+        print(  # noqa: T201
+            f"Cache statistics ({name}): {statistics if statistics is not None else 'disabled'}",
+        )
+
+
 def graph(args: argparse.Namespace) -> None:
     if not args.output_directory.is_dir():
         fail(f'directory not found: "{args.output_directory}"')
 
-    model, _ = parse(args.files, args.no_caching, args.no_verification)
+    model, _ = parse(
+        args.files,
+        args.no_caching,
+        args.no_verification,
+        summarize_paths=args.summarize_paths,
+        cache_stats=args.cache_stats,
+    )
 
     for d in model.declarations:
         filename = args.output_directory.joinpath(d.identifier.flat).with_suffix(f".{args.format}")
@@ -604,6 +673,7 @@ def validate(args: argparse.Namespace) -> None:
             args.checksum_module,
             cache(args.no_caching, args.no_verification),
             split_disjunctions=args.split_disjunctions,
+            workers=args.workers,
         ).validate(
             identifier,
             args.invalid_sample_path,
@@ -744,5 +814,9 @@ def vim_syntax_file() -> Traversable:
     return path
 
 
-def cache(no_caching: bool, no_verification: bool) -> Cache:
-    return NeverVerify() if no_verification else (AlwaysVerify() if no_caching else Cache())
+def cache(no_caching: bool, no_verification: bool, record_statistics: bool = False) -> Cache:
+    return (
+        NeverVerify()
+        if no_verification
+        else (AlwaysVerify() if no_caching else Cache(record_statistics=record_statistics))
+    )
@@ -4,6 +4,7 @@ import os
 import re
 import textwrap
 from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
 from pathlib import Path
 from typing import NoReturn, TypeVar
 
@@ -29,6 +30,8 @@ STDIN = Path("<stdin>")
 
 
 class Base:
+    __slots__ = ()
+
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
             for k in other.__dict__:
@@ -43,10 +46,23 @@ class Base:
         return NotImplemented
 
     def __repr__(self) -> str:
-        args = "\n" + ",\n".join(f"{k}={v!r}" for k, v in self.__dict__.items() if k != "location")
+        args = "\n" + ",\n".join(
+            f"{k}={v!r}" for k, v in _attributes(self).items() if k != "location"
+        )
         return format_repr(indent_next(f"\n{self.__class__.__name__}({indent(args, 4)})", 4))
 
 
+def _attributes(obj: object) -> dict[str, object]:
+    """Return the attributes of an object including the attributes stored in slots."""
+    result = dict(getattr(obj, "__dict__", {}))
+    for cls in reversed(type(obj).__mro__):
+        slots = cls.__dict__.get("__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name != "__dict__" and hasattr(obj, name):
+                result[name] = getattr(obj, name)
+    return result
+
+
 def verbose_repr(obj: object, attributes: Sequence[str]) -> str:
     def prefixed_str(obj: object) -> str:
         obj_str = str(obj)
@@ -89,3 +105,14 @@ def unique(iterable: Iterable[T]) -> Iterator[T]:
 
 def assert_never(value: NoReturn) -> NoReturn:
     assert False, f'unhandled value "{value}" ({type(value).__name__})'
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    """Number of lookups in a cache which have been answered from the cache (hits) or not."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses"
@@ -32,6 +32,9 @@ MAX_LINE_LENGTH: Final = 100
 
 
 class Expr(Base):
+    # The hash is stored in a slot, so that it is not part of the state of the expression
+    __slots__ = ("_hash", "__dict__")
+
     _str: str
 
     def __init__(
@@ -43,6 +46,8 @@ class Expr(Base):
         self._location = location
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if isinstance(other, self.__class__):
             return str(self) == str(other)
         return NotImplemented
@@ -75,7 +80,16 @@ class Expr(Base):
             return self._str
 
     def __hash__(self) -> int:
-        return hash(self.__class__.__name__)
+        # The hash is derived from the string representation to be consistent with `__eq__`
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(str(self))
+            return self._hash
+
+    def __getstate__(self) -> dict[str, object]:
+        # The hash of a string differs between processes and therefore must not be transferred
+        return self.__dict__
 
     def __contains__(self, item: Expr) -> bool:
         return item == self
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
 import operator
+from collections import defaultdict
 from collections.abc import Mapping, Sequence
-from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from functools import singledispatch
+from itertools import repeat
 from typing import Final, Union
 
 import z3
 
-from rflx import expr, ty
-from rflx.const import MP_CONTEXT
+from rflx import expr, process_pool, proof_cache, ty
 from rflx.identifier import ID
 from rflx.rapidflux import Annotation, ErrorEntry, Location, RecordFluxError, Severity
 
@@ -29,6 +29,13 @@ class ProofResult(Enum):
 
 
 class Proof:
+    """
+    Proof of a goal under a set of facts.
+
+    If a proof cache is active, the result and the unsat core are taken from the cache, if
+    possible. Otherwise, they are added to the cache when determined.
+    """
+
     def __init__(
         self,
         expr: expr.Expr,
@@ -40,17 +47,39 @@ class Proof:
         self._result = ProofResult.UNSAT
         self._logic = logic
         self._unknown_reason: str | None = None
+        self._unsat_core: list[str] | None = None
+        self._cache = proof_cache.current()
+        self._key: str | None = None
+        self._positions: list[int] = []
+
+        goal = _to_z3(self._expr)
+        facts_z3 = [_to_z3(f) for f in self._facts]
+
+        if self._cache is not None:
+            self._key, order = proof_cache.key(self._logic, goal, facts_z3)
+            self._positions = [0] * len(order)
+            for position, index in enumerate(order):
+                self._positions[index] = position
+            outcome = self._cache.get(self._key)
+            if outcome is not None:
+                self._result = ProofResult[outcome.result]
+                self._unknown_reason = outcome.reason
+                if outcome.core is not None:
+                    self._unsat_core = sorted(self._fact_name(n, order) for n in outcome.core)
+                return
 
         solver = z3.SolverFor(self._logic)
         solver.set("timeout", PROVER_TIMEOUT)
-        solver.add(_to_z3(self._expr))
-        for f in self._facts:
-            solver.add(_to_z3(f))
+        solver.add(goal)
+        for f in facts_z3:
+            solver.add(f)
 
         self._result = ProofResult(solver.check())
         if self._result == ProofResult.UNKNOWN:
             self._unknown_reason = solver.reason_unknown()
 
+        self._add_to_cache()
+
     @property
     def result(self) -> ProofResult:
         return self._result
@@ -63,9 +92,6 @@ class Proof:
             assert self._unknown_reason is not None
             return [(self._unknown_reason, self._expr.location)]
 
-        solver = z3.SolverFor(self._logic)
-        solver.set(unsat_core=True)
-
         facts = {f"H{index}": fact for index, fact in enumerate(self._facts)}
 
         # Track facts for proof goals in disjunctive normal form
@@ -81,20 +107,62 @@ class Proof:
                     )
                 else:
                     facts.update({f"H{index_start}": term})
-        else:
-            solver.assert_and_track(_to_z3(self._expr), "goal")
 
-        for name, fact in facts.items():
-            solver.assert_and_track(_to_z3(fact), name)
+        if self._unsat_core is None:
+            solver = z3.SolverFor(self._logic)
+            solver.set(unsat_core=True)
+
+            if not isinstance(self._expr, expr.Or):
+                solver.assert_and_track(_to_z3(self._expr), "goal")
+
+            for name, fact in facts.items():
+                solver.assert_and_track(_to_z3(fact), name)
+
+            result = solver.check()
+            assert result == z3.unsat, f"result should be unsat (is {result})"
+            self._unsat_core = sorted([str(h) for h in solver.unsat_core()])
+            self._add_to_cache()
 
         facts["goal"] = self._expr
-        result = solver.check()
-        assert result == z3.unsat, f"result should be unsat (is {result})"
         return [
-            (" ".join(str(facts[str(fact)]).replace("\n", " ").split()), facts[fact].location)
-            for fact in sorted([str(h) for h in solver.unsat_core()])
+            (" ".join(str(facts[fact]).replace("\n", " ").split()), facts[fact].location)
+            for fact in self._unsat_core
         ]
 
+    def _add_to_cache(self) -> None:
+        if self._cache is None or self._key is None:
+            return
+
+        self._cache.add(
+            self._key,
+            proof_cache.Outcome(
+                self._result.name,
+                self._unknown_reason,
+                (
+                    tuple(self._cache_name(n) for n in self._unsat_core)
+                    if self._unsat_core is not None
+                    else None
+                ),
+            ),
+        )
+
+    def _cache_name(self, name: str) -> str:
+        """Convert the name of a tracked fact into a name independent of the order of the facts."""
+        if name == "goal":
+            return name
+        index = int(name[1:])
+        if index < len(self._facts):
+            return f"F{self._positions[index]}"
+        return f"G{index - len(self._facts)}"
+
+    def _fact_name(self, name: str, order: Sequence[int]) -> str:
+        """Convert a name used in the cache into the name of the corresponding tracked fact."""
+        if name == "goal":
+            return name
+        if name.startswith("F"):
+            return f"H{order[int(name[1:])]}"
+        return f"H{int(name[1:]) + len(self._facts)}"
+
 
 @dataclass
 class ProofJob:
@@ -142,39 +210,310 @@ class ParallelProofs:
         )
 
     @staticmethod
-    def check_proof(job: ProofJob) -> tuple[Sequence[ErrorEntry], Sequence[Annotation]]:
+    def check_proof(
+        job: ProofJob,
+        cache: proof_cache.ProofCache | None = None,
+    ) -> tuple[Sequence[ErrorEntry], Sequence[Annotation]]:
         result: list[Annotation] = []
-        proof = Proof(job.goal, job.facts)
-
-        if (
-            job.add_unsat and proof.result == ProofResult.UNSAT
-        ) or proof.result == ProofResult.UNKNOWN:
-            result.extend(
-                [
-                    Annotation(
-                        (
-                            f'unsatisfied "{m}"'
-                            if proof.result == ProofResult.UNSAT
-                            else f"reason: {m}"
-                        ),
-                        Severity.NOTE,
-                        l,
-                    )
-                    for m, l in proof.error
-                ],
-            )
+
+        with proof_cache.active(cache):
+            proof = Proof(job.goal, job.facts)
+
+            if (
+                job.add_unsat and proof.result == ProofResult.UNSAT
+            ) or proof.result == ProofResult.UNKNOWN:
+                result.extend(
+                    [
+                        Annotation(
+                            (
+                                f'unsatisfied "{m}"'
+                                if proof.result == ProofResult.UNSAT
+                                else f"reason: {m}"
+                            ),
+                            Severity.NOTE,
+                            l,
+                        )
+                        for m, l in proof.error
+                    ],
+                )
         return job.results[proof.result], result
 
     def check(self, error: RecordFluxError) -> None:
-        with ProcessPoolExecutor(max_workers=self._workers, mp_context=MP_CONTEXT) as executor:
-            for entries, unsatcore_annotations in executor.map(
+        cache = proof_cache.current()
+        for entries, unsatcore_annotations in (
+            map(ParallelProofs.check_proof, self._proofs, repeat(cache))
+            if self._workers <= 1
+            else process_pool.executor(self._workers).map(
                 ParallelProofs.check_proof,
                 self._proofs,
-            ):
-                assert (entries and unsatcore_annotations) or not unsatcore_annotations
-                if unsatcore_annotations:
-                    entries[0].extend(unsatcore_annotations)
-                error.extend(entries)
+                repeat(cache),
+            )
+        ):
+            assert (entries and unsatcore_annotations) or not unsatcore_annotations
+            if unsatcore_annotations:
+                entries[0].extend(unsatcore_annotations)
+            error.extend(entries)
+
+
+LinkPath = tuple[int, ...]
+
+
+@dataclass
+class PathProofJob:
+    path: LinkPath
+    facts: Sequence[expr.Expr]
+    job: ProofJob
+
+
+class PathProofs:
+    """
+    Proofs along the paths of a graph.
+
+    A path is given by the indices of its links. The constraints of each link are defined on
+    initialization. All paths are arranged in a prefix tree, which is traversed depth-first using
+    an incremental solver: The constraints of a link are pushed when entering the link and popped
+    when leaving it. If the constraints of a prefix are contradictory, the whole subtree is
+    skipped. Thereby, the constraints shared by paths with a common prefix are only added once.
+    """
+
+    def __init__(
+        self,
+        links: Sequence[Sequence[expr.Expr]],
+        facts: Sequence[expr.Expr],
+        workers: int,
+        logic: str = "QF_NIA",
+    ) -> None:
+        self._links = links
+        self._facts = facts
+        self._workers = workers
+        self._logic = logic
+        self._paths: set[LinkPath] = set()
+        self._proofs: list[PathProofJob] = []
+
+    def add_path(self, path: LinkPath) -> None:
+        """Add a path whose satisfiability should be determined."""
+        self._paths.add(path)
+
+    def add(  # noqa: PLR0913
+        self,
+        path: LinkPath,
+        goal: expr.Expr,
+        facts: Sequence[expr.Expr],
+        unsat_error: Sequence[ErrorEntry] | None = None,
+        unknown_error: Sequence[ErrorEntry] | None = None,
+        sat_error: Sequence[ErrorEntry] | None = None,
+        add_unsat: bool = False,
+    ) -> None:
+        """
+        Add a proof goal for a path.
+
+        The facts of the proof consist of the constraints of all links of the path, the facts
+        defined on initialization and the given facts. The errors are handled as in
+        `ParallelProofs.add`.
+        """
+        self._proofs.append(
+            PathProofJob(
+                path,
+                facts,
+                ProofJob(
+                    goal,
+                    [*(f for l in path for f in self._links[l]), *self._facts, *facts],
+                    {
+                        ProofResult.SAT: sat_error if sat_error is not None else [],
+                        ProofResult.UNSAT: unsat_error if unsat_error is not None else [],
+                        ProofResult.UNKNOWN: unknown_error if unknown_error is not None else [],
+                    },
+                    add_unsat,
+                ),
+            ),
+        )
+
+    def check(self, proofs: ParallelProofs | None = None) -> set[LinkPath]:
+        """
+        Return all satisfiable paths and check all proof goals.
+
+        Proof goals whose result leads to an error or could not be determined incrementally are
+        added to the given parallel proofs. The separate proof of these goals determines the
+        resulting errors.
+        """
+        assert proofs is not None or not self._proofs
+
+        tasks = self._subtrees()
+        cache = proof_cache.current()
+        results = (
+            map(PathProofs.check_subtree, tasks, repeat(cache))
+            if self._workers <= 1 or len(tasks) <= 1
+            else process_pool.executor(self._workers).map(
+                PathProofs.check_subtree,
+                tasks,
+                repeat(cache),
+            )
+        )
+
+        satisfiable: set[LinkPath] = set()
+        proof_results: dict[int, ProofResult] = {}
+
+        for paths, goals in results:
+            satisfiable.update(paths)
+            proof_results.update(goals)
+
+        for i, p in enumerate(self._proofs):
+            result = proof_results[i]
+            if result == ProofResult.UNKNOWN or p.job.results[result]:
+                assert proofs is not None
+                proofs.add(
+                    p.job.goal,
+                    p.job.facts,
+                    unsat_error=p.job.results[ProofResult.UNSAT],
+                    unknown_error=p.job.results[ProofResult.UNKNOWN],
+                    sat_error=p.job.results[ProofResult.SAT],
+                    add_unsat=p.job.add_unsat,
+                )
+
+        self._paths.clear()
+        self._proofs.clear()
+
+        return satisfiable
+
+    @staticmethod
+    def check_subtree(
+        subtree: PathSubtree,
+        cache: proof_cache.ProofCache | None = None,
+    ) -> tuple[set[LinkPath], dict[int, ProofResult]]:
+        with proof_cache.active(cache):
+            return subtree.check()
+
+    def _subtrees(self) -> list[PathSubtree]:
+        """
+        Split the prefix tree into subtrees which can be checked independently.
+
+        With multiple workers, the tree is split at the shallowest level which provides enough
+        subtrees to keep all workers busy. Paths and goals above this level are assigned to the
+        first subtree containing them.
+        """
+        children = _prefix_tree([*self._paths, *(p.path for p in self._proofs)])
+
+        roots: list[LinkPath] = [()]
+        if self._workers > 1:
+            while len(roots) < 4 * self._workers:
+                expanded = [c for r in roots for c in children[r] or [r]]
+                if len(expanded) == len(roots):
+                    break
+                roots = expanded
+
+        def root(path: LinkPath) -> int:
+            return next(
+                i for i, r in enumerate(roots) if path[: len(r)] == r or r[: len(path)] == path
+            )
+
+        subtrees = [
+            PathSubtree(
+                {i: self._links[i] for i in set(r)},
+                self._facts,
+                self._logic,
+                set(),
+                [],
+            )
+            for r in roots
+        ]
+
+        for path in self._paths:
+            subtree = subtrees[root(path)]
+            subtree.links.update({i: self._links[i] for i in path})
+            subtree.paths.add(path)
+
+        for i, p in enumerate(self._proofs):
+            subtree = subtrees[root(p.path)]
+            subtree.links.update({i: self._links[i] for i in p.path})
+            subtree.proofs.append((i, p.path, p.job.goal, p.facts))
+
+        return subtrees
+
+
+@dataclass
+class PathSubtree:
+    links: dict[int, Sequence[expr.Expr]]
+    facts: Sequence[expr.Expr]
+    logic: str
+    paths: set[LinkPath]
+    proofs: list[tuple[int, LinkPath, expr.Expr, Sequence[expr.Expr]]]
+
+    def check(self) -> tuple[set[LinkPath], dict[int, ProofResult]]:
+        """Return the satisfiable paths and the results of the proof goals in the subtree."""
+        children = _prefix_tree([*self.paths, *(p for _, p, _, _ in self.proofs)])
+        goals: dict[LinkPath, list[tuple[int, expr.Expr, Sequence[expr.Expr]]]] = defaultdict(list)
+        for index, path, goal, facts in self.proofs:
+            goals[path].append((index, goal, facts))
+
+        satisfiable: set[LinkPath] = set()
+        results: dict[int, ProofResult] = {}
+
+        solver = z3.SolverFor(self.logic)
+        solver.set("timeout", PROVER_TIMEOUT)
+        for f in self.facts:
+            solver.add(_to_z3(f))
+
+        stack: list[tuple[LinkPath, bool]] = [((), True)]
+
+        while stack:
+            node, enter = stack.pop()
+
+            if not enter:
+                solver.pop()
+                continue
+
+            solver.push()
+            for f in self.links[node[-1]] if node else []:
+                solver.add(_to_z3(f))
+
+            result = self._result(solver, node)
+
+            if result == ProofResult.UNSAT:
+                # All extensions of a contradictory prefix are contradictory as well
+                descendants = [node]
+                while descendants:
+                    d = descendants.pop()
+                    results.update({index: ProofResult.UNSAT for index, _, _ in goals[d]})
+                    descendants.extend(children[d])
+                solver.pop()
+                continue
+
+            if result == ProofResult.SAT and node in self.paths:
+                satisfiable.add(node)
+
+            for index, goal, facts in goals[node]:
+                solver.push()
+                solver.add(_to_z3(goal))
+                for f in facts:
+                    solver.add(_to_z3(f))
+                results[index] = ProofResult(solver.check())
+                solver.pop()
+
+            stack.append((node, False))
+            stack.extend((c, True) for c in reversed(children[node]))
+
+        return satisfiable, results
+
+    def _result(self, solver: z3.Solver, path: LinkPath) -> ProofResult:
+        result = ProofResult(solver.check())
+
+        if result == ProofResult.UNKNOWN:
+            # The incremental solver is weaker than the solvers used for a separate proof
+            result = Proof(
+                expr.TRUE,
+                [*(f for l in path for f in self.links[l]), *self.facts],
+                self.logic,
+            ).result
+
+        return result
+
+
+def _prefix_tree(paths: Sequence[LinkPath]) -> dict[LinkPath, list[LinkPath]]:
+    """Return the children of all nodes of the prefix tree containing the given paths."""
+    children: dict[LinkPath, list[LinkPath]] = defaultdict(list)
+    for n in sorted({p[:i] for p in paths for i in range(1, len(p) + 1)}):
+        children[n[:-1]].append(n)
+    return children
 
 
 class Z3TypeError(TypeError):
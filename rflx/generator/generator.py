@@ -7,7 +7,7 @@ from datetime import date
 from functools import cached_property
 from pathlib import Path
 
-from rflx import __version__, expr, expr_conv, ty
+from rflx import __version__, expr, expr_conv, process_pool, ty
 from rflx.ada import (
     FALSE,
     TRUE,
@@ -79,7 +79,7 @@ from rflx.ada import (
 from rflx.ada_parser import parse_file
 from rflx.ada_prefix import change_prefix
 from rflx.common import file_name
-from rflx.const import BUILTINS_PACKAGE, INTERNAL_PACKAGE, MAX_SCALAR_SIZE, MP_CONTEXT
+from rflx.const import BUILTINS_PACKAGE, INTERNAL_PACKAGE, MAX_SCALAR_SIZE
 from rflx.error import fail, warn
 from rflx.identifier import ID, StrID
 from rflx.integration import Integration
@@ -137,7 +137,7 @@ class Generator:
         self._reproducible = reproducible
         self._debug = debug
         self._ignore_unsupported_checksum = ignore_unsupported_checksum
-        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT)
+        self._workers = workers
         self._template_dir = const.TEMPLATE_DIR
         assert self._template_dir.is_dir(), "template directory not found"
 
@@ -299,7 +299,7 @@ class Generator:
                             location=c.location,
                         )
 
-                units.update(self._create_message(d, self._executor))
+                units.update(self._create_message(d, process_pool.executor(self._workers)))
 
             elif isinstance(d, Refinement):
                 units.update(self._create_refinement(d, units))
@@ -5,18 +5,18 @@ from __future__ import annotations
 import re
 from abc import abstractmethod
 from collections.abc import Generator, Mapping, Sequence
-from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from functools import singledispatch
+from itertools import repeat
 from sys import intern
 from typing import TYPE_CHECKING, Protocol, TypeVar
 
 import z3
 from attr import define, field, frozen
 
-from rflx import ty
+from rflx import process_pool, proof_cache, ty
 from rflx.common import Base
-from rflx.const import MAX_SCALAR_SIZE, MP_CONTEXT
+from rflx.const import MAX_SCALAR_SIZE
 from rflx.error import info
 from rflx.identifier import ID, StrID
 from rflx.rapidflux import NO_LOCATION, Location
@@ -73,14 +73,27 @@ class ProofJob(Base):
     def check(self) -> ProofJob:
         """Check the specified facts and return the corresponding object depending on the result."""
 
+        facts = [f.to_z3_expr() for f in self._facts]
+        cache = proof_cache.current()
+
+        if cache is not None:
+            key, _ = proof_cache.key(self._logic, None, facts)
+            outcome = cache.get(key)
+            if outcome is not None:
+                self._result = self._results[ProofResult[outcome.result]]
+                return self
+
         solver = z3.SolverFor(self._logic)
 
-        for f in self._facts:
-            solver.add(f.to_z3_expr())
+        for f in facts:
+            solver.add(f)
 
         proof_result = ProofResult(solver.check())
         self._result = self._results[proof_result]
 
+        if cache is not None:
+            cache.add(key, proof_cache.Outcome(proof_result.name))
+
         return self
 
 
@@ -93,16 +106,25 @@ class ProofManager(Base):
         self._jobs.extend(jobs)
 
     def check(self) -> list[ProofJob]:
-        with ProcessPoolExecutor(max_workers=self._workers, mp_context=MP_CONTEXT) as executor:
-            result = list(executor.map(ProofManager._check, self._jobs))
+        cache = proof_cache.current()
+        result = list(
+            map(ProofManager._check, self._jobs, repeat(cache))
+            if self._workers <= 1
+            else process_pool.executor(self._workers).map(
+                ProofManager._check,
+                self._jobs,
+                repeat(cache),
+            ),
+        )
 
         self._jobs.clear()
 
         return result
 
     @staticmethod
-    def _check(job: ProofJob) -> ProofJob:
-        return job.check()
+    def _check(job: ProofJob, cache: proof_cache.ProofCache | None = None) -> ProofJob:
+        with proof_cache.active(cache):
+            return job.check()
 
 
 class Cond(Base):
@@ -1,101 +1,54 @@
 from __future__ import annotations
 
+import contextlib
 import hashlib
 import importlib.resources
 import json
 import os
-import time
+import sqlite3
+import tempfile
 import typing as ty
 from functools import lru_cache, singledispatch
 from pathlib import Path
-from typing import Literal, TextIO
 
+from rflx.common import CacheStatistics
 from rflx.const import CACHE_PATH
 from rflx.error import warn
 from rflx.model.message import Message, Refinement
 from rflx.model.top_level_declaration import TopLevelDeclaration
-from rflx.rapidflux import NO_LOCATION, ErrorEntry, RecordFluxError, Severity
+from rflx.parse_cache import ParseCache
+from rflx.proof_cache import ProofCache
 from rflx.version import dependencies
 
-DEFAULT_FILE = CACHE_PATH / "verification.json"
-
-
-class FileLock:
-    """ContextManager that handles cache file lock."""
-
-    LOCK_TIMEOUT = 5
-
-    def __init__(
-        self,
-        cache_file: Path,
-        mode: Literal["r", "w"],
-        encoding: str = "utf-8",
-    ) -> None:
-        self._cache_file = cache_file
-        self._lock_file = cache_file.with_suffix(".lock")
-        self._mode = mode
-        self._encoding = encoding
-
-    def __enter__(self) -> TextIO:
-        begin_time = time.time()
-        while True:
-            try:
-                self._lock_file.touch(exist_ok=False)
-            except FileExistsError:  # noqa: PERF203
-                if (time.time() - begin_time) < self.LOCK_TIMEOUT:
-                    time.sleep(0.1)
-                else:
-                    cache_locked_pid = Path.read_text(self._lock_file)
-                    raise RecordFluxError(
-                        [
-                            ErrorEntry(
-                                f"failed to acquire cache lock"
-                                f" after {FileLock.LOCK_TIMEOUT} seconds",
-                                Severity.ERROR,
-                                NO_LOCATION,
-                            ),
-                            ErrorEntry(
-                                f"the cache is locked by a process"
-                                f' with a PID of "{cache_locked_pid}"',
-                                Severity.NOTE,
-                                NO_LOCATION,
-                            ),
-                            ErrorEntry(
-                                f"if the process that owns the lock isn't active anymore, deleting "
-                                f'"{self._lock_file}" will solve this issue',
-                                Severity.HELP,
-                                NO_LOCATION,
-                            ),
-                        ],
-                    ) from None
-            else:
-                # TODO(eng/recordflux/RecordFlux#1424): Remove no cover pragma
-                break  # pragma: no cover
-
-        self._lock_file.write_text(str(os.getpid()), encoding="utf-8")
-
-        try:
-            return self._cache_file.open(self._mode, encoding=self._encoding)
-        except Exception as e:
-            self._lock_file.unlink()
-            raise e from e
-
-    def __exit__(self, *_: object) -> None:
-        self._lock_file.unlink()
+DEFAULT_FILE = CACHE_PATH / "verification.sqlite"
+FINGERPRINT_FILE = CACHE_PATH / "fingerprint.json"
 
 
 class Cache:
     """
     Cache the successful verification of top level declarations.
 
-    The cache holds a list of hashes of all top level declaration variants that were successfully
-    verified. The state of the cache is persisted on disk and restored on initialization.
+    The cache holds the hashes of all top level declaration variants that were successfully
+    verified. The state of the cache is persisted in a SQLite database in write-ahead logging mode,
+    so that the cache can be read and extended by concurrent processes. The verified declarations
+    are collected and added to the database at once when the cache is flushed. A verification cache
+    of a previous version (`verification.json`) is migrated automatically. The results of the
+    individual proofs are cached separately in the same directory, so that only the changed proofs
+    are repeated when a declaration has to be verified again. The results of parsing specification
+    files are also cached in this directory.
     """
 
-    def __init__(self, file: Path = DEFAULT_FILE) -> None:
+    def __init__(self, file: Path = DEFAULT_FILE, record_statistics: bool = False) -> None:
         self._file = file
 
         self._verified: dict[str, list[str]] = {}
+        self._unsaved: list[tuple[str, str]] = []
+        self._lookups: dict[str, bool] = {}
+        self._proofs = ProofCache(
+            file.parent / "proofs.sqlite",
+            record_statistics=record_statistics,
+        )
+        self._specifications = ParseCache(file.parent / "specifications")
 
         self._load_cache()
 
@@ -103,8 +56,25 @@ class Cache:
     def is_verified_reason(self) -> str:
         return "cached"
 
+    @property
+    def proofs(self) -> ProofCache | None:
+        return self._proofs
+
+    @property
+    def specifications(self) -> ParseCache | None:
+        return self._specifications
+
     def is_verified(self, digest: Digest) -> bool:
-        return digest.key in self._verified and digest.value in self._verified[digest.key]
+        result = digest.key in self._verified and digest.value in self._verified[digest.key]
+        # Only the first lookup of a declaration which requires verification is counted
+        if digest.value:
+            self._lookups.setdefault(f"{digest.key}|{digest.value}", result)
+        return result
+
+    def statistics(self) -> CacheStatistics | None:
+        """Return the number of declarations whose verification was found in the cache or not."""
+        hits = sum(self._lookups.values())
+        return CacheStatistics(hits, len(self._lookups) - hits)
 
     def add_verified(self, digest: Digest) -> None:
         if not digest.value:
@@ -114,36 +84,95 @@ class Cache:
             self._verified[digest.key] = []
         if digest.value not in self._verified[digest.key]:
             self._verified[digest.key].append(digest.value)
-            self._write_cache()
+            self._unsaved.append((digest.key, digest.value))
+
+    def flush(self) -> bool:
+        """
+        Add all verified declarations, which have not been stored yet, to the database.
+
+        Return whether the declarations were stored. Declarations which could not be stored are
+        kept, so that they are stored by a later flush.
+        """
+        if not self._unsaved:
+            return True
+
+        try:
+            with contextlib.closing(self._connect()) as connection, connection:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO verified (declaration, digest) VALUES (?, ?)",
+                    self._unsaved,
+                )
+        except sqlite3.Error as e:
+            warn(f"verification cache could not be updated: {e}")
+            return False
+        self._unsaved = []
+        return True
 
     def _load_cache(self) -> None:
+        legacy_file = self._file.with_suffix(".json")
+        if legacy_file != self._file and legacy_file.exists():
+            self._migrate(legacy_file)
+
+        if not self._file.exists():
+            return
+
+        try:
+            with contextlib.closing(self._connect()) as connection:
+                rows = connection.execute("SELECT declaration, digest FROM verified").fetchall()
+        except sqlite3.Error as e:
+            warn(f"verification cache will be ignored due to error: {e}")
+            return
+
+        for declaration, digest in rows:
+            self._verified.setdefault(declaration, []).append(digest)
+
+    def _migrate(self, legacy_file: Path) -> None:
+        """Add the content of a verification cache of a previous version and remove it."""
         try:
-            with FileLock(self._file, "r") as f:
-                cache_content = f.read().strip()
-                cache = json.loads(cache_content)
+            cache_content = legacy_file.read_text(encoding="utf-8").strip()
+            cache = json.loads(cache_content)
             if isinstance(cache, dict) and all(
                 isinstance(i, str) and isinstance(l, list) and all(isinstance(h, str) for h in l)
                 for i, l in cache.items()
             ):
-                self._verified = cache
+                self._unsaved = [(i, h) for i, l in cache.items() for h in l]
+                if not self.flush():
+                    # The previous cache is kept, so that the migration is repeated next time
+                    self._unsaved = []
+                    return
             else:
                 raise TypeError  # noqa: TRY301
         except (json.JSONDecodeError, TypeError):
             warn(
                 f"verification cache will be ignored due to invalid format:\n{cache_content}",
             )
-        except FileNotFoundError:
-            pass
+        except OSError:
+            # The file may have been migrated by a concurrent process
+            return
+
+        legacy_file.unlink(missing_ok=True)
+        legacy_file.with_suffix(".lock").unlink(missing_ok=True)
 
-    def _write_cache(self) -> None:
+    def _connect(self) -> sqlite3.Connection:
         self._file.parent.mkdir(parents=True, exist_ok=True)
         (self._file.parent / "CACHEDIR.TAG").write_text(
             "Signature: 8a477f597d28d172789f06886806bc55\n"
             "# This file is a cache directory tag created by rflx.\n"
             "# For information about cache directory tags see https://bford.info/cachedir/",
         )
-        with FileLock(self._file, "w") as f:
-            json.dump(self._verified, f)
+        connection = sqlite3.connect(self._file, timeout=30)
+        try:
+            # Readers do not block writers and vice versa in write-ahead logging mode
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS verified ("
+                "declaration TEXT NOT NULL, digest TEXT NOT NULL,"
+                " PRIMARY KEY (declaration, digest))",
+            )
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
 
 
 class AlwaysVerify(Cache):
@@ -156,10 +185,25 @@ class AlwaysVerify(Cache):
     def add_verified(self, digest: Digest) -> None:
         pass
 
+    def flush(self) -> bool:
+        return True
+
+    def statistics(self) -> CacheStatistics | None:
+        return None
+
+    @property
+    def proofs(self) -> ProofCache | None:
+        return None
+
+    @property
+    def specifications(self) -> ParseCache | None:
+        return None
+
 
 class NeverVerify(Cache):
-    def __init__(self) -> None:
-        warn("model verification skipped")
+    def __init__(self, warn_skipped: bool = True) -> None:
+        if warn_skipped:
+            warn("model verification skipped")
 
     def is_verified(self, digest: Digest) -> bool:  # noqa: ARG002
         return True
@@ -167,10 +211,24 @@ class NeverVerify(Cache):
     def add_verified(self, digest: Digest) -> None:
         pass
 
+    def flush(self) -> bool:
+        return True
+
+    def statistics(self) -> CacheStatistics | None:
+        return None
+
     @property
     def is_verified_reason(self) -> str:
         return "verification disabled"
 
+    @property
+    def proofs(self) -> ProofCache | None:
+        return None
+
+    @property
+    def specifications(self) -> ParseCache | None:
+        return None
+
 
 class Digest:
     def __init__(self, declaration: TopLevelDeclaration) -> None:
@@ -196,28 +254,93 @@ class Digest:
 @lru_cache
 def fingerprint() -> str:
     """Return a fingerprint for any code or dependency that could affect the verification result."""
+    return _fingerprint(Path(str(importlib.resources.files("rflx"))), FINGERPRINT_FILE)
+
+
+def _fingerprint(package: Path, stamp_file: Path) -> str:
+    """
+    Return the fingerprint of the package and its dependencies.
+
+    Computing the fingerprint requires reading all relevant files of the package. Therefore, the
+    fingerprint is stored in a stamp file together with the modification times and sizes of these
+    files and their directories. The stored fingerprint is used as long as the package location,
+    the versions of the dependencies and the status of all recorded files and directories are
+    unchanged. The addition or removal of a file changes the modification time of its directory.
+    """
+    versions = dependencies()
+
+    try:
+        stamp = json.loads(stamp_file.read_text(encoding="utf-8"))
+        if (
+            stamp["package"] == str(package)
+            and stamp["dependencies"] == versions
+            and all(_file_status(package / f) == s for f, s in stamp["files"].items())
+        ):
+            return str(stamp["fingerprint"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    directories = [package, *(d for d in package.rglob("*") if d.is_dir() and _fingerprinted(d))]
+    files = sorted(f for d in directories for f in d.iterdir() if f.is_file() and _fingerprinted(f))
+    # The status is determined before the files are read, so that a concurrent modification leads
+    # to a recomputation of the fingerprint on the next invocation
+    status = {str(p.relative_to(package)): _file_status(p) for p in [*directories, *files]}
+
     m = hashlib.blake2b()
 
-    for d in dependencies():
+    for d in versions:
         m.update(d.encode("utf-8"))
 
-    for f in Path(str(importlib.resources.files("rflx"))).rglob("*"):
-        if not f.is_file() or any(
-            p in str(f)
-            for p in [
-                "__pycache__",
-                "rflx/converter",
-                "rflx/generator",
-                "rflx/ide",
-                "rflx/ls",
-                "rflx/pyrflx",
-                "rflx/templates",
-            ]
-        ):
-            continue
+    for f in files:
         m.update(f.read_bytes())
 
-    return m.hexdigest()
+    result = m.hexdigest()
+
+    # The cache directory is not created, as the fingerprint is also required if caching is disabled
+    try:
+        descriptor, temporary = tempfile.mkstemp(dir=stamp_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "package": str(package),
+                        "dependencies": versions,
+                        "files": status,
+                        "fingerprint": result,
+                    },
+                    f,
+                )
+            Path(temporary).replace(stamp_file)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass
+
+    return result
+
+
+def _fingerprinted(path: Path) -> bool:
+    return not any(
+        p in path.as_posix()
+        for p in [
+            "__pycache__",
+            "rflx/converter",
+            "rflx/generator",
+            "rflx/ide",
+            "rflx/ls",
+            "rflx/pyrflx",
+            "rflx/templates",
+        ]
+    )
+
+
+def _file_status(path: Path) -> list[int]:
+    try:
+        status = path.stat()
+    except OSError:
+        return []
+    return [status.st_mtime_ns, status.st_size]
 
 
 @singledispatch
@@ -230,6 +353,8 @@ def _(message: Message) -> ty.List[str]:  # noqa: UP006
     return [
         str(message),
         *[str(t) for t in message.types.values()],
+        # A message verified without enumerating all paths may contain unproven properties
+        *(["summarized paths"] if message.summarize_paths else []),
     ]
 
 
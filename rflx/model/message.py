@@ -3,7 +3,6 @@ from __future__ import annotations
 import itertools
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Mapping, Sequence
-from concurrent.futures import ProcessPoolExecutor
 from copy import copy
 from dataclasses import dataclass, field as dataclass_field
 from enum import Enum
@@ -11,7 +10,6 @@ from functools import cached_property, partial
 
 from rflx import expr, expr_proof, ty
 from rflx.common import Base, indent, indent_next, unique, verbose_repr
-from rflx.const import MP_CONTEXT
 from rflx.error import fail, fatal_fail
 from rflx.expr import similar_fields
 from rflx.identifier import ID, StrID
@@ -114,6 +112,7 @@ class Message(type_decl.TypeDecl):
         location: Location = NO_LOCATION,
         skip_verification: bool = False,
         workers: int = 1,
+        summarize_paths: bool = False,
     ) -> None:
         assert not types if not structure else True
 
@@ -177,6 +176,7 @@ class Message(type_decl.TypeDecl):
         self._refinements: list[Refinement] = []
         self._skip_verification = skip_verification
         self._workers = workers
+        self._summarize_paths = summarize_paths
 
         if not self.error.has_errors() and not skip_verification:
             self._verify()
@@ -272,6 +272,11 @@ class Message(type_decl.TypeDecl):
     def byte_order(self) -> Mapping[Field, ByteOrder]:
         return self._byte_order
 
+    @property
+    def summarize_paths(self) -> bool:
+        """Return True if the message is verified without enumerating all paths."""
+        return self._summarize_paths
+
     def copy(  # noqa: PLR0913
         self,
         identifier: StrID | None = None,
@@ -292,6 +297,18 @@ class Message(type_decl.TypeDecl):
             skip_verification if skip_verification else self._skip_verification,
         )
 
+    def verify(self, workers: int = 1) -> None:
+        if not self._skip_verification:
+            return
+
+        self._skip_verification = False
+        self._workers = workers
+
+        if not self.error.has_errors():
+            self._verify()
+
+        self.error.propagate()
+
     @property
     def parameters(self) -> tuple[Field, ...]:
         return tuple(self._parameter_types or {})
@@ -1413,7 +1430,10 @@ class Message(type_decl.TypeDecl):
 
             valid_paths = self._determine_valid_paths()
 
-            self._verify_expression_types(valid_paths)
+            if self._summarize_paths:
+                self._verify_expression_types_summarized(valid_paths)
+            else:
+                self._verify_expression_types(valid_paths)
             self._verify_checksums()
 
             self.error.propagate()
@@ -1428,33 +1448,153 @@ class Message(type_decl.TypeDecl):
 
             proofs.check(self.error)
 
-            self._prove_conditions_at_outgoing_links(valid_paths)
+            if self._summarize_paths:
+                self._prove_conditions_at_outgoing_links_summarized(valid_paths)
+            else:
+                self._prove_conditions_at_outgoing_links(valid_paths)
 
     def _determine_valid_paths(self) -> set[tuple[Link, ...]]:
         """Return all paths without contradictions."""
 
-        paths = []
-        facts = []
+        proofs, indices = self._path_proofs()
+        paths = {
+            tuple(indices[l] for l in path): path
+            for field in (*self.fields, FINAL)
+            for path in self._verified_paths(field)
+        }
 
-        for field in (*self.fields, FINAL):
-            for path in self.paths(field):
-                paths.append(path)
-                facts.append(
-                    [
-                        *self._path_constraints(path),
-                        *self.message_constraints,
-                    ],
-                )
+        for path in paths:
+            proofs.add_path(path)
 
-        result = set()
+        return {paths[p] for p in proofs.check()}
+
+    def _path_proofs(self) -> tuple[expr_proof.PathProofs, dict[Link, int]]:
+        """Return an incremental prover for all paths and the indices of the links."""
+        return (
+            expr_proof.PathProofs(
+                [
+                    (
+                        [self._reachable(l.source), *self._link_constraints(l)]
+                        if self._summarize_paths
+                        else self._link_constraints(l)
+                    )
+                    for l in self.structure
+                ],
+                [
+                    *self.message_constraints,
+                    *(self._reachability if self._summarize_paths else []),
+                ],
+                self._workers,
+            ),
+            {l: i for i, l in enumerate(self.structure)},
+        )
 
-        with ProcessPoolExecutor(max_workers=self._workers, mp_context=MP_CONTEXT) as executor:
-            for i, e in enumerate(executor.map(prove, facts)):
-                if e == expr_proof.ProofResult.SAT:
-                    result.add(paths[i])
+    def _verified_paths(self, field: Field) -> set[tuple[Link, ...]]:
+        """
+        Return the paths to a field which are considered during verification.
+
+        If paths are summarized, each incoming link of the field is considered as a separate path.
+        The part of the path preceding the link is represented by the reachability of the source
+        field (cf. `_reachability`).
+        """
+        if self._summarize_paths:
+            return {(l,) for l in self.incoming(field)}
+        return self.paths(field)
+
+    def _verified_path_constraints(self, path: tuple[Link, ...]) -> list[expr.Expr]:
+        """Return the constraints of a path returned by `_verified_paths`."""
+        if self._summarize_paths:
+            return [
+                self._reachable(path[0].source),
+                *self._reachability,
+                *self._path_constraints(path),
+            ]
+        return self._path_constraints(path)
+
+    @cached_property
+    def _reachability(self) -> list[expr.Expr]:
+        return self._reachability_constraints()
+
+    def _reachability_constraints(self, conditions_only: bool = False) -> list[expr.Expr]:
+        """
+        Return constraints which summarize all paths of the message.
+
+        For each field, a Boolean variable is introduced which can only be true, if the variable of
+        the source field and the constraints of at least one incoming link are true. The variable
+        of a field is therefore satisfiable if and only if at least one path to the field is
+        satisfiable. In contrast to the enumeration of all paths, the size of the constraints is
+        linear in the number of links. The sum of the sizes of all fields on the path, as used for
+        the message size, is tracked in an additional variable for each field. If
+        `conditions_only` is set, only the conditions of the links are considered, as in
+        `path_condition`.
+        """
+        return [
+            expr.Or(
+                expr.Not(self._reachable(f)),
+                *[
+                    expr.And(
+                        self._reachable(l.source),
+                        *(
+                            expression_list(l.condition)
+                            if conditions_only
+                            else [
+                                *self._link_constraints(l),
+                                expr.Equal(
+                                    self._accumulated_size(l.target),
+                                    (
+                                        self._accumulated_size(l.source)
+                                        if l.target == FINAL or l.first != expr.UNDEFINED
+                                        else expr.Add(
+                                            self._accumulated_size(l.source),
+                                            expr.Size(l.target.name),
+                                        )
+                                    ),
+                                ),
+                            ]
+                        ),
+                    )
+                    for l in self.incoming(f)
+                ],
+            )
+            for f in (*self.fields, FINAL)
+        ]
+
+    @staticmethod
+    def _reachable(field: Field) -> expr.Expr:
+        if field == INITIAL:
+            return expr.TRUE
+        return expr.Variable(ID("Reachable") * field.name, type_=ty.BOOLEAN)
+
+    @staticmethod
+    def _accumulated_size(field: Field) -> expr.Expr:
+        if field == INITIAL:
+            return expr.Number(0)
+        return expr.Variable(ID("Accumulated_Size") * field.name)
+
+    def _dominators(self, links: Iterable[Link]) -> dict[Field, set[Field]]:
+        """Return the fields which precede each field on all paths consisting of the given links."""
+        considered = set(links)
+        result: dict[Field, set[Field]] = {INITIAL: set()}
+
+        for f in (*self.fields, FINAL):
+            incoming = [l for l in self.incoming(f) if l in considered]
+            result[f] = (
+                set.intersection(*[{l.source, *result[l.source]} for l in incoming])
+                if incoming
+                else set()
+            )
 
         return result
 
+    def _unproven(self, description: str, location: Location | None) -> list[ErrorEntry]:
+        return [
+            ErrorEntry(
+                f"unable to prove {description} without enumerating all paths",
+                Severity.WARNING,
+                location or self.location,
+            ),
+        ]
+
     def _max_value(self, target: expr.Expr, path: tuple[Link, ...]) -> expr.Number:
         message_size = expr.Add(
             *[
@@ -1576,12 +1716,6 @@ class Message(type_decl.TypeDecl):
         def typed_variable(expression: expr.Expr) -> expr.Expr:
             return self.typed_expression(expression, types)
 
-        def remove_types(expression: expr.Expr) -> expr.Expr:
-            if isinstance(expression, expr.Variable):
-                expression = copy(expression)
-                expression.type_ = ty.Undefined()
-            return expression
-
         def check_expr_type(expression: expr.Expr, ty: ty.Type, path: Sequence[Link]) -> None:
             entries = expression.check_type(ty).entries
 
@@ -1610,9 +1744,9 @@ class Message(type_decl.TypeDecl):
                 Link(
                     source=l.source,
                     target=l.target,
-                    condition=l.condition.substituted(remove_types),
-                    first=l.first.substituted(remove_types),
-                    size=l.size.substituted(remove_types),
+                    condition=l.condition.substituted(_remove_types),
+                    first=l.first.substituted(_remove_types),
+                    size=l.size.substituted(_remove_types),
                 )
                 for l in p
             ]:
@@ -1633,6 +1767,68 @@ class Message(type_decl.TypeDecl):
 
                     check_expr_type(expression, ty.BASE_INTEGER, path)
 
+    def _verify_expression_types_summarized(self, valid_paths: set[tuple[Link, ...]]) -> None:
+        """
+        Check the types of the expressions at all valid links without enumerating all paths.
+
+        The expressions are checked with the types of all fields which precede the link on any
+        valid path. Errors found in this way occur on all valid paths. Variables which are defined
+        only on some of these paths are reported as unproven.
+        """
+        valid_links = {l for (l,) in valid_paths}
+        preceding: dict[Field, set[Field]] = {INITIAL: set()}
+
+        for f in (*self.fields, FINAL):
+            preceding[f] = {
+                p
+                for l in self.incoming(f)
+                if l in valid_links
+                for p in (l.source, *preceding[l.source])
+            }
+
+        definite = self._dominators(valid_links)
+
+        for l in self.structure:
+            if l not in valid_links:
+                continue
+
+            for expression, expected_type in (
+                (l.condition, ty.BOOLEAN),
+                (l.size, ty.BASE_INTEGER),
+                (l.first, ty.BASE_INTEGER),
+            ):
+                if expression == expr.UNDEFINED:
+                    continue
+
+                entries = self._type_errors(
+                    expression,
+                    expected_type,
+                    {l.source, *preceding[l.source]},
+                )
+                if entries:
+                    self.error.extend(entries)
+                elif self._type_errors(expression, expected_type, {l.source, *definite[l.source]}):
+                    self.error.extend(
+                        self._unproven(
+                            f'that all variables in "{expression}" are defined',
+                            expression.location,
+                        ),
+                    )
+
+    def _type_errors(
+        self,
+        expression: expr.Expr,
+        expected_type: ty.Type,
+        fields: set[Field],
+    ) -> list[ErrorEntry]:
+        types = {f: t for f, t in self.types.items() if f in self.parameters or f in fields}
+        return (
+            expression.substituted(_remove_types)
+            .substituted(lambda e: self.typed_expression(e, types))
+            .check_type(expected_type)
+            .entries
+        )
+
     def _verify_links(self) -> None:
         for link in self.structure:
             self._verify_empty(link)
@@ -1811,8 +2007,21 @@ class Message(type_decl.TypeDecl):
                         lower_field = (
                             Field(lower.name) if lower.name.lower() != "message" else INITIAL
                         )
-                        for p in self.paths(upper_field):
-                            if not any(lower_field == l.source for l in p):
+                        # Without enumerating all paths, the check is based on the fields which
+                        # precede the upper field on all paths
+                        missing = (
+                            [
+                                lower_field != INITIAL
+                                and lower_field not in self._dominators(self.structure)[upper_field]
+                            ]
+                            if self._summarize_paths
+                            else [
+                                not any(lower_field == l.source for l in p)
+                                for p in self.paths(upper_field)
+                            ]
+                        )
+                        for m in missing:
+                            if m:
                                 self.error.extend(
                                     [
                                         ErrorEntry(
@@ -1824,9 +2033,15 @@ class Message(type_decl.TypeDecl):
                                     ],
                                 )
 
+        conditions = (
+            [l.condition for l in self.structure]
+            if self._summarize_paths
+            else [self.path_condition(FINAL)]
+        )
         checked = {
             e.prefix.identifier
-            for e in self.path_condition(FINAL).findall(lambda x: isinstance(x, expr.ValidChecksum))
+            for c in conditions
+            for e in c.findall(lambda x: isinstance(x, expr.ValidChecksum))
             if isinstance(e, expr.ValidChecksum) and isinstance(e.prefix, expr.Variable)
         }
         for name in set(self.checksums) - checked:
@@ -1851,12 +2066,21 @@ class Message(type_decl.TypeDecl):
             )
 
     def _prove_static_conditions(self, proofs: expr_proof.ParallelProofs) -> None:
+        reachability = (
+            self._reachability_constraints(conditions_only=True) if self._summarize_paths else []
+        )
+
         for l in self._structure:
             if l.condition == expr.TRUE:
                 continue
             facts = [
                 expr.Equal(l.condition, expr.FALSE),
-                self.path_condition(l.source),
+                (
+                    self._reachable(l.source)
+                    if self._summarize_paths
+                    else self.path_condition(l.source)
+                ),
+                *reachability,
                 *self.message_constraints,
                 *self.aggregate_constraints(l.condition),
             ]
@@ -1939,11 +2163,11 @@ class Message(type_decl.TypeDecl):
                                 ),
                             ],
                         )
-                        for path in self.paths(f):
+                        for path in self._verified_paths(f):
                             facts = [
                                 *self.message_constraints,
                                 *self.aggregate_constraints(conflict),
-                                *self._path_constraints(path),
+                                *self._verified_path_constraints(path),
                             ]
                             proofs.add(
                                 conflict,
@@ -2033,11 +2257,42 @@ class Message(type_decl.TypeDecl):
                         )
                     self.error.extend(error)
 
+    def _prove_conditions_at_outgoing_links_summarized(
+        self,
+        valid_paths: set[tuple[Link, ...]],
+    ) -> None:
+        """
+        Find all fields that have no satisfiable condition at any outgoing link.
+
+        In contrast to `_prove_conditions_at_outgoing_links`, the check is based on the validity
+        of the links instead of the validity of all paths.
+        """
+        valid_links = {l for (l,) in valid_paths}
+        affected: set[Field] = set()
+
+        for f in self.fields:
+            if any(l in valid_links for l in self.outgoing(f)):
+                continue
+
+            # Fields which can only be reached via an affected field are not mentioned
+            if all(l.source in affected for l in self.incoming(f)):
+                affected.add(f)
+                continue
+
+            affected.add(f)
+            self.error.push(
+                ErrorEntry(
+                    f'field "{f.name}" has no satisfiable condition at any outgoing link',
+                    Severity.ERROR,
+                    f.identifier.location,
+                ),
+            )
+
     def _prove_overlays(self, proofs: expr_proof.ParallelProofs) -> None:
         for f in (INITIAL, *self.fields):
-            for p, l in [(p, p[-1]) for p in self.paths(f) if p]:
+            for p, l in [(p, p[-1]) for p in self._verified_paths(f) if p]:
                 if l.first != expr.UNDEFINED and isinstance(l.first, expr.First):
-                    facts = self._path_constraints(p)
+                    facts = self._verified_path_constraints(p)
                     overlaid = expr.Equal(
                         self._target_last(l),
                         expr.Last(l.first.prefix),
@@ -2060,17 +2315,33 @@ class Message(type_decl.TypeDecl):
                         unknown_error=error.entries,
                         add_unsat=True,
                     )
+                    if self._summarize_paths:
+                        # The field must be congruent on each path separately
+                        unproven = self._unproven(
+                            f'that field "{f.name}" is congruent with overlaid field'
+                            f' "{l.first.prefix}"',
+                            l.location,
+                        )
+                        proofs.add(
+                            expr.Not(overlaid),
+                            facts,
+                            sat_error=unproven,
+                            unknown_error=unproven,
+                        )
 
     def _prove_field_positions(
         self,
         proofs: expr_proof.ParallelProofs,
         valid_paths: set[tuple[Link, ...]],
     ) -> None:
+        path_proofs, indices = self._path_proofs()
+
         for f in (*self.fields, FINAL):
-            for path in self.paths(f):
+            for path in self._verified_paths(f):
                 if path not in valid_paths:
                     continue
 
+                path_indices = tuple(indices[l] for l in path)
                 last = path[-1]
                 field_size = self._target_size(last)
                 negative = expr.Less(field_size, expr.Number(0), last.size.location)
@@ -2081,8 +2352,6 @@ class Message(type_decl.TypeDecl):
                 )
 
                 facts = [
-                    *self._path_constraints(path),
-                    *self.message_constraints,
                     *self.aggregate_constraints(negative),
                     *self.aggregate_constraints(start),
                 ]
@@ -2101,7 +2370,8 @@ class Message(type_decl.TypeDecl):
                         ),
                     ],
                 )
-                proofs.add(
+                path_proofs.add(
+                    path_indices,
                     negative,
                     facts,
                     sat_error=error.entries,
@@ -2126,13 +2396,31 @@ class Message(type_decl.TypeDecl):
                         ),
                     ],
                 )
-                proofs.add(
+                path_proofs.add(
+                    path_indices,
                     start,
                     facts,
                     unsat_error=error.entries,
                     unknown_error=error.entries,
                     add_unsat=True,
                 )
+                if self._summarize_paths:
+                    # The start must be non-negative on each path separately
+                    unproven = self._unproven(
+                        (
+                            f'non-negative start of field "{f.name}"'
+                            if f != FINAL
+                            else "non-negative start of end of message"
+                        ),
+                        last.location,
+                    )
+                    path_proofs.add(
+                        path_indices,
+                        expr.Not(start),
+                        facts,
+                        sat_error=unproven,
+                        unknown_error=unproven,
+                    )
 
                 if f in self.types:
                     t = self.types[f]
@@ -2174,7 +2462,8 @@ class Message(type_decl.TypeDecl):
                                 ),
                             ],
                         )
-                        proofs.add(
+                        path_proofs.add(
+                            path_indices,
                             start_aligned,
                             [
                                 *facts,
@@ -2223,7 +2512,8 @@ class Message(type_decl.TypeDecl):
                                 ),
                             ],
                         )
-                        proofs.add(
+                        path_proofs.add(
+                            path_indices,
                             is_multiple_of_element_size,
                             [
                                 *facts,
@@ -2234,6 +2524,8 @@ class Message(type_decl.TypeDecl):
                             unknown_error=error.entries,
                         )
 
+        path_proofs.check(proofs)
+
     def _prove_message_size(self, proofs: expr_proof.ParallelProofs) -> None:
         """Prove that all paths lead to a message with a size that is a multiple of 8 bit."""
         message_constraints = self.message_constraints
@@ -2243,6 +2535,35 @@ class Message(type_decl.TypeDecl):
             if isinstance(t, (type_decl.Opaque, type_decl.Sequence))
         ]
 
+        if self._summarize_paths:
+            for l in self.incoming(FINAL):
+                error = RecordFluxError(
+                    [
+                        ErrorEntry(
+                            "message size must be multiple of 8 bit",
+                            Severity.ERROR,
+                            self.identifier.location,
+                            annotations=annotate_path((l,), self.location),
+                        ),
+                    ],
+                )
+                proofs.add(
+                    expr.NotEqual(
+                        expr.Mod(self._accumulated_size(l.source), expr.Number(8)),
+                        expr.Number(0),
+                        location=self.location,
+                    ),
+                    [
+                        self._reachable(l.source),
+                        *self._reachability,
+                        *message_constraints,
+                        *field_size_constraints,
+                    ],
+                    sat_error=error.entries,
+                    unknown_error=error.entries,
+                )
+            return
+
         for path in [p[:-1] for p in self.paths(FINAL) if p]:
             message_size = expr.Add(
                 *[
@@ -2560,6 +2881,10 @@ class Refinement(type_decl.TypeDecl):
                 ),
             )
 
+    def verify(self, workers: int = 1) -> None:  # noqa: ARG002
+        self._verify()
+        self.error.propagate()
+
     def _verify(self) -> None:
         self._verify_field()
         self._verify_condition()
@@ -2750,6 +3075,7 @@ class UncheckedMessage(type_decl.UncheckedTypeDecl):
         declarations: Sequence[TopLevelDeclaration],
         skip_verification: bool = False,
         workers: int = 1,
+        summarize_paths: bool = False,
     ) -> Message:
         error = RecordFluxError()
         arguments = {}
@@ -2835,6 +3161,7 @@ class UncheckedMessage(type_decl.UncheckedTypeDecl):
             location=result.location,
             skip_verification=skip_verification,
             workers=workers,
+            summarize_paths=summarize_paths,
         )
 
     def merged(
@@ -3248,6 +3575,7 @@ class UncheckedDerivedMessage(type_decl.UncheckedTypeDecl):
         declarations: Sequence[TopLevelDeclaration],
         skip_verification: bool = False,  # noqa: ARG002
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> DerivedMessage:
         base_types = [
             t
@@ -3323,6 +3651,7 @@ class UncheckedRefinement(type_decl.UncheckedTypeDecl):
         declarations: Sequence[TopLevelDeclaration],
         skip_verification: bool = False,
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> Refinement:
         error = RecordFluxError()
         messages = {t.identifier: t for t in declarations if isinstance(t, Message)}
@@ -3576,12 +3905,6 @@ def all_types_declared(
     return True
 
 
-def prove(
-    facts: list[expr.Expr],
-) -> expr_proof.ProofResult:
-    return expr_proof.Proof(expr.TRUE, facts).result
-
-
 def annotate_path(
     path: Sequence[Link],
     message_location: Location,
@@ -3608,5 +3931,12 @@ def annotate_path(
     ]
 
 
+def _remove_types(expression: expr.Expr) -> expr.Expr:
+    if isinstance(expression, expr.Variable):
+        expression = copy(expression)
+        expression.type_ = ty.Undefined()
+    return expression
+
+
 def filter_builtins_and_current_field(link: Link, field: Field) -> bool:
     return link.target not in (INITIAL, FINAL, field)
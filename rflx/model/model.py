@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import itertools
 from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from dataclasses import dataclass
 from pathlib import Path
 
-from rflx import const
+from rflx import const, process_pool, proof_cache
 from rflx.common import Base, unique, verbose_repr
 from rflx.identifier import ID
+from rflx.proof_cache import ProofCache
 from rflx.rapidflux import Annotation, ErrorEntry, RecordFluxError, Severity, logging
 
 from . import message, state_machine, top_level_declaration, type_decl
@@ -26,32 +28,90 @@ class UncheckedModel(Base):
         self,
         cache: Cache,
         workers: int = 1,
+        summarize_paths: bool = False,
     ) -> Model:
+        with proof_cache.active(cache.proofs):
+            try:
+                return self._checked(cache, workers, summarize_paths)
+            finally:
+                cache.flush()
+
+    def _checked(self, cache: Cache, workers: int, summarize_paths: bool) -> Model:
         error = RecordFluxError(self.error.entries)
         declarations: list[top_level_declaration.TopLevelDeclaration] = []
+        unverified = self._unverified_declarations(summarize_paths)
+        verified = _verify_concurrently(self.declarations, unverified, cache, workers)
+        invalidated = False
 
-        for d in self.declarations:
+        for i, d in enumerate(self.declarations):
             try:
-                unverified = d.checked(declarations, skip_verification=True)
-                digest = Digest(unverified)
+                # The declarations checked in advance are only valid as long as the preceding
+                # declarations are the same as those used for the check
+                if invalidated:
+                    unverified_declaration = d.checked(
+                        declarations,
+                        skip_verification=True,
+                        summarize_paths=summarize_paths,
+                    )
+                else:
+                    unverified_result = unverified[i]
+                    if isinstance(unverified_result, RecordFluxError):
+                        raise unverified_result  # noqa: TRY301
+                    unverified_declaration = unverified_result
+                digest = Digest(unverified_declaration)
                 if cache.is_verified(digest):
                     logging.info(
                         "Skipping verification of {identifier} ({reason})",
                         identifier=d.identifier,
                         reason=cache.is_verified_reason,
                     )
-                    checked = unverified
+                    checked = unverified_declaration
                 else:
                     logging.info("Verifying {identifier}", identifier=d.identifier)
-                    checked = d.checked(declarations, workers=workers)
+                    if i in verified and (
+                        not invalidated or unverified_declaration == unverified[i]
+                    ):
+                        verification = verified[i]
+                        if not isinstance(verification, top_level_declaration.TopLevelDeclaration):
+                            raise RecordFluxError(verification)  # noqa: TRY301
+                        checked = verification
+                    else:
+                        checked = d.checked(
+                            declarations,
+                            workers=workers,
+                            summarize_paths=summarize_paths,
+                        )
                     checked.check_style(error, self.style_checks)
                 declarations.append(checked)
                 cache.add_verified(digest)
-            except RecordFluxError as e:  # noqa: PERF203
+            except RecordFluxError as e:
                 error.extend(e.entries)
+                invalidated |= not isinstance(unverified[i], RecordFluxError)
 
         return Model(declarations, error)
 
+    def _unverified_declarations(
+        self,
+        summarize_paths: bool,
+    ) -> list[top_level_declaration.TopLevelDeclaration | RecordFluxError]:
+        """Check all declarations without verifying them."""
+        result: list[top_level_declaration.TopLevelDeclaration | RecordFluxError] = []
+        declarations: list[top_level_declaration.TopLevelDeclaration] = []
+
+        for d in self.declarations:
+            try:
+                checked = d.checked(
+                    declarations,
+                    skip_verification=True,
+                    summarize_paths=summarize_paths,
+                )
+                declarations.append(checked)
+                result.append(checked)
+            except RecordFluxError as e:  # noqa: PERF203
+                result.append(e)
+
+        return result
+
 
 class Model(Base):
     def __init__(
@@ -270,3 +330,79 @@ def _check_conflicts(
             )
 
     return error
+
+
+def _verify_concurrently(
+    unchecked: Sequence[top_level_declaration.UncheckedTopLevelDeclaration],
+    unverified: Sequence[top_level_declaration.TopLevelDeclaration | RecordFluxError],
+    cache: Cache,
+    workers: int,
+) -> dict[int, top_level_declaration.TopLevelDeclaration | list[ErrorEntry]]:
+    """
+    Verify independent declarations concurrently.
+
+    The declarations are scheduled according to their dependencies: The verification of a
+    declaration is started when all declarations it depends on have been verified successfully.
+    The result maps the index of each verified declaration to the verified declaration or the
+    errors found during its verification. Declarations which depend on a declaration with errors
+    are not verified. The proofs of a declaration are done sequentially by the process verifying
+    the declaration, so that the number of processes does not exceed the number of workers.
+    """
+    pending = {
+        i: d
+        for i, d in enumerate(unverified)
+        if isinstance(unchecked[i], (message.UncheckedMessage, message.UncheckedRefinement))
+        and isinstance(d, type_decl.TypeDecl)
+        and not cache.is_verified(Digest(d))
+    }
+
+    if workers <= 1 or len(pending) <= 1:
+        return {}
+
+    indices = {d.identifier: i for i, d in pending.items()}
+    dependencies = {
+        i: {
+            indices[t.identifier]
+            for t in d.direct_dependencies
+            if t.identifier in indices and indices[t.identifier] < i
+        }
+        for i, d in pending.items()
+    }
+    result: dict[int, top_level_declaration.TopLevelDeclaration | list[ErrorEntry]] = {}
+    running: dict[
+        Future[top_level_declaration.TopLevelDeclaration | list[ErrorEntry]],
+        int,
+    ] = {}
+
+    executor = process_pool.executor(workers)
+
+    while dependencies or running:
+        for i, d in list(dependencies.items()):
+            if not d <= result.keys():
+                continue
+            del dependencies[i]
+            if all(isinstance(result[j], top_level_declaration.TopLevelDeclaration) for j in d):
+                running[executor.submit(_verify, pending[i], cache.proofs)] = i
+
+        if not running:
+            break
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            result[running.pop(future)] = future.result()
+
+    return result
+
+
+def _verify(
+    declaration: top_level_declaration.TopLevelDeclaration,
+    proofs: ProofCache | None,
+) -> top_level_declaration.TopLevelDeclaration | list[ErrorEntry]:
+    try:
+        with proof_cache.active(proofs):
+            # The proofs are done sequentially, as the number of processes is limited by the pool
+            # and a pool must not be started by a process of a pool
+            declaration.verify()
+    except RecordFluxError as e:
+        return e.entries
+    return declaration
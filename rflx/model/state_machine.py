@@ -1143,6 +1143,7 @@ class UncheckedStateMachine(UncheckedTopLevelDeclaration):
         declarations: Sequence[TopLevelDeclaration],
         skip_verification: bool = False,  # noqa: ARG002
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> StateMachine:
         return StateMachine(
             self.identifier,
@@ -41,6 +41,14 @@ class TopLevelDeclaration(Base):
     ) -> None:
         pass
 
+    def verify(self, workers: int = 1) -> None:  # noqa: ARG002
+        """
+        Verify a declaration which was created without verification.
+
+        A RecordFluxError is raised if the verification fails. Declarations which are always
+        verified on creation do not need to be verified separately.
+        """
+
     def _check_identifier(self) -> None:
         if len(self.identifier.parts) != 2:
             self.error.extend(
@@ -68,5 +76,6 @@ class UncheckedTopLevelDeclaration(Base):
         declarations: Sequence[TopLevelDeclaration],
         skip_verification: bool = False,
         workers: int = 1,
+        summarize_paths: bool = False,
     ) -> TopLevelDeclaration:
         raise NotImplementedError
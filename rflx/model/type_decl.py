@@ -721,6 +721,7 @@ class UncheckedTypeDecl(UncheckedTopLevelDeclaration):
         declarations: typing.Sequence[TopLevelDeclaration],
         skip_verification: bool = False,
         workers: int = 1,
+        summarize_paths: bool = False,
     ) -> TypeDecl:
         raise NotImplementedError
 
@@ -738,6 +739,7 @@ class UncheckedInteger(UncheckedTypeDecl):
         _declarations: typing.Sequence[TopLevelDeclaration],
         skip_verification: bool = False,  # noqa: ARG002
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> Integer:
         return Integer(self.identifier, self.first, self.last, self.size, self.location)
 
@@ -753,6 +755,7 @@ class UncheckedUnsignedInteger(UncheckedTypeDecl):
         _declarations: typing.Sequence[TopLevelDeclaration],
         skip_verification: bool = False,  # noqa: ARG002
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> UnsignedInteger:
         return UnsignedInteger(self.identifier, self.size, self.location)
 
@@ -770,6 +773,7 @@ class UncheckedEnumeration(UncheckedTypeDecl):
         _declarations: typing.Sequence[TopLevelDeclaration],
         skip_verification: bool = False,  # noqa: ARG002
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> Enumeration:
         return Enumeration(
             self.identifier,
@@ -791,6 +795,7 @@ class UncheckedSequence(UncheckedTypeDecl):
         declarations: typing.Sequence[TopLevelDeclaration],
         skip_verification: bool = False,  # noqa: ARG002
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> Sequence:
         element_type = next(
             (
@@ -819,6 +824,7 @@ class UncheckedOpaque(UncheckedTypeDecl):
         _declarations: typing.Sequence[TopLevelDeclaration],
         skip_verification: bool = False,  # noqa: ARG002
         workers: int = 1,  # noqa: ARG002
+        summarize_paths: bool = False,  # noqa: ARG002
     ) -> Opaque:
         return Opaque(location=Location((1, 1), Path(str(const.BUILTINS_PACKAGE)), (1, 1)))
 
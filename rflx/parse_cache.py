@@ -0,0 +1,171 @@
+"""
+Cache of the results of parsing specification files.
+
+The results are stored under a key which is derived from the name and the content of a
+specification file and from a fingerprint of the tool, so that a file is only parsed again if the
+file or the tool has changed. Each result is pickled into a separate file, which is replaced
+atomically, so that the cache can be shared by concurrent processes. If the number of entries
+exceeds the capacity of the cache, the least recently used entries are removed.
+
+The cache directory is part of the working directory and could contain files of others. As
+unpickling a crafted file can execute arbitrary code, each entry is authenticated by an HMAC of
+its key and its content. The secret of the HMAC is stored in the home directory of the user and is
+created when it is used for the first time. Entries which cannot be authenticated are ignored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import tempfile
+from pathlib import Path
+
+from rflx.common import CacheStatistics
+from rflx.const import CACHE_PATH
+from rflx.error import warn
+
+DEFAULT_DIRECTORY = CACHE_PATH / "specifications"
+DEFAULT_CAPACITY = 10000
+
+_SECRET_SIZE = 32
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+# Number of added entries after which the size of the cache is checked
+_EVICTION_INTERVAL = 64
+
+_SUFFIX = ".pickle"
+
+
+class ParseCache:
+    def __init__(
+        self,
+        directory: Path = DEFAULT_DIRECTORY,
+        capacity: int = DEFAULT_CAPACITY,
+        secret_file: Path | None = None,
+    ) -> None:
+        """
+        Create a cache in the given directory.
+
+        The secret used for authenticating the entries is read from the given file. By default,
+        `$HOME/.cache/RecordFlux/parse_cache.key` is used.
+        """
+        self._directory = directory
+        self._capacity = capacity
+        self._secret_file = secret_file
+        self._secret: bytes | None = None
+        self._disabled = False
+        self._added = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> object | None:
+        # The cache is only an optimization: An unusable entry leads to parsing the file again
+        file = self._directory / f"{key}{_SUFFIX}"
+        secret = self._load_secret()
+        try:
+            content = file.read_bytes() if secret is not None else b""
+        except OSError:
+            content = b""
+        if secret is None or not content:
+            self._misses += 1
+            return None
+
+        data = content[_DIGEST_SIZE:]
+        if not hmac.compare_digest(content[:_DIGEST_SIZE], _digest(secret, key, data)):
+            warn(f'ignoring entry of parse cache which cannot be authenticated: "{file}"')
+            self._misses += 1
+            return None
+
+        try:
+            # The entry has been created by this user, as it has been authenticated
+            result = pickle.loads(data)  # noqa: S301
+            os.utime(file)
+        except (OSError, pickle.UnpicklingError, AttributeError, ImportError):
+            self._misses += 1
+            return None
+        self._hits += 1
+        return result
+
+    def add(self, key: str, value: object) -> None:
+        secret = self._load_secret()
+        if secret is None:
+            return
+        try:
+            data = pickle.dumps(value)
+            self._directory.mkdir(parents=True, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as f:
+                    f.write(_digest(secret, key, data))
+                    f.write(data)
+                Path(temporary).replace(self._directory / f"{key}{_SUFFIX}")
+            except BaseException:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+            self._added += 1
+            if self._added % _EVICTION_INTERVAL == 0:
+                self._evict()
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # Values which cannot be pickled or stored are not cached
+            pass
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(self._hits, self._misses)
+
+    def _load_secret(self) -> bytes | None:
+        """Return the secret of the HMACs or None if the cache cannot be used."""
+        if self._secret is None and not self._disabled:
+            try:
+                self._secret = _secret(
+                    self._secret_file
+                    or Path.home() / ".cache" / "RecordFlux" / "parse_cache.key",
+                )
+            except (OSError, RuntimeError, ValueError) as e:
+                warn(f"parse cache will be ignored due to error: {e}")
+                self._disabled = True
+        return self._secret
+
+    def _evict(self) -> None:
+        entries = []
+        for file in self._directory.glob(f"*{_SUFFIX}"):
+            try:
+                entries.append((file.stat().st_mtime_ns, file))
+            except FileNotFoundError:  # noqa: PERF203
+                pass
+        entries.sort()
+        for _, file in entries[: max(0, len(entries) - self._capacity)]:
+            file.unlink(missing_ok=True)
+
+
+def _secret(file: Path) -> bytes:
+    """Return the secret stored in the given file, which is created if it does not exist."""
+    if not file.exists():
+        file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(secrets.token_bytes(_SECRET_SIZE))
+            # Linking fails if the file has been created concurrently by another process
+            os.link(temporary, file)
+        except FileExistsError:
+            pass
+        finally:
+            Path(temporary).unlink(missing_ok=True)
+    result = file.read_bytes()
+    if len(result) != _SECRET_SIZE:
+        raise ValueError(f'invalid secret in "{file}"')
+    return result
+
+
+def _digest(secret: bytes, key: str, data: bytes) -> bytes:
+    return hmac.new(secret, key.encode() + b"\0" + data, hashlib.sha256).digest()
+
+
+def key(filename: Path, source: str, fingerprint: str) -> str:
+    """Return the key of the result of parsing the given source of a specification file."""
+    return hashlib.blake2b(
+        "\n".join([fingerprint, str(filename), source]).encode(),
+    ).hexdigest()
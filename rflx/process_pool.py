@@ -0,0 +1,112 @@
+"""
+Process pools shared by all parts of RecordFlux.
+
+Starting a process pool is expensive, as each process has to import the required modules (e.g.,
+`z3`) before it can execute the first task. Instead of starting a new pool for each batch of
+proofs, a pool is started on first use and reused for the whole run of the program.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from time import perf_counter
+
+from rflx.const import MP_CONTEXT
+
+
+@dataclass
+class Statistics:
+    starts: int = 0
+    reuses: int = 0
+    startup_time: float = 0.0
+
+    @property
+    def saved_time(self) -> float:
+        """Estimate the time saved by reusing pools instead of starting a new pool each time."""
+        return self.reuses * self.startup_time / self.starts if self.starts else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.starts} starts, {self.reuses} reuses,"
+            f" {self.startup_time:.2f} s startup time, {self.saved_time:.2f} s saved"
+        )
+
+
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+_STATISTICS = Statistics()
+_LOCK = threading.Lock()
+
+# Identifiers of the current process, if it is a process of a pool
+_WORKER_PROCESSES: set[int] = set()
+
+
+def executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared process pool with the given number of workers.
+
+    The pool is started on first use and replaced if it has become unusable. Each process of the
+    pool imports the proof modules on start-up. The pool must not be shut down by the caller.
+
+    The pools are shut down at exit, which does not happen in the processes of a pool. Therefore,
+    a pool must not be requested by a process of a pool.
+    """
+    assert os.getpid() not in _WORKER_PROCESSES, "process pool requested by a process of a pool"
+
+    with _LOCK:
+        pool = _POOLS.get(workers)
+
+        if pool is not None:
+            try:
+                # A pool becomes unusable if one of its processes terminates abruptly, which is
+                # detected when a task is submitted
+                pool.submit(_noop)
+            except BrokenProcessPool:
+                pool.shutdown(wait=False)
+            else:
+                _STATISTICS.reuses += 1
+                return pool
+
+        start = perf_counter()
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=MP_CONTEXT,
+            initializer=_initialize,
+        )
+        # Processes are started when tasks are submitted, so that one task per worker usually
+        # starts all processes of the pool in advance
+        list(pool.map(_noop, range(workers)))
+        _STATISTICS.starts += 1
+        _STATISTICS.startup_time += perf_counter() - start
+        _POOLS[workers] = pool
+
+        return pool
+
+
+def shutdown() -> None:
+    """Shut down all shared process pools."""
+    with _LOCK:
+        for pool in _POOLS.values():
+            pool.shutdown()
+        _POOLS.clear()
+
+
+def statistics() -> Statistics:
+    return replace(_STATISTICS)
+
+
+def _initialize() -> None:
+    _WORKER_PROCESSES.add(os.getpid())
+
+    from rflx import expr_proof, ir  # noqa: F401
+
+
+def _noop(_: object = None) -> None:
+    pass
+
+
+atexit.register(shutdown)
@@ -0,0 +1,320 @@
+"""
+Cache of the results of individual proofs.
+
+The results are stored under a key which is derived from the goal and the facts of a proof. The
+key is independent of the order of the facts and of the names of the variables, so that a proof
+is only repeated if the proof problem itself has changed. The cache is stored in a SQLite
+database in write-ahead logging mode, so that it can be shared by concurrent processes. The added
+results, the times of use and the statistics are collected and written in one transaction when
+the cache is flushed, at the latest at the end of the outermost context in which the cache is
+active. If the number of entries exceeds the capacity of the cache, the least recently used
+entries are removed. Optionally, the hits and misses of all processes using the same cache object
+are counted in the database.
+
+A cache object transferred to another process is represented by one object per process, which is
+shared by all tasks executed by the process. Its changes are written when a batch is full and when
+the process exits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing.util
+import sqlite3
+import time
+import uuid
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import z3
+
+from rflx.common import CacheStatistics
+from rflx.const import CACHE_PATH
+
+DEFAULT_FILE = CACHE_PATH / "proofs.sqlite"
+DEFAULT_CAPACITY = 100000
+
+# Number of added entries after which the size of the cache is checked
+_EVICTION_INTERVAL = 256
+
+# Number of lookups and added entries after which the changes are written to the database
+_BATCH_SIZE = 256
+
+# Time in nanoseconds after which the statistics of a run are removed
+_STATISTICS_LIFETIME = 24 * 60 * 60 * 10**9
+
+
+@dataclass(frozen=True)
+class Outcome:
+    """
+    Result of a proof.
+
+    The result is given by the name of the corresponding `ProofResult`. The unsat core is only
+    stored if it was requested. It consists of the names of the facts which are part of the unsat
+    core, where the names refer to the order of the facts used for determining the key.
+    """
+
+    result: str
+    reason: str | None = None
+    core: tuple[str, ...] | None = None
+
+
+class ProofCache:
+    def __init__(
+        self,
+        file: Path = DEFAULT_FILE,
+        capacity: int = DEFAULT_CAPACITY,
+        record_statistics: bool = False,
+    ) -> None:
+        self._file = file
+        self._capacity = capacity
+        self._connection: sqlite3.Connection | None = None
+        self._shared = False
+        # The lookups of all processes are counted under the same identifier
+        self._run = uuid.uuid4().hex if record_statistics else None
+        self._reset_changes()
+
+    def __reduce__(self) -> tuple[object, tuple[Path, int, str | None]]:
+        # Only the location of the cache is transferred to other processes. Each process opens
+        # its own connection to the database.
+        return (_shared_instance, (self._file, self._capacity, self._run))
+
+    def get(self, key: str) -> Outcome | None:
+        outcome = self._outcomes.get(key)
+        if outcome is None:
+            try:
+                row = (
+                    self._connect()
+                    .execute("SELECT result, reason, core FROM proofs WHERE key = ?", (key,))
+                    .fetchone()
+                )
+            except sqlite3.Error:
+                # The cache is only an optimization: An unusable cache must not prevent the proof
+                row = None
+            if row is not None:
+                result, reason, core = row
+                outcome = Outcome(result, reason, None if core is None else tuple(json.loads(core)))
+
+        if outcome is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._used[key] = time.time_ns()
+        self._flush_if_full()
+        return outcome
+
+    def statistics(self) -> CacheStatistics | None:
+        """Return the hits and misses of all processes, if the statistics are recorded."""
+        if self._run is None:
+            return None
+        self.flush()
+        try:
+            row = (
+                self._connect()
+                .execute("SELECT hits, misses FROM statistics WHERE run = ?", (self._run,))
+                .fetchone()
+            )
+        except sqlite3.Error:
+            return None
+        return CacheStatistics(*row) if row is not None else CacheStatistics()
+
+    def add(self, key: str, outcome: Outcome) -> None:
+        self._outcomes[key] = outcome
+        self._used[key] = time.time_ns()
+        self._flush_if_full()
+
+    def flush(self) -> None:
+        """Write all added outcomes, the times of use and the statistics in one transaction."""
+        outcomes, used, hits, misses = self._outcomes, self._used, self._hits, self._misses
+        self._reset_changes()
+
+        statistics = self._run is not None and (hits or misses)
+        if not outcomes and not used and not statistics:
+            return
+
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO proofs (key, result, reason, core, used)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            key,
+                            outcome.result,
+                            outcome.reason,
+                            None if outcome.core is None else json.dumps(outcome.core),
+                            used[key],
+                        )
+                        for key, outcome in outcomes.items()
+                    ],
+                )
+                connection.executemany(
+                    "UPDATE proofs SET used = ? WHERE key = ?",
+                    [(t, key) for key, t in used.items() if key not in outcomes],
+                )
+                if statistics:
+                    connection.execute(
+                        "INSERT INTO statistics (run, hits, misses, updated) VALUES (?, ?, ?, ?)"
+                        " ON CONFLICT (run) DO UPDATE SET hits = hits + excluded.hits,"
+                        " misses = misses + excluded.misses, updated = excluded.updated",
+                        (self._run, hits, misses, time.time_ns()),
+                    )
+                if outcomes:
+                    # The added entries are counted in the database, as the entries are added by
+                    # several processes
+                    connection.execute(
+                        "INSERT INTO counters (name, value) VALUES ('added', ?)"
+                        " ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                        (len(outcomes),),
+                    )
+                    (added,) = connection.execute(
+                        "SELECT value FROM counters WHERE name = 'added'",
+                    ).fetchone()
+                    if (added - len(outcomes)) // _EVICTION_INTERVAL != added // _EVICTION_INTERVAL:
+                        self._evict(connection)
+        except sqlite3.Error:
+            pass
+
+    def _reset_changes(self) -> None:
+        self._outcomes: dict[str, Outcome] = {}
+        self._used: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def _flush_if_full(self) -> None:
+        if len(self._used) + self._misses >= _BATCH_SIZE:
+            self.flush()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._file.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._file, timeout=30)
+            # Readers do not block writers and vice versa in write-ahead logging mode. The
+            # database cannot be corrupted by a crash with normal synchronization in this mode.
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS proofs ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, reason TEXT, core TEXT,"
+                " used INTEGER NOT NULL)",
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS proofs_used ON proofs (used)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS statistics ("
+                "run TEXT PRIMARY KEY, hits INTEGER NOT NULL, misses INTEGER NOT NULL,"
+                " updated INTEGER NOT NULL)",
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+            )
+            self._connection = connection
+        return self._connection
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        connection.execute(
+            "DELETE FROM proofs WHERE key IN (SELECT key FROM proofs ORDER BY used"
+            " LIMIT max(0, (SELECT count(*) FROM proofs) - ?))",
+            (self._capacity,),
+        )
+        connection.execute(
+            "DELETE FROM statistics WHERE updated < ?",
+            (time.time_ns() - _STATISTICS_LIFETIME,),
+        )
+
+
+_ACTIVE: list[ProofCache | None] = []
+
+# Cache objects which were transferred to the current process
+_SHARED: dict[tuple[Path, int, str | None], ProofCache] = {}
+
+
+def _shared_instance(file: Path, capacity: int, run: str | None) -> ProofCache:
+    cache = _SHARED.get((file, capacity, run))
+    if cache is None:
+        cache = ProofCache(file, capacity)
+        cache._run = run  # noqa: SLF001
+        cache._shared = True  # noqa: SLF001
+        multiprocessing.util.Finalize(None, cache.flush, exitpriority=0)
+        _SHARED[(file, capacity, run)] = cache
+    return cache
+
+
+@contextmanager
+def active(cache: ProofCache | None) -> Generator[None, None, None]:
+    """
+    Use the given cache for all proofs inside the context.
+
+    The changes are written at the end of the outermost context, unless the cache object was
+    transferred from another process.
+    """
+    _ACTIVE.append(cache)
+    try:
+        yield
+    finally:
+        _ACTIVE.pop()
+        if cache is not None and cache not in _ACTIVE and not cache._shared:  # noqa: SLF001
+            cache.flush()
+
+
+def current() -> ProofCache | None:
+    return _ACTIVE[-1] if _ACTIVE else None
+
+
+def key(
+    logic: str,
+    goal: z3.ExprRef | None,
+    facts: Sequence[z3.ExprRef],
+) -> tuple[str, list[int]]:
+    """
+    Return the key of a proof and the order of the facts used for the key.
+
+    The facts are sorted by their structure, disregarding the names of variables. Then, the
+    variables are renamed in the order of their first occurrence in the goal and the sorted facts.
+    """
+    shapes = [_shape(f) for f in facts]
+    order = sorted(range(len(facts)), key=lambda i: (shapes[i], facts[i].sexpr()))
+    expressions = [*([goal] if goal is not None else []), *(facts[i] for i in order)]
+    renaming = [(v, z3.Const(f"v{i}", v.sort())) for i, v in enumerate(_variables(expressions))]
+    text = "\n".join(
+        [
+            z3.get_version_string(),
+            logic,
+            *((z3.substitute(e, *renaming) if renaming else e).sexpr() for e in expressions),
+        ],
+    )
+    return hashlib.sha256(text.encode()).hexdigest(), order
+
+
+def _shape(expression: z3.ExprRef) -> str:
+    variables = _variables([expression])
+    if not variables:
+        return expression.sexpr()
+    return z3.substitute(
+        expression,
+        *[(v, z3.Const("_", v.sort())) for v in variables],
+    ).sexpr()
+
+
+def _variables(expressions: Sequence[z3.ExprRef]) -> list[z3.ExprRef]:
+    """Return all uninterpreted constants in the order of their first occurrence."""
+    result: dict[int, z3.ExprRef] = {}
+    visited: set[int] = set()
+
+    for expression in expressions:
+        stack = [expression]
+        while stack:
+            e = stack.pop()
+            if e.get_id() in visited:
+                continue
+            visited.add(e.get_id())
+            if z3.is_const(e) and e.decl().kind() == z3.Z3_OP_UNINTERPRETED:
+                result.setdefault(e.get_id(), e)
+            else:
+                stack.extend(reversed(e.children()))
+
+    return list(result.values())
@@ -1,7 +1,16 @@
+from .batch import Columns as Columns, MessageView as MessageView
 from .bitstring import Bitstring as Bitstring
+from .checksum import (
+    CRC32 as CRC32,
+    IncrementalChecksumFunction as IncrementalChecksumFunction,
+    InternetChecksum as InternetChecksum,
+)
 from .error import PyRFLXError as PyRFLXError
+from .lazy import LazyMessage as LazyMessage
 from .package import Package as Package
 from .pyrflx import PyRFLX as PyRFLX
+from .result import ParseResult as ParseResult, ParseStatus as ParseStatus
+from .template import Template as Template
 from .typevalue import (
     ChecksumFunction as ChecksumFunction,
     EnumValue as EnumValue,
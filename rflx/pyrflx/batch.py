@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import importlib
+import json
+import typing as ty
+from collections import abc
+from dataclasses import dataclass, field
+from types import ModuleType
+
+from typing_extensions import Buffer
+
+from rflx.pyrflx.error import PyRFLXError
+
+
+class MessageView:
+    """
+    Read-only view of the field values of a parsed message.
+
+    Opaque fields are represented by read-only memory views referencing the parsed buffer, if
+    possible. Refinements are not applied, i.e., the contents of opaque fields are not parsed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: abc.Sequence[str],
+        values: abc.Mapping[str, object],
+        error: PyRFLXError | None = None,
+    ) -> None:
+        self._name = name
+        self._fields = fields
+        self._values = values
+        self._error = error
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def valid(self) -> bool:
+        return self._error is None
+
+    @property
+    def error(self) -> PyRFLXError | None:
+        return self._error
+
+    @property
+    def fields(self) -> abc.Sequence[str]:
+        return self._fields
+
+    @property
+    def valid_fields(self) -> list[str]:
+        return list(self._values)
+
+    def get(self, field_name: str) -> object:
+        if field_name not in self._values:
+            e = PyRFLXError()
+            if field_name not in self._fields:
+                e.push_msg(f'"{field_name}" is not a field of this message')
+            else:
+                e.push_msg(f'"{field_name}" is not set')
+            raise e
+        return self._values[field_name]
+
+
+@dataclass
+class Columns:
+    """
+    Field values of a sequence of parsed messages.
+
+    For each field, the list of values contains one entry per message. The value is None and the
+    corresponding entry in the validity mask is False, if the field is not set in a message. The
+    list of errors contains an entry for each message, which is None for successfully parsed
+    messages.
+
+    Columns created by `MessageValue.parse_columns` additionally contain the numeric values of
+    enumeration fields (`codes`) together with the numeric value of each literal (`literals`) and
+    the position of opaque and sequence fields (`spans`), given by the offset of the first byte
+    relative to the start of the message and the number of bytes.
+    """
+
+    values: dict[str, list[object]]
+    valid: dict[str, list[bool]]
+    errors: list[PyRFLXError | None]
+    codes: dict[str, list[int | None]] = field(default_factory=dict)
+    spans: dict[str, list[tuple[int, int] | None]] = field(default_factory=dict)
+    literals: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_views(cls, fields: abc.Sequence[str], views: abc.Iterable[MessageView]) -> Columns:
+        result = cls({f: [] for f in fields}, {f: [] for f in fields}, [])
+        for view in views:
+            for f in fields:
+                valid = f in view.valid_fields
+                result.values[f].append(view.get(f) if valid else None)
+                result.valid[f].append(valid)
+            result.errors.append(view.error)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def to_numpy(self) -> ty.Any:  # noqa: ANN401
+        """
+        Return the columns as a NumPy structured array with one record per message.
+
+        Enumeration fields are represented by their numeric values and opaque and sequence fields
+        by their position, if known (`<Field>'Offset` and `<Field>'Length`). Integer fields are
+        represented by 64-bit integers, all other fields by Python objects. The validity mask of
+        each field is contained in `<Field>'Valid`. Missing values are represented by zero.
+        """
+        numpy = _import("numpy")
+
+        columns: dict[str, ty.Any] = {}
+        for f, values in self.values.items():
+            if f in self.spans:
+                spans = self.spans[f]
+                columns[f"{f}'Offset"] = numpy.array(
+                    [s[0] if s is not None else 0 for s in spans],
+                    dtype=numpy.int64,
+                )
+                columns[f"{f}'Length"] = numpy.array(
+                    [s[1] if s is not None else 0 for s in spans],
+                    dtype=numpy.int64,
+                )
+            elif f in self.codes:
+                columns[f] = numpy.array(
+                    [c if c is not None else 0 for c in self.codes[f]],
+                    dtype=numpy.uint64,
+                )
+            elif all(v is None or isinstance(v, int) for v in values):
+                integers = [v if isinstance(v, int) else 0 for v in values]
+                columns[f] = numpy.array(
+                    integers,
+                    dtype=numpy.uint64 if max(integers, default=0) >= 2**63 else numpy.int64,
+                )
+            else:
+                columns[f] = numpy.empty(len(values), dtype=object)
+                columns[f][:] = [_python_value(v) for v in values]
+            columns[f"{f}'Valid"] = numpy.array(self.valid[f], dtype=numpy.bool_)
+
+        result = numpy.zeros(len(self), dtype=[(n, c.dtype) for n, c in columns.items()])
+        for n, c in columns.items():
+            result[n] = c
+        return result
+
+    def to_arrow(self) -> ty.Any:  # noqa: ANN401
+        """
+        Return the columns as an Arrow record batch with one row per message.
+
+        Enumeration fields are represented by their numeric values and opaque and sequence fields
+        by their position, if known (`<Field>'Offset` and `<Field>'Length`). The numeric values of
+        the literals of an enumeration field are contained as JSON object in the metadata of the
+        field (`literals`). Missing values are represented by nulls.
+        """
+        pyarrow = _import("pyarrow")
+
+        fields = []
+        arrays = []
+        for f, values in self.values.items():
+            if f in self.spans:
+                spans = self.spans[f]
+                for name, index in [(f"{f}'Offset", 0), (f"{f}'Length", 1)]:
+                    fields.append(pyarrow.field(name, pyarrow.int64()))
+                    arrays.append(
+                        pyarrow.array(
+                            [s[index] if s is not None else None for s in spans],
+                            type=pyarrow.int64(),
+                        ),
+                    )
+            elif f in self.codes:
+                fields.append(
+                    pyarrow.field(
+                        f,
+                        pyarrow.uint64(),
+                        metadata={"literals": json.dumps(self.literals.get(f, {}))},
+                    ),
+                )
+                arrays.append(pyarrow.array(self.codes[f], type=pyarrow.uint64()))
+            elif all(v is None or isinstance(v, int) for v in values):
+                array = pyarrow.array(
+                    values,
+                    type=(
+                        pyarrow.uint64()
+                        if max((v for v in values if isinstance(v, int)), default=0) >= 2**63
+                        else pyarrow.int64()
+                    ),
+                )
+                fields.append(pyarrow.field(f, array.type))
+                arrays.append(array)
+            else:
+                array = pyarrow.array([_python_value(v) for v in values])
+                fields.append(pyarrow.field(f, array.type))
+                arrays.append(array)
+
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=pyarrow.schema(fields))
+
+    def _add(
+        self,
+        field_name: str,
+        value: object,
+        code: int | None = None,
+        span: tuple[int, int] | None = None,
+    ) -> None:
+        """Add the value of a field of the current message."""
+        self.values[field_name].append(value)
+        self.valid[field_name].append(True)
+        if field_name in self.codes:
+            self.codes[field_name].append(code)
+        if field_name in self.spans:
+            self.spans[field_name].append(span)
+
+    def _complete(self, error: PyRFLXError | None = None) -> None:
+        """Complete the current message by adding missing values and discarding invalid values."""
+        row = len(self.errors)
+        self.errors.append(error)
+        for f, values in self.values.items():
+            if error is not None:
+                del values[row:]
+                del self.valid[f][row:]
+                if f in self.codes:
+                    del self.codes[f][row:]
+                if f in self.spans:
+                    del self.spans[f][row:]
+            if len(values) == row:
+                values.append(None)
+                self.valid[f].append(False)
+                if f in self.codes:
+                    self.codes[f].append(None)
+                if f in self.spans:
+                    self.spans[f].append(None)
+
+
+def buffers(
+    data: Buffer | abc.Iterable[Buffer],
+    offsets: abc.Sequence[int] | None = None,
+) -> abc.Iterator[Buffer]:
+    """
+    Return the buffers of a sequence of messages.
+
+    If no offsets are given, data must be a single buffer or an iterable of buffers. Otherwise,
+    data must be a single buffer (e.g., an `mmap` object) and the offsets define the start of each
+    message in this buffer. A message ends at the start of the following message or at the end of
+    the buffer. The messages are represented by memory views, so that the buffer is not copied.
+    """
+    if offsets is None:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            yield data
+        else:
+            assert isinstance(data, abc.Iterable)
+            yield from data
+        return
+
+    buffer = memoryview(ty.cast(Buffer, data)).cast("B").toreadonly()
+    for i, start in enumerate(offsets):
+        end = offsets[i + 1] if i + 1 < len(offsets) else len(buffer)
+        if not 0 <= start <= end <= len(buffer):
+            e = PyRFLXError()
+            e.push_msg(f"invalid message offsets {start} .. {end} in buffer of size {len(buffer)}")
+            raise e
+        yield buffer[start:end]
+
+
+def _import(name: str) -> ModuleType:
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        error = PyRFLXError()
+        error.push_msg(f'export of columns requires "{name}" to be installed')
+        raise error from e
+
+
+def _python_value(value: object) -> object:
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if isinstance(value, list):
+        return [_python_value(v) for v in value]
+    return value
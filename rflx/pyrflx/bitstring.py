@@ -8,75 +8,201 @@ from rflx.pyrflx.error import PyRFLXError
 
 
 class Bitstring:
+    """
+    Sequence of bits backed by a byte buffer.
+
+    The bits are stored as a reference to an immutable buffer together with a bit offset and a bit
+    length. Slicing only adjusts offset and length and does not copy the underlying buffer. Values
+    are extracted by converting the bytes which contain the requested bits into an integer.
+    """
+
+    __slots__ = ("_data", "_length", "_offset")
+
     def __init__(self, bits: str = ""):
         if not self.valid_bitstring(bits):
             e = PyRFLXError()
             e.push_msg("Bitstring does not consist of only 0 and 1")
             raise e
-        self._bits = bits
+        length = len(bits)
+        padding = -length % 8
+        self._data: bytes | memoryview = (
+            (int(bits, 2) << padding).to_bytes((length + padding) // 8, "big") if bits else b""
+        )
+        self._offset = 0
+        self._length = length
+
+    @classmethod
+    def _create(cls, data: bytes | memoryview, offset: int, length: int) -> Bitstring:
+        result = cls.__new__(cls)
+        result._data = data
+        result._offset = offset
+        result._length = length
+        return result
+
+    @classmethod
+    def from_int(cls, value: int, length: int) -> Bitstring:
+        """Create a bitstring holding the binary representation of value padded to length bits."""
+        assert value >= 0
+        length = max(length, value.bit_length())
+        padding = -length % 8
+        return cls._create((value << padding).to_bytes((length + padding) // 8, "big"), 0, length)
 
     def __add__(self, other: Bitstring) -> Bitstring:
-        return Bitstring(self._bits + other._bits)
+        if not self._length:
+            return Bitstring._create(other._data, other._offset, other._length)
+        if not other._length:
+            return Bitstring._create(self._data, self._offset, self._length)
+        if self._byte_aligned and other._offset % 8 == 0:
+            return Bitstring._create(
+                self._aligned_bytes() + other._covering_bytes(),
+                0,
+                self._length + other._length,
+            )
+        return Bitstring.from_int(
+            (int(self) << other._length) | int(other),
+            self._length + other._length,
+        )
 
     def __iadd__(self, other: Bitstring) -> Self:
-        self._bits += other._bits
+        result = self + other
+        self._data = result._data
+        self._offset = result._offset
+        self._length = result._length
         return self
 
     def __getitem__(self, key: int | slice) -> Bitstring:
-        if isinstance(key, slice) and isinstance(key.stop, int) and len(self._bits) < key.stop:
+        if isinstance(key, slice):
+            if isinstance(key.stop, int) and self._length < key.stop:
+                raise IndexError
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return Bitstring(str(self)[key])
+            return Bitstring._create(self._data, self._offset + start, max(stop - start, 0))
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
             raise IndexError
-        return Bitstring(self._bits[key])
+        return Bitstring._create(self._data, self._offset + key, 1)
 
     def __repr__(self) -> str:
-        return f'Bitstring("{self._bits}")'
+        return f'Bitstring("{self}")'
 
     def __str__(self) -> str:
-        return self._bits
+        if not self._length:
+            return ""
+        return format(int(self), f"0{self._length}b")
 
     def __int__(self) -> int:
-        return int(self._bits, 2)
+        if not self._length:
+            return 0
+        value = int.from_bytes(self._covering_bytes(), "big")
+        return (value >> (-(self._offset + self._length) % 8)) & ((1 << self._length) - 1)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Bitstring):
             return NotImplemented
-        return self._bits == other._bits
+        return self._length == other._length and int(self) == int(other)
 
     def __bytes__(self) -> bytes:
-        return b"".join(
-            [
-                int(self._bits[i : i + 8], 2).to_bytes(1, "big")
-                for i in range(0, len(self._bits), 8)
-            ],
-        )
+        if self._byte_aligned:
+            return self._aligned_bytes()
+        value = int(self)
+        remainder = self._length % 8
+        if not remainder:
+            return value.to_bytes(self._length // 8, "big")
+        # The trailing bits which do not fill a complete byte are represented by an own byte
+        return (value >> remainder).to_bytes(self._length // 8, "big") + (
+            value & ((1 << remainder) - 1)
+        ).to_bytes(1, "big")
 
     def __len__(self) -> int:
-        return len(self._bits)
+        return self._length
+
+    @property
+    def _byte_aligned(self) -> bool:
+        return self._offset % 8 == 0 and self._length % 8 == 0
+
+    def _aligned_bytes(self) -> bytes:
+        assert self._byte_aligned
+        return self._covering_bytes()
+
+    def _covering_bytes(self) -> bytes:
+        """Return all bytes of the buffer which contain at least one bit of the bitstring."""
+        return bytes(self._data[self._offset // 8 : (self._offset + self._length + 7) // 8])
+
+    def write_into(self, buffer: bytearray, offset: int) -> None:
+        """
+        Write the bits into a buffer, starting at the given bit offset.
+
+        The buffer is extended if necessary. All other bits of the buffer are left unchanged.
+        """
+        if not self._length:
+            return
+        start = offset // 8
+        end = (offset + self._length + 7) // 8
+        if len(buffer) < end:
+            buffer.extend(bytes(end - len(buffer)))
+        if offset % 8 == 0 and self._byte_aligned:
+            buffer[start:end] = self._aligned_bytes()
+            return
+        shift = (end - start) * 8 - (offset - start * 8) - self._length
+        mask = ((1 << self._length) - 1) << shift
+        value = int.from_bytes(buffer[start:end], "big")
+        buffer[start:end] = ((value & ~mask) | (int(self) << shift)).to_bytes(end - start, "big")
+
+    def as_memoryview(self) -> memoryview:
+        """
+        Return a read-only memory view of the bytes of the bitstring.
+
+        The underlying buffer is referenced without copying if the bitstring is byte aligned.
+        """
+        if self._byte_aligned:
+            return memoryview(self._data)[
+                self._offset // 8 : (self._offset + self._length) // 8
+            ].toreadonly()
+        return memoryview(bytes(self))
 
     @staticmethod
     def swap_bitstring(bitstring: str) -> str:
         assert len(bitstring) > 8
         assert len(bitstring) % 8 == 0
-        result = ""
-        for i in range(len(bitstring), 0, -8):
-            result += bitstring[i - 8 : i]
+        result = "".join(bitstring[i - 8 : i] for i in range(len(bitstring), 0, -8))
         assert len(bitstring) == len(result)
         return result
 
     def swap(self) -> Bitstring:
-        return Bitstring(self.swap_bitstring(self._bits))
+        assert self._length > 8
+        assert self._length % 8 == 0
+        return Bitstring.from_bytes(bytes(self)[::-1])
 
     @classmethod
-    def from_bytes(cls, msg: bytes) -> Bitstring:
-        return cls(format(int.from_bytes(msg, "big"), f"0{len(msg) * 8}b"))
+    def from_bytes(cls, msg: bytes | bytearray | memoryview) -> Bitstring:
+        """
+        Create a bitstring from a byte buffer.
+
+        A `bytes` object or a read-only memory view is referenced without copying. The content of
+        a referenced buffer must not be changed as long as the bitstring is used.
+        """
+        if isinstance(msg, bytearray):
+            msg = bytes(msg)
+        elif isinstance(msg, memoryview):
+            msg = msg.cast("B").toreadonly()
+        return cls._create(msg, 0, len(msg) * 8)
 
     @staticmethod
     def valid_bitstring(bitstring: str) -> bool:
-        return all(bit in ["0", "1"] for bit in bitstring)
+        return not bitstring.strip("01")
 
     @staticmethod
     def join(iterable: Sequence[Bitstring]) -> Bitstring:
-        joined_bitstring = Bitstring()
-        for i in iterable:
-            joined_bitstring += i
+        if all(b._byte_aligned for b in iterable):
+            data = b"".join(b._aligned_bytes() for b in iterable)
+            return Bitstring._create(data, 0, len(data) * 8)
+
+        value = 0
+        length = 0
+        for b in iterable:
+            value = (value << len(b)) | int(b)
+            length += len(b)
 
-        return joined_bitstring
+        return Bitstring.from_int(value, length)
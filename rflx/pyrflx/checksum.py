@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import sys
+import zlib
+from abc import ABC, abstractmethod
+from collections import abc
+
+
+class IncrementalChecksumFunction(ABC):
+    """
+    Checksum function whose value can be updated after parts of a message have changed.
+
+    Like a plain checksum function (cf. `ChecksumFunction`), the function is called with the
+    serialized message and the arguments of the checksum aspect. If the checksum of a message of
+    the same size has been calculated before with the same arguments, `update` is used instead to
+    derive the new checksum from the previous checksum and the changed parts of the message.
+    """
+
+    @abstractmethod
+    def __call__(self, message: bytes, **kwargs: object) -> int:
+        raise NotImplementedError
+
+    def update(
+        self,
+        checksum: int,
+        old: bytes,
+        new: bytes,
+        changes: abc.Sequence[tuple[int, int]],
+        **kwargs: object,
+    ) -> int:
+        """
+        Return the checksum of a changed message.
+
+        Both messages have the same size. The changes are given as ranges of bytes (start
+        included, end excluded), outside of which both messages are equal. By default, the checksum
+        of the new message is calculated from scratch.
+        """
+        return self(new, **kwargs)
+
+
+class InternetChecksum(IncrementalChecksumFunction):
+    """
+    Internet checksum as specified in RFC 1071.
+
+    The checksum is calculated over the concatenation of all parts of the message given by ranges
+    in the arguments of the checksum function. Other arguments are ignored. The checksum is
+    updated as specified in RFC 1624, so that the effort of an update only depends on the size of
+    the changed parts, unless the sum of the changed message is zero.
+    """
+
+    def __call__(self, message: bytes, **kwargs: object) -> int:
+        return ~_sum(b"".join(message[s:e] for s, e in _byte_ranges(kwargs))) & 0xFFFF
+
+    def update(
+        self,
+        checksum: int,
+        old: bytes,
+        new: bytes,
+        changes: abc.Sequence[tuple[int, int]],
+        **kwargs: object,
+    ) -> int:
+        ranges = _byte_ranges(kwargs)
+
+        # A range of odd length would lead to 16-bit words consisting of bytes of two ranges
+        if any((e - s) % 2 for s, e in ranges[:-1]):
+            return self(new, **kwargs)
+
+        total = ~checksum & 0xFFFF
+        for start, end in ranges:
+            words: list[tuple[int, int]] = []
+            for first, last in sorted(changes):
+                first = max(first, start)  # noqa: PLW2901
+                last = min(last, end)  # noqa: PLW2901
+                if first >= last:
+                    continue
+                first -= (first - start) % 2  # noqa: PLW2901
+                last = min(last + (last - start) % 2, end)  # noqa: PLW2901
+                if words and first <= words[-1][1]:
+                    words[-1] = (words[-1][0], max(words[-1][1], last))
+                else:
+                    words.append((first, last))
+            for first, last in words:
+                # RFC 1624, Eqn. 3: HC' = ~(~HC + ~m + m')
+                total += (~_sum(old[first:last]) & 0xFFFF) + _sum(new[first:last])
+        total = _fold(total)
+        # Both 0x0000 and 0xFFFF represent zero in one's complement arithmetic. Which of them
+        # results from a full calculation cannot be derived from the sums of the changed parts.
+        if total in (0x0000, 0xFFFF):
+            return self(new, **kwargs)
+        return ~total & 0xFFFF
+
+
+class CRC32(IncrementalChecksumFunction):
+    """
+    CRC-32 as used by Ethernet and zlib.
+
+    The checksum is calculated over the concatenation of all parts of the message given by ranges
+    in the arguments of the checksum function. Other arguments are ignored. The checksum is not
+    updated incrementally, as calculating it by zlib is faster than an update in Python.
+    """
+
+    def __call__(self, message: bytes, **kwargs: object) -> int:
+        view = memoryview(message)
+        result = 0
+        for start, end in _byte_ranges(kwargs):
+            result = zlib.crc32(view[start:end], result)
+        return result
+
+
+def changed_bytes(
+    old: bytes,
+    new: bytes,
+    layout: abc.Iterable[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """
+    Return the byte ranges in which two serialized messages differ.
+
+    The layout contains the first bit and the size in bits of each field. Only fields whose bytes
+    differ are included in the result.
+    """
+    old_view = memoryview(old)
+    new_view = memoryview(new)
+    result = []
+    for first, size in layout:
+        start = first // 8
+        end = (first + size + 7) // 8
+        if old_view[start:end] != new_view[start:end]:
+            result.append((start, end))
+    return result
+
+
+def _byte_ranges(arguments: abc.Mapping[str, object]) -> list[tuple[int, int]]:
+    """Return the ranges of bytes given by the bit ranges in the arguments of a checksum."""
+    return [
+        (value[0] // 8, (value[1] + 1) // 8)
+        for value in arguments.values()
+        if isinstance(value, tuple)
+    ]
+
+
+def _sum(data: bytes) -> int:
+    """Return the one's complement sum of the 16-bit words of the data in network byte order."""
+    if len(data) % 2:
+        data += b"\x00"
+    # The one's complement sum is independent of the byte order (RFC 1071, section 2 (B))
+    result = _fold(sum(memoryview(data).cast("H")))
+    return result if sys.byteorder == "big" else ((result & 0xFF) << 8) | (result >> 8)
+
+
+def _fold(value: int) -> int:
+    while value >> 16:
+        value = (value & 0xFFFF) + (value >> 16)
+    return value
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import abc
+
+from rflx.pyrflx.error import PyRFLXError
+from rflx.pyrflx.parse_plan import Cursor, Step
+
+
+class LazyMessage:
+    """
+    Message whose fields are parsed on demand.
+
+    A field is parsed when it is accessed for the first time. Only the fields preceding the
+    accessed field are parsed in advance, the rest of the message is only parsed if required,
+    e.g., to determine the validity of the message. The value of a field is only created on first
+    access: Opaque fields are represented by read-only memory views of the parsed buffer and
+    refined opaque fields by lazy messages of the contained message.
+
+    The fields are determined by a cursor of the parse plan of the message. If the message cannot
+    be parsed by the parse plan, the values of all fields are determined at once by the given
+    fallback function, which raises `PyRFLXError` for invalid messages. The fields parsed before
+    the invalid part of a message stay accessible, so that the result of `get` does not depend on
+    whether the rest of the message has already been parsed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: abc.Sequence[str],
+        cursor: Cursor | None,
+        decode: abc.Callable[[Step], object],
+        fallback: abc.Callable[[], abc.Mapping[str, object]],
+    ) -> None:
+        self._name = name
+        self._fields = fields
+        self._cursor = cursor
+        self._decode = decode
+        self._fallback = fallback
+        self._steps: dict[str, Step] = {}
+        self._values: dict[str, object] = {}
+        self._error: PyRFLXError | None = None
+        if cursor is None:
+            self._parse_fallback()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def fields(self) -> abc.Sequence[str]:
+        return self._fields
+
+    @property
+    def valid(self) -> bool:
+        """
+        Return True if the message could be parsed completely.
+
+        As for `MessageValue.parse`, checksums are not verified.
+        """
+        self._parse()
+        return self._error is None
+
+    @property
+    def error(self) -> PyRFLXError | None:
+        self._parse()
+        return self._error
+
+    @property
+    def valid_fields(self) -> list[str]:
+        self._parse()
+        if self._error is not None:
+            return []
+        return list(self._values) if self._cursor is None else list(self._steps)
+
+    def get(self, field_name: str) -> object:
+        if field_name not in self._values:
+            if field_name not in self._fields:
+                e = PyRFLXError()
+                e.push_msg(f'"{field_name}" is not a field of this message')
+                raise e
+            self._parse(field_name)
+            if field_name in self._steps:
+                self._values[field_name] = self._decode(self._steps[field_name])
+            elif field_name not in self._values:
+                e = PyRFLXError()
+                e.push_msg(f'"{field_name}" is not set')
+                raise e
+        return self._values[field_name]
+
+    def _parse(self, field_name: str | None = None) -> None:
+        """Parse the message until the given field or the end of the message is reached."""
+        cursor = self._cursor
+        if cursor is None:
+            return
+        while field_name not in self._steps:
+            step = cursor.advance()
+            if step is None:
+                break
+            self._steps[step.field] = step
+        if cursor.failed:
+            self._parse_fallback()
+
+    def _parse_fallback(self) -> None:
+        self._cursor = None
+        try:
+            values = dict(self._fallback())
+        except PyRFLXError as e:
+            self._error = e
+        else:
+            self._steps = {}
+            self._values = values
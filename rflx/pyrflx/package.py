@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from collections.abc import Iterator, Mapping
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+from typing_extensions import Buffer
 
 from rflx.common import Base
 from rflx.identifier import StrID
 
+from .batch import Columns, MessageView
 from .error import PyRFLXError
-from .typevalue import ChecksumFunction, MessageValue
+from .template import Template
+from .typevalue import ChecksumFunction, MessageValue, TypeValue
 
 
 class Package(Base):
@@ -28,6 +32,58 @@ class Package(Base):
             message.add_parameters(parameters)
         return message
 
+    def build(
+        self,
+        key: StrID,
+        /,
+        parameters: Mapping[str, bool | int | str] | None = None,
+        **fields: bytes | int | str | Sequence[TypeValue],
+    ) -> MessageValue:
+        """Create a message and set the values of all given fields at once."""
+        message = self.new_message(key, parameters)
+        message.build(fields)
+        return message
+
+    def template(
+        self,
+        key: StrID,
+        /,
+        parameters: Mapping[str, bool | int | str] | None = None,
+        **fields: bytes | int | str | Sequence[TypeValue],
+    ) -> Template:
+        """Create a template of a message with the given field values."""
+        return Template(self.build(key, parameters, **fields))
+
+    def parse_many(
+        self,
+        key: StrID,
+        data: Buffer | Iterable[Buffer],
+        offsets: Sequence[int] | None = None,
+        parameters: Mapping[str, bool | int | str] | None = None,
+    ) -> Iterator[MessageView]:
+        """
+        Parse a sequence of messages and return read-only views of the field values.
+
+        Refinements are not applied, i.e., refined opaque fields are returned as raw bytes (see
+        `MessageValue.parse_many`).
+        """
+        return self.new_message(key, parameters).parse_many(data, offsets)
+
+    def parse_columns(
+        self,
+        key: StrID,
+        data: Buffer | Iterable[Buffer],
+        offsets: Sequence[int] | None = None,
+        parameters: Mapping[str, bool | int | str] | None = None,
+    ) -> Columns:
+        """
+        Parse a sequence of messages and return the field values column by column.
+
+        Refinements are not applied, i.e., refined opaque fields are returned as raw bytes (see
+        `MessageValue.parse_columns`).
+        """
+        return self.new_message(key, parameters).parse_columns(data, offsets)
+
     def set_message(self, key: StrID, value: MessageValue) -> None:
         self._messages[str(key)] = value
 
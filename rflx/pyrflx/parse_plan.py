@@ -0,0 +1,553 @@
+from __future__ import annotations
+
+import contextlib
+import operator
+from collections import abc
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import reduce
+
+from rflx import expr
+from rflx.model import FINAL, INITIAL, ByteOrder, Enumeration, Integer, Link, Message, Scalar
+from rflx.pyrflx.bitstring import Bitstring
+from rflx.pyrflx.result import ParseStatus
+
+Environment = dict[str, object]
+Evaluator = Callable[[Environment], object]
+
+_RELATIONS: dict[type[expr.Relation], Callable[[object, object], bool]] = {
+    expr.Less: operator.lt,
+    expr.LessEqual: operator.le,
+    expr.Equal: operator.eq,
+    expr.GreaterEqual: operator.ge,
+    expr.Greater: operator.gt,
+    expr.NotEqual: operator.ne,
+}
+
+
+class UnsupportedExpressionError(Exception):
+    """Raised if an expression cannot be compiled into an evaluator."""
+
+
+class UnresolvedValueError(Exception):
+    """Raised if the value of a compiled expression cannot be determined."""
+
+
+@dataclass(frozen=True)
+class Step:
+    """Field determined by a parse plan."""
+
+    link: Link
+    field: str
+    first: int
+    value: Bitstring
+    sized: bool
+    scalar: int | expr.Literal | None
+    refinement: int | None
+
+
+@dataclass(frozen=True)
+class Placement:
+    """Position of a field of a message which is built by a parse plan."""
+
+    link: Link
+    field: str
+    first: int
+    size: int
+    refinement: int | None
+
+
+@dataclass(frozen=True)
+class _Link:
+    link: Link
+    target: str
+    condition: Evaluator | None
+    size: Evaluator | None
+
+
+@dataclass
+class _Field:
+    name: str
+    size: int | None
+    swap: bool
+    bounds: tuple[int, int] | None
+    literals: dict[int, expr.Literal] | None
+    firsts: list[tuple[Evaluator | None, Evaluator]]
+    outgoing: list[_Link]
+    always_valid: bool = False
+
+
+class ParsePlan:
+    """
+    Parse plan of a message.
+
+    The link conditions and sizes of the message are compiled into Python closures operating on
+    the values of the already parsed fields. A parse plan determines the fields of a message
+    without any symbolic simplification. If a message cannot be parsed by the plan, e.g., due to an
+    invalid field value or an expression which is not supported, the generic algorithm of
+    `MessageValue` must be used.
+    """
+
+    def __init__(
+        self,
+        message: Message,
+        literals: abc.Mapping[str, abc.Mapping[expr.Expr, expr.Expr]],
+    ) -> None:
+        """
+        Compile a parse plan.
+
+        The literals of all enumeration fields must be given as they are used by the
+        corresponding `EnumValue`. `UnsupportedExpressionError` is raised if the message contains
+        expressions which cannot be compiled.
+        """
+        self._fields_by_variable = {expr.Variable(f.name): f.name for f in message.fields}
+        self._scalar_fields = {f.name for f, t in message.types.items() if isinstance(t, Scalar)}
+        self._parameters = {expr.Variable(p.name): p.name for p in message.parameters}
+        self._type_sizes: dict[expr.Expr, int] = {
+            expr.Size(t.full_name): t.size.value
+            for t in message.types.values()
+            if isinstance(t, Scalar)
+        }
+        self._checksums = {expr.ValidChecksum(f) for f in message.checksums}
+        self._conditions: dict[expr.Expr, Evaluator | None] = {}
+        self._fields: dict[str, _Field] = {}
+
+        for field in (INITIAL, *message.fields):
+            size: int | None = None
+            swap = False
+            bounds: tuple[int, int] | None = None
+            field_literals: dict[int, expr.Literal] | None = None
+            always_valid = False
+            if field in message.types:
+                field_type = message.types[field]
+                if isinstance(field_type, Scalar):
+                    size = field_type.size.value
+                    swap = (
+                        message.byte_order[field] == ByteOrder.LOW_ORDER_FIRST
+                        and size > 8
+                        and size % 8 == 0
+                    )
+                if isinstance(field_type, Integer):
+                    bounds = (field_type.first.value, field_type.last.value)
+                if isinstance(field_type, Enumeration):
+                    always_valid = field_type.always_valid
+                    field_literals = {}
+                    for literal, value in literals[field.name].items():
+                        assert isinstance(literal, expr.Literal)
+                        assert isinstance(value, expr.Number)
+                        field_literals[value.value] = literal
+            firsts = [
+                (self.condition(link.condition), self._compile_value(link.first))
+                for link in message.incoming(field)
+                if link.first != expr.UNDEFINED
+            ]
+            outgoing = []
+            for link in message.outgoing(field):
+                outgoing.append(
+                    _Link(
+                        link,
+                        link.target.name,
+                        self.condition(link.condition),
+                        None if link.target.name in self._scalar_fields else self._size(link.size),
+                    ),
+                )
+            self._fields[field.name] = _Field(
+                field.name,
+                size,
+                swap,
+                bounds,
+                field_literals,
+                firsts,
+                outgoing,
+                always_valid,
+            )
+
+    def condition(self, condition: expr.Expr) -> Evaluator | None:
+        """
+        Return an evaluator for a Boolean expression.
+
+        None is returned for conditions which are always true. The compiled conditions are cached.
+        """
+        if condition not in self._conditions:
+            self._conditions[condition] = (
+                None if condition == expr.TRUE else self._compile_boolean(condition)
+            )
+        return self._conditions[condition]
+
+    def run(
+        self,
+        bits: Bitstring,
+        parameters: abc.Mapping[str, object],
+        refinements: abc.Mapping[str, abc.Sequence[Evaluator | None]],
+    ) -> tuple[list[Step], list[Link]] | None:
+        """
+        Determine the fields of a message.
+
+        The result contains the parsed fields and the links of the message path including the
+        link to the final field. None is returned if the message cannot be parsed by the plan.
+        """
+        cursor = self.cursor(bits, parameters, refinements)
+        while cursor.advance() is not None:
+            pass
+        if cursor.failed:
+            return None
+        return cursor.steps, cursor.path
+
+    def cursor(
+        self,
+        bits: Bitstring,
+        parameters: abc.Mapping[str, object],
+        refinements: abc.Mapping[str, abc.Sequence[Evaluator | None]],
+    ) -> Cursor:
+        """Return a cursor for determining the fields of a message one after another."""
+        return Cursor(self._fields, bits, parameters, refinements)
+
+    def place(  # noqa: PLR0911, PLR0912
+        self,
+        numbers: abc.Mapping[str, int],
+        sizes: abc.Mapping[str, int],
+        parameters: abc.Mapping[str, object],
+        refinements: abc.Mapping[str, abc.Sequence[Evaluator | None]],
+    ) -> tuple[list[Placement], list[Link]] | None:
+        """
+        Determine the positions of the fields of a message which is built from the given values.
+
+        The numeric values of all scalar fields and the sizes in bits of all composite fields on
+        the message path must be given. The result contains the fields on the message path and the
+        links of the path including the link to the final field. None is returned if the values do
+        not form a valid message or if the message cannot be built by the plan.
+        """
+        env: Environment = dict(parameters)
+        placements: list[Placement] = []
+        path: list[Link] = []
+        position = previous_first = 0
+        source = self._fields[INITIAL.name]
+
+        try:
+            while True:
+                for link in source.outgoing:
+                    if link.condition is None or link.condition(env) is True:
+                        break
+                else:
+                    return None
+
+                path.append(link.link)
+
+                if link.target == FINAL.name:
+                    return placements, path
+
+                field = self._fields[link.target]
+                name = field.name
+                first = position
+
+                for first_condition, first_value in field.firsts:
+                    if first_condition is None or first_condition(env) is True:
+                        first = _integer(first_value(env))
+                        break
+
+                if first not in (position, previous_first):
+                    return None
+
+                if field.size is not None:
+                    size = field.size
+                    number = numbers[name]
+                    if field.bounds is not None:
+                        if not field.bounds[0] <= number <= field.bounds[1]:
+                            return None
+                        env[name] = number
+                    else:
+                        assert field.literals is not None
+                        if number not in field.literals:
+                            return None
+                        env[name] = field.literals[number]
+                else:
+                    size = sizes[name]
+                    if link.size is not None and link.size(env) != size:
+                        return None
+
+                refinement = None
+                for i, refinement_condition in enumerate(refinements.get(name, [])):
+                    with contextlib.suppress(KeyError, UnresolvedValueError):
+                        if refinement_condition is None or refinement_condition(env) is True:
+                            refinement = i
+
+                env[name + "'First"] = first
+                env[name + "'Size"] = size
+                placements.append(Placement(link.link, name, first, size, refinement))
+                previous_first = first
+                position = first + size
+                source = field
+
+        except (KeyError, TypeError, UnresolvedValueError, ZeroDivisionError):
+            return None
+
+    def _compile_boolean(self, expression: expr.Expr) -> Evaluator:
+        if isinstance(expression, (expr.And, expr.Or)):
+            terms = [self._compile_boolean(t) for t in expression.terms]
+            if isinstance(expression, expr.And):
+                return lambda env: all(t(env) for t in terms)
+            return lambda env: any(t(env) for t in terms)
+
+        if isinstance(expression, expr.Not):
+            term = self._compile_boolean(expression.expr)
+            return lambda env: not term(env)
+
+        relation = _RELATIONS.get(type(expression))
+        if relation is not None:
+            assert isinstance(expression, expr.Relation)
+            left = self._compile_value(expression.left)
+            right = self._compile_value(expression.right)
+            return lambda env: relation(left(env), right(env))
+
+        if expression in self._checksums:
+            return lambda _: True
+
+        if isinstance(expression, (expr.Literal, expr.Variable)):
+            value = self._compile_value(expression)
+            return lambda env: _boolean(value(env))
+
+        raise UnsupportedExpressionError(str(expression))
+
+    def _compile_value(self, expression: expr.Expr) -> Evaluator:
+        if isinstance(expression, expr.Number):
+            number = expression.value
+            return lambda _: number
+
+        if isinstance(expression, expr.Literal):
+            return lambda _: expression
+
+        if isinstance(expression, expr.Variable):
+            if expression in self._fields_by_variable:
+                name = self._fields_by_variable[expression]
+                if name not in self._scalar_fields:
+                    raise UnsupportedExpressionError(str(expression))
+                return operator.itemgetter(name)
+            if expression in self._parameters:
+                return operator.itemgetter(self._parameters[expression])
+            raise UnsupportedExpressionError(str(expression))
+
+        if isinstance(expression, (expr.First, expr.Last, expr.Size)):
+            return self._compile_attribute(expression)
+
+        if isinstance(expression, (expr.Add, expr.Mul)):
+            terms = [self._compile_value(t) for t in expression.terms]
+            if isinstance(expression, expr.Add):
+                return lambda env: sum(_integer(t(env)) for t in terms)
+            return lambda env: reduce(operator.mul, (_integer(t(env)) for t in terms), 1)
+
+        if isinstance(expression, expr.Neg):
+            term = self._compile_value(expression.expr)
+            return lambda env: -_integer(term(env))
+
+        if isinstance(expression, (expr.Sub, expr.Div, expr.Pow, expr.Mod)):
+            left = self._compile_value(expression.left)
+            right = self._compile_value(expression.right)
+            if isinstance(expression, expr.Sub):
+                return lambda env: _integer(left(env)) - _integer(right(env))
+            if isinstance(expression, expr.Div):
+                return lambda env: _divided(_integer(left(env)), _integer(right(env)))
+            if isinstance(expression, expr.Pow):
+                return lambda env: _integer(left(env)) ** _integer(right(env))
+            return lambda env: _integer(left(env)) % _integer(right(env))
+
+        if isinstance(expression, (expr.And, expr.Or, expr.Not, expr.Relation)) or (
+            expression in self._checksums
+        ):
+            condition = self._compile_boolean(expression)
+            return lambda env: expr.TRUE if condition(env) else expr.FALSE
+
+        raise UnsupportedExpressionError(str(expression))
+
+    def _compile_attribute(self, attribute: expr.First | expr.Last | expr.Size) -> Evaluator:
+        if attribute in self._type_sizes:
+            size = self._type_sizes[attribute]
+            return lambda _: size
+
+        prefix = attribute.prefix
+        if isinstance(prefix, expr.Variable) and prefix in self._fields_by_variable:
+            name = self._fields_by_variable[prefix]
+            if isinstance(attribute, expr.First):
+                return operator.itemgetter(name + "'First")
+            if isinstance(attribute, expr.Size):
+                return operator.itemgetter(name + "'Size")
+            first = name + "'First"
+            size_name = name + "'Size"
+            return lambda env: _integer(env[first]) + _integer(env[size_name]) - 1
+
+        if attribute == expr.First("Message"):
+            return lambda _: 0
+
+        raise UnsupportedExpressionError(str(attribute))
+
+    def _size(self, size: expr.Expr) -> Evaluator | None:
+        # The size of the message is not known while parsing its fields. A size depending on the
+        # message size is treated in the same way as an undefined size: The field covers the
+        # rest of the message.
+        if size == expr.UNDEFINED or size.findall(
+            lambda e: e in (expr.Last("Message"), expr.Size("Message")),
+        ):
+            return None
+        return self._compile_value(size)
+
+
+class Cursor:
+    """
+    Incremental execution of a parse plan.
+
+    Each call of `advance` determines the next field of the message. The fields which precede the
+    field are not parsed again, so that a message can be parsed only as far as needed.
+
+    If the message is invalid independently of the parsing algorithm, the reason and the affected
+    field are recorded in `rejection`. Otherwise, a failure only means that the message cannot be
+    parsed by the plan.
+    """
+
+    def __init__(
+        self,
+        fields: abc.Mapping[str, _Field],
+        bits: Bitstring,
+        parameters: abc.Mapping[str, object],
+        refinements: abc.Mapping[str, abc.Sequence[Evaluator | None]],
+    ) -> None:
+        self.steps: list[Step] = []
+        self.path: list[Link] = []
+        self.complete = False
+        self.failed = False
+        self.rejection: tuple[ParseStatus, str] | None = None
+        self._fields = fields
+        self._bits = bits
+        self._refinements = refinements
+        self._env: Environment = dict(parameters)
+        self._position = 0
+        self._previous_first = 0
+        self._source = fields[INITIAL.name]
+        self._rest = False
+
+    def advance(self) -> Step | None:
+        """
+        Determine the next field.
+
+        None is returned if the end of the message has been reached (`complete` is set) or if the
+        message cannot be parsed by the plan (`failed` is set).
+        """
+        if self.complete or self.failed:
+            return None
+        try:
+            step = self._advance()
+        except (KeyError, TypeError, UnresolvedValueError, ZeroDivisionError):
+            step = None
+        if step is None:
+            self.failed = not self.complete
+        else:
+            self.steps.append(step)
+        return step
+
+    def _advance(self) -> Step | None:  # noqa: PLR0911, PLR0912
+        env = self._env
+
+        unsatisfied = True
+        for link in self._source.outgoing:
+            if link.condition is None:
+                break
+            satisfied = link.condition(env)
+            if satisfied is True:
+                break
+            unsatisfied = unsatisfied and satisfied is False
+        else:
+            if unsatisfied:
+                self.rejection = (ParseStatus.CONDITION_FAILED, self._source.name)
+            return None
+
+        self.path.append(link.link)
+
+        if link.target == FINAL.name:
+            self.complete = True
+            return None
+
+        if self._rest:
+            return None
+
+        field = self._fields[link.target]
+        name = field.name
+        sized = True
+        first = self._position
+        length = len(self._bits)
+
+        for first_condition, first_value in field.firsts:
+            if first_condition is None or first_condition(env) is True:
+                first = _integer(first_value(env))
+                break
+
+        # Only fields which start directly after or at the same position as their predecessor are
+        # supported by the generic parsing algorithm
+        if first not in (self._position, self._previous_first):
+            return None
+
+        if field.size is not None:
+            size = field.size
+        elif link.size is not None:
+            size_value = link.size(env)
+            if not isinstance(size_value, int) or size_value < 0:
+                return None
+            size = size_value
+        else:
+            size = length - first
+            sized = False
+            self._rest = True
+
+        if first + size > length:
+            self.rejection = (ParseStatus.TOO_SHORT, name)
+            return None
+
+        value = self._bits[first : first + size]
+        scalar: int | expr.Literal | None = None
+
+        if field.size is not None:
+            number = int.from_bytes(bytes(value), "little") if field.swap else int(value)
+            if field.bounds is not None:
+                if not field.bounds[0] <= number <= field.bounds[1]:
+                    self.rejection = (ParseStatus.INVALID_VALUE, name)
+                    return None
+                scalar = number
+            else:
+                assert field.literals is not None
+                if number not in field.literals:
+                    if not field.always_valid:
+                        self.rejection = (ParseStatus.INVALID_VALUE, name)
+                    return None
+                scalar = field.literals[number]
+            env[name] = scalar
+
+        refinement = None
+        for i, refinement_condition in enumerate(self._refinements.get(name, [])):
+            with contextlib.suppress(KeyError, UnresolvedValueError):
+                if refinement_condition is None or refinement_condition(env) is True:
+                    refinement = i
+
+        env[name + "'First"] = first
+        env[name + "'Size"] = size
+        self._previous_first = first
+        self._position = first + size
+        self._source = field
+
+        return Step(link.link, name, first, value, sized, scalar, refinement)
+
+
+def _integer(value: object) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise UnresolvedValueError(str(value))
+    return value
+
+
+def _boolean(value: object) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, expr.Literal) and value in (expr.TRUE, expr.FALSE):
+        return value == expr.TRUE
+    raise UnresolvedValueError(str(value))
+
+
+def _divided(dividend: int, divisor: int) -> int:
+    if dividend % divisor != 0:
+        raise UnresolvedValueError(f"{dividend} / {divisor}")
+    return dividend // divisor
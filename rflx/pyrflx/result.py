@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+class ParseStatus(Enum):
+    VALID = "valid"
+    TOO_SHORT = "too short"
+    INVALID_VALUE = "invalid value"
+    CONDITION_FAILED = "condition failed"
+    NESTED_FAILURE = "nested failure"
+    INVALID = "invalid"
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    """
+    Result of parsing a message without raising an exception.
+
+    The field is the field at which parsing failed. For a failed link condition, it is the field
+    after which no outgoing condition is satisfied. If a nested message in a field could not be
+    parsed, the result of parsing the nested message is contained. No field is determined for
+    messages which have been rejected by the generic parsing algorithm (`ParseStatus.INVALID`).
+    """
+
+    status: ParseStatus
+    field: str | None = None
+    nested: ParseResult | None = None
+
+    @property
+    def valid(self) -> bool:
+        return self.status is ParseStatus.VALID
+
+    @property
+    def path(self) -> tuple[str, ...]:
+        """Return the fields leading to the innermost field at which parsing failed."""
+        result: ParseResult | None = self
+        path: list[str] = []
+        while result is not None and result.field is not None:
+            path.append(result.field)
+            result = result.nested
+        return tuple(path)
+
+    def __str__(self) -> str:
+        result: ParseResult = self
+        while result.nested is not None:
+            result = result.nested
+        path = ".".join(self.path)
+        return f"{result.status.value} at {path}" if path else result.status.value
+
+
+VALID = ParseResult(ParseStatus.VALID)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from collections import abc
+from dataclasses import dataclass
+
+from rflx.expr import Attribute, Expr, Number, Variable
+from rflx.model import ByteOrder, Field, Link
+from rflx.pyrflx.bitstring import Bitstring
+from rflx.pyrflx.checksum import IncrementalChecksumFunction, changed_bytes
+from rflx.pyrflx.error import PyRFLXError
+from rflx.pyrflx.parse_plan import Evaluator, ParsePlan, Placement, UnsupportedExpressionError
+from rflx.pyrflx.typevalue import (
+    ChecksumFunction,
+    EnumValue,
+    IntegerValue,
+    MessageValue,
+    OpaqueValue,
+    ScalarValue,
+    TypeValue,
+)
+
+
+@dataclass(frozen=True)
+class _Slot:
+    field: MessageValue.Field
+    first: int
+    size: int
+    swap: bool
+
+
+@dataclass(frozen=True)
+class _Checksum:
+    field_name: str
+    function: ChecksumFunction
+    arguments: dict[str, object]
+    base: tuple[bytes, int] | None
+
+
+class Template:
+    """
+    Message with a frozen layout whose fields can be changed efficiently.
+
+    The serialized representation of a valid message is created once. When the template is
+    rendered, only the changed fields are encoded and written into a copy of the serialized message
+    and the checksums are recalculated. Checksums of incremental checksum functions are updated
+    based on the changed parts of the message. The values are checked in the same way as by
+    `MessageValue.set`. A change which would alter the layout of the message, i.e., the message
+    path, the position or size of a field or the refinement of a field, is rejected.
+    """
+
+    def __init__(self, message: MessageValue) -> None:
+        if not message.valid_message:
+            e = PyRFLXError()
+            e.push_msg(f"cannot create template of invalid message: {message.identifier}")
+            raise e
+
+        self._message = message
+        self._buffer = message.bytestring
+        self._slots: dict[str, _Slot] = {}
+        self._numbers: dict[str, int] = {}
+        self._sizes: dict[str, int] = {}
+
+        for field_name in message.valid_fields:
+            field = message._fields[field_name]  # noqa: SLF001
+            first = field.first
+            size = field.typeval.size
+            assert isinstance(first, Number)
+            assert isinstance(size, Number)
+            typeval = field.typeval.clone()
+            if isinstance(field.typeval, OpaqueValue) and field.typeval.nested_message is not None:
+                # The value of a refined field is checked by parsing the contained message
+                refinement = field.typeval._refinement_message  # noqa: SLF001
+                assert isinstance(typeval, OpaqueValue)
+                assert refinement is not None
+                typeval.set_refinement(refinement)
+            self._slots[field_name] = _Slot(
+                MessageValue.Field(typeval, field_name),
+                first.value,
+                size.value,
+                isinstance(field.typeval, ScalarValue)
+                and message.model.byte_order[Field(field_name)] == ByteOrder.LOW_ORDER_FIRST
+                and size.value > 8
+                and size.value % 8 == 0,
+            )
+            if isinstance(field.typeval, EnumValue):
+                self._numbers[field_name] = field.typeval.numeric_value.value
+            elif isinstance(field.typeval, IntegerValue):
+                self._numbers[field_name] = field.typeval.value
+            else:
+                self._sizes[field_name] = size.value
+
+        # Fields whose values determine the message path, the position or size of a field or the
+        # refinement of a field
+        self._structural = {
+            v
+            for e in [
+                *(x for l in message.model.structure for x in (l.condition, l.size, l.first)),
+                *(
+                    r.condition
+                    for r in message._refinements  # noqa: SLF001
+                    if r.pdu.name == message.name
+                ),
+            ]
+            for v in _value_variables(e)
+        }
+
+        self._plan: ParsePlan | None = None
+        self._parameters: dict[str, object] = {}
+        self._refinement_conditions: dict[str, list[Evaluator | None]] = {}
+        self._layout: tuple[list[Placement], list[Link]] | None = None
+        plan = message._get_parse_plan()  # noqa: SLF001
+        if plan is not None:
+            try:
+                _, self._refinement_conditions = message._plan_refinements(plan)  # noqa: SLF001
+            except UnsupportedExpressionError:
+                pass
+            else:
+                self._plan = plan
+                self._parameters = message._plan_parameters()  # noqa: SLF001
+                self._layout = plan.place(
+                    self._numbers,
+                    self._sizes,
+                    self._parameters,
+                    self._refinement_conditions,
+                )
+
+        self._checksums: list[_Checksum] = []
+        self._argument_fields: dict[str, str] = {}
+        for checksum in message._checksums.values():  # noqa: SLF001
+            assert checksum.function is not None
+            arguments: dict[str, object] = dict(
+                message._checksum_arguments(checksum),  # noqa: SLF001
+            )
+            base = None
+            if isinstance(checksum.function, IncrementalChecksumFunction):
+                slot = self._slots[checksum.field_name]
+                buffer = bytearray(self._buffer)
+                Bitstring.from_int(0, slot.size).write_into(buffer, slot.first)
+                base = (bytes(buffer), checksum.function(bytes(buffer), **arguments))
+            self._checksums.append(
+                _Checksum(checksum.field_name, checksum.function, arguments, base),
+            )
+            for parameter in checksum.parameters:
+                if isinstance(parameter.expression, Variable):
+                    self._argument_fields[parameter.expression.name] = checksum.field_name
+
+    @property
+    def message(self) -> MessageValue:
+        return self._message
+
+    def render(self, **changed_fields: bytes | int | str | abc.Sequence[TypeValue]) -> bytes:
+        """Return the serialized message with the given fields changed."""
+        if not changed_fields:
+            return self._buffer
+
+        buffer = bytearray(self._buffer)
+        numbers: dict[str, int] | None = None
+
+        for field_name, value in changed_fields.items():
+            slot = self._slot(field_name)
+            self._encode(slot, value).write_into(buffer, slot.first)
+            if field_name in self._structural:
+                if numbers is None:
+                    numbers = dict(self._numbers)
+                typeval = slot.field.typeval
+                if isinstance(typeval, EnumValue):
+                    numbers[field_name] = typeval.numeric_value.value
+                elif isinstance(typeval, IntegerValue):
+                    numbers[field_name] = typeval.value
+
+        if numbers is not None and (
+            self._plan is None
+            or self._layout is None
+            or self._plan.place(numbers, self._sizes, self._parameters, self._refinement_conditions)
+            != self._layout
+        ):
+            raise _error(
+                next(n for n in changed_fields if n in self._structural),
+                "layout of message would change",
+            )
+
+        for checksum in self._checksums:
+            if checksum.field_name in changed_fields:
+                continue
+            slot = self._slots[checksum.field_name]
+            Bitstring.from_int(0, slot.size).write_into(buffer, slot.first)
+            message = bytes(buffer)
+            if checksum.base is not None:
+                assert isinstance(checksum.function, IncrementalChecksumFunction)
+                value = checksum.function.update(
+                    checksum.base[1],
+                    checksum.base[0],
+                    message,
+                    changed_bytes(
+                        checksum.base[0],
+                        message,
+                        [(s.first, s.size) for s in self._slots.values()],
+                    ),
+                    **checksum.arguments,
+                )
+            else:
+                value = checksum.function(message, **checksum.arguments)
+            self._encode(slot, value).write_into(buffer, slot.first)
+
+        return bytes(buffer)
+
+    def _slot(self, field_name: str) -> _Slot:
+        if field_name not in self._slots:
+            e = PyRFLXError()
+            if field_name not in self._message.fields:
+                e.push_msg(f'"{field_name}" is not a field of this message')
+            else:
+                e.push_msg(f'"{field_name}" is not set')
+            raise e
+        if field_name in self._argument_fields:
+            raise _error(
+                field_name,
+                f"value is argument of checksum {self._argument_fields[field_name]}",
+            )
+        return self._slots[field_name]
+
+    def _encode(self, slot: _Slot, value: bytes | int | str | abc.Sequence[TypeValue]) -> Bitstring:
+        field_name = slot.field.name_variable.name
+        self._message._parse_field_value(field_name, slot.field, value)  # noqa: SLF001
+        bits = slot.field.typeval.bitstring
+        if len(bits) != slot.size:
+            raise _error(field_name, "layout of message would change")
+        return bits.swap() if slot.swap else bits
+
+
+def _value_variables(expression: Expr) -> set[str]:
+    """Return the names of all variables whose values are used in the expression."""
+    return {
+        v.name
+        for v in expression.substituted(
+            lambda e: Number(0) if isinstance(e, Attribute) else e,
+        ).variables()
+    }
+
+
+def _error(field_name: str, reason: str) -> PyRFLXError:
+    e = PyRFLXError()
+    e.push_msg(f"cannot change field {field_name}: {reason}")
+    return e
@@ -6,6 +6,8 @@ from collections import abc
 from dataclasses import dataclass
 from typing import Any, Protocol, Union
 
+from typing_extensions import Buffer
+
 from rflx.common import Base
 from rflx.const import BUILTINS_PACKAGE
 from rflx.error import fatal_fail
@@ -48,8 +50,13 @@ from rflx.model import (
     Sequence,
     TypeDecl,
 )
+from rflx.pyrflx.batch import Columns, MessageView, buffers
 from rflx.pyrflx.bitstring import Bitstring
+from rflx.pyrflx.checksum import IncrementalChecksumFunction, changed_bytes
 from rflx.pyrflx.error import PyRFLXError
+from rflx.pyrflx.lazy import LazyMessage
+from rflx.pyrflx.parse_plan import Cursor, Evaluator, ParsePlan, Step, UnsupportedExpressionError
+from rflx.pyrflx.result import VALID, ParseResult, ParseStatus
 from rflx.rapidflux import Location, Severity
 
 
@@ -69,10 +76,17 @@ ValueType = Union[
 
 
 class TypeValue(Base):
-    _value: ValueType | None = None
+    # The attributes of values are stored in slots, as a large number of values is created when
+    # messages are parsed or cloned
+    __slots__ = ("_container", "_type", "_value")
+
+    _value: ValueType | None
 
     def __init__(self, vtype: TypeDecl) -> None:
         self._type = vtype
+        self._value = None
+        # The value containing this value, which is notified when this value is changed
+        self._container: TypeValue | None = None
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
@@ -112,6 +126,12 @@ class TypeValue(Base):
 
     def clear(self) -> None:
         self._value = None
+        self._invalidate_serialization()
+
+    def _invalidate_serialization(self) -> None:
+        """Invalidate the serialized representation of the values containing this value."""
+        if self._container is not None:
+            self._container._invalidate_serialization()
 
     @abstractmethod
     def assign(self, value: Any, check: bool = True) -> None:  # type: ignore[misc]
@@ -171,6 +191,8 @@ class TypeValue(Base):
 
 
 class ScalarValue(TypeValue):
+    __slots__ = ()
+
     _type: Scalar
 
     def __init__(self, vtype: Scalar) -> None:
@@ -187,6 +209,8 @@ class ScalarValue(TypeValue):
 
 
 class IntegerValue(ScalarValue):
+    __slots__ = ()
+
     _value: int
     _type: Integer
 
@@ -216,6 +240,7 @@ class IntegerValue(ScalarValue):
             e.push_msg(f"value {value} not in type range {self._first} .. {self._last}")
             raise e
         self._value = value
+        self._invalidate_serialization()
 
     def parse(self, value: Bitstring | bytes, check: bool = True) -> None:
         if isinstance(value, bytes):
@@ -235,7 +260,7 @@ class IntegerValue(ScalarValue):
     @property
     def bitstring(self) -> Bitstring:
         self._raise_initialized()
-        return Bitstring(format(self._value, f"0{self.size}b"))
+        return Bitstring.from_int(self._value, self.size.value)
 
     @property
     def accepted_type(self) -> type:
@@ -246,6 +271,8 @@ class IntegerValue(ScalarValue):
 
 
 class EnumValue(ScalarValue):
+    __slots__ = ("_builtin", "_imported", "_literals")
+
     _value: tuple[str, Number]
     _type: Enumeration
 
@@ -290,6 +317,7 @@ class EnumValue(ScalarValue):
         )
         assert r == TRUE
         self._value = (str(prefixed_value), self._type.literals[prefixed_value.name])
+        self._invalidate_serialization()
 
     def parse(self, value: Bitstring | bytes, _check: bool = True) -> None:
         if isinstance(value, bytes):
@@ -308,9 +336,18 @@ class EnumValue(ScalarValue):
                     assert isinstance(k, Literal)
                     assert isinstance(v, Number)
                     self._value = (str(k.identifier), v)
-
-    def clone(self) -> TypeValue:
-        return self.__class__(self._type, self._imported)
+        self._invalidate_serialization()
+
+    def clone(self) -> EnumValue:
+        # The literals are not changed after the creation of the value and can be shared
+        result = self.__class__.__new__(self.__class__)
+        result._type = self._type
+        result._value = None
+        result._container = None
+        result._imported = self._imported
+        result._builtin = self._builtin
+        result._literals = self._literals
+        return result
 
     @property
     def numeric_value(self) -> Number:
@@ -330,7 +367,7 @@ class EnumValue(ScalarValue):
     @property
     def bitstring(self) -> Bitstring:
         self._raise_initialized()
-        return Bitstring(format(self._value[1].value, f"0{self.size}b"))
+        return Bitstring.from_int(self._value[1].value, self.size.value)
 
     @property
     def accepted_type(self) -> type:
@@ -345,6 +382,8 @@ class EnumValue(ScalarValue):
 
 
 class CompositeValue(TypeValue):
+    __slots__ = ("_expected_size",)
+
     def __init__(self, vtype: Composite) -> None:
         self._expected_size: Expr | None = None
         super().__init__(vtype)
@@ -352,6 +391,10 @@ class CompositeValue(TypeValue):
     def set_expected_size(self, expected_size: Expr) -> None:
         self._expected_size = expected_size
 
+    @property
+    def expected_size(self) -> Expr | None:
+        return self._expected_size
+
     def _check_size_of_assigned_value(
         self,
         value: bytes | Bitstring | abc.Sequence[TypeValue],
@@ -383,11 +426,13 @@ class CompositeValue(TypeValue):
 
 
 class OpaqueValue(CompositeValue):
+    __slots__ = ("_nested_message", "_refinement_message")
+
     _value: bytes | None
-    _nested_message: MessageValue | None = None
 
     def __init__(self, vtype: Opaque) -> None:
         super().__init__(vtype)
+        self._nested_message: MessageValue | None = None
         self._refinement_message: MessageValue | None = None
 
     def assign(self, value: bytes, check: bool = True) -> None:
@@ -397,9 +442,11 @@ class OpaqueValue(CompositeValue):
         if check:
             self._check_size_of_assigned_value(value)
         if self._refinement_message is not None:
+            if isinstance(value, bytes):
+                value = Bitstring.from_bytes(value)
             nested_msg = self._refinement_message.clone()
             try:
-                nested_msg.parse(value, check)
+                size = nested_msg.parse_prefix(value, check)
             except PyRFLXError as e:
                 new_exception = PyRFLXError()
                 new_exception.push_msg(
@@ -408,10 +455,12 @@ class OpaqueValue(CompositeValue):
                 new_exception.extend(e.entries)
                 raise new_exception from e
             assert nested_msg.valid_message
+            assert size % 8 == 0
             self._nested_message = nested_msg
-            self._value = nested_msg.bytestring
+            self._value = bytes(value[:size])
         else:
             self._value = bytes(value)
+        self._invalidate_serialization()
 
     def set_refinement(self, model_of_refinement_msg: MessageValue) -> None:
         self._refinement_message = model_of_refinement_msg
@@ -436,11 +485,7 @@ class OpaqueValue(CompositeValue):
     def bitstring(self) -> Bitstring:
         self._raise_initialized()
         assert self._value is not None
-        size = self.size
-        assert isinstance(size, Number)
-        if size.value == 0:
-            return Bitstring("")
-        return Bitstring(format(int.from_bytes(self._value, "big"), f"0{size}b"))
+        return Bitstring.from_bytes(self._value)
 
     @property
     def accepted_type(self) -> type:
@@ -451,6 +496,14 @@ class OpaqueValue(CompositeValue):
 
 
 class SequenceValue(CompositeValue):
+    __slots__ = (
+        "_bitstring",
+        "_element_type",
+        "_is_message_sequence",
+        "_prototype",
+        "_version",
+    )
+
     _value: list[TypeValue]
 
     def __init__(self, vtype: Sequence) -> None:
@@ -458,6 +511,11 @@ class SequenceValue(CompositeValue):
         self._element_type = vtype.element_type
         self._is_message_sequence = isinstance(self._element_type, Message)
         self._value = []
+        self._prototype: TypeValue | None = None
+        # The version is incremented whenever the sequence or one of its elements is changed. The
+        # elements notify the sequence about changes (cf. `_invalidate_serialization`).
+        self._version = 0
+        self._bitstring: tuple[tuple[int, int], Bitstring] | None = None
 
     def assign(self, value: list[TypeValue], check: bool = True) -> None:
         if check:
@@ -496,18 +554,26 @@ class SequenceValue(CompositeValue):
                     )
                     raise e
 
+        for v in value:
+            v._container = self
         self._value = value
+        self._invalidate_serialization()
 
     def parse(self, value: Bitstring | bytes, check: bool = True) -> None:
         self._check_size_of_assigned_value(value)
         if isinstance(value, bytes):
             value = Bitstring.from_bytes(value)
-        if self._is_message_sequence:
-            while len(value) != 0:
-                nested_message = TypeValue.construct(self._element_type)
-                assert isinstance(nested_message, MessageValue)
+        # The elements are parsed from the given bitstring without copying it. Each element is
+        # created by cloning an initialized element.
+        prototype = self._element_prototype()
+        elements: list[TypeValue] = []
+        offset = 0
+
+        if isinstance(prototype, MessageValue):
+            while offset < len(value):
+                nested_message = prototype.clone()
                 try:
-                    nested_message.parse(value, check)
+                    offset += nested_message.parse_prefix(value[offset:], check)
                 except PyRFLXError as e:
                     new_exception = PyRFLXError()
                     new_exception.push_msg(
@@ -517,29 +583,40 @@ class SequenceValue(CompositeValue):
                     new_exception.extend(e.entries)
                     raise new_exception from e
                 assert nested_message.valid_message
-                self._value.append(nested_message)
-                value = value[len(nested_message.bitstring) :]
-
-        elif isinstance(self._element_type, Scalar):
-            value_str = str(value)
-            type_size = self._element_type.size
-            type_size_int = type_size.value
-            new_value = []
-
-            while len(value_str) != 0:
-                nested_value = TypeValue.construct(
-                    self._element_type,
-                    imported=self._element_type.package != self._type.package,
-                )
-                nested_value.parse(Bitstring(value_str[:type_size_int]), check)
-                new_value.append(nested_value)
-                value_str = value_str[type_size_int:]
+                elements.append(nested_message)
+
+        elif isinstance(prototype, ScalarValue):
+            size = prototype.size.value
 
-            self._value = new_value
+            while offset < len(value):
+                nested_value = prototype.clone()
+                nested_value.parse(value[offset : min(offset + size, len(value))], check)
+                elements.append(nested_value)
+                offset += size
 
         else:
             assert False
 
+        # The container of the elements is set after parsing, so that the sequence is not
+        # notified about the changes during parsing
+        for element in elements:
+            element._container = self
+        self._value = elements
+        self._invalidate_serialization()
+
+    def _element_prototype(self) -> TypeValue:
+        if self._prototype is None:
+            self._prototype = TypeValue.construct(
+                self._element_type,
+                imported=self._element_type.package != self._type.package,
+            )
+        return self._prototype
+
+    def clone(self) -> TypeValue:
+        result = SequenceValue(self._type)
+        result._prototype = self._prototype
+        return result
+
     @property
     def size(self) -> Expr:
         if not self._value:
@@ -554,8 +631,18 @@ class SequenceValue(CompositeValue):
     @property
     def bitstring(self) -> Bitstring:
         self._raise_initialized()
-        bits = [element.bitstring for element in self._value]
-        return Bitstring.join(bits)
+        # The length of the list is part of the stamp, as elements could be added to or removed
+        # from the list returned by `value`
+        stamp = (self._version, len(self._value))
+        if self._bitstring is None or self._bitstring[0] != stamp:
+            bits = [element.bitstring for element in self._value]
+            self._bitstring = (stamp, Bitstring.join(bits))
+        return self._bitstring[1]
+
+    def _invalidate_serialization(self) -> None:
+        self._version += 1
+        self._bitstring = None
+        super()._invalidate_serialization()
 
     @property
     def accepted_type(self) -> type:
@@ -570,6 +657,32 @@ class SequenceValue(CompositeValue):
 
 
 class MessageValue(TypeValue):
+    __slots__ = (
+        "_bitstring",
+        "_changed_fields",
+        "_checksum_results",
+        "_checksums",
+        "_fields",
+        "_last_field",
+        "_layout",
+        "_message_first_name",
+        "_message_last_name",
+        "_message_size_name",
+        "_parameters",
+        "_parse_plan",
+        "_parse_plan_unsupported",
+        "_path",
+        "_preset",
+        "_pristine",
+        "_refinements",
+        "_serialized",
+        "_shared",
+        "_simplified_mapping",
+        "_skip_verification",
+        "_version",
+        "accessible_fields",
+    )
+
     _type: Message
 
     def __init__(
@@ -611,6 +724,10 @@ class MessageValue(TypeValue):
             }
         )
 
+        # The last result of each incremental checksum function is kept per message, as the
+        # checksums are shared with the clones of a message
+        self._checksum_results: dict[str, tuple[bytes, dict[str, object], int]] = {}
+
         self._message_first_name = First("Message")
         initial = self._fields[INITIAL.name]
         initial.first = Number(0)
@@ -620,12 +737,38 @@ class MessageValue(TypeValue):
             Number(0),
         )
         self.accessible_fields: list[str] = []
-        if self._skip_verification:
-            self._last_field = INITIAL.name
-        else:
-            self._preset_fields(INITIAL.name)
+        self._preset: MessageValue.Preset | None = None
         self._message_last_name = Last("Message")
         self._message_size_name = Size("Message")
+        self._parse_plan = state.parse_plan if state else None
+        self._parse_plan_unsupported = state.parse_plan_unsupported if state else False
+
+        # The serialized message is kept in a buffer, which is only updated for the changed fields
+        # when the message is serialized again. The layout contains the name, first bit, size and
+        # version of each serialized field. The version is incremented whenever the message is
+        # changed, also by a change of an element of a sequence field (cf. `_contain_sequences`).
+        self._version = 0
+        self._serialized = bytearray()
+        self._layout: list[tuple[str, int, int, int | None]] = []
+        self._changed_fields: set[str] = set()
+        self._bitstring: tuple[int, Bitstring] | None = None
+        self._contain_sequences()
+
+        # Clones share the state of an unset message, which is created once by `clone` for the
+        # current refinements and parameters, until they are changed (cf. `_own_state`)
+        self._pristine: (
+            tuple[abc.Sequence[RefinementValue], abc.Mapping[Expr, Expr], MessageValue] | None
+        ) = None
+        self._shared = False
+
+        # The fields are preset after all attributes have been initialized, as presetting the
+        # fields changes the state of the message
+        self._last_field = INITIAL.name
+        if state and state.preset and not self._skip_verification:
+            self._restore_preset(state.preset)
+        elif not self._skip_verification:
+            self._preset_fields(INITIAL.name)
+            self._preset = self._save_preset()
 
     def add_refinement(self, refinement: RefinementValue) -> None:
         self._refinements = [*(self._refinements or []), refinement]
@@ -689,31 +832,125 @@ class MessageValue(TypeValue):
             params[Variable(name)] = expr
 
         self._parameters = params
+        self._invalidate_serialization()
         if not self._skip_verification:
             self._preset_fields(INITIAL.name)
+            self._preset = self._save_preset()
 
     def clone(self) -> MessageValue:
-        return MessageValue(
-            self._type,
-            self._refinements,
-            self._skip_verification,
-            self._parameters,
-            MessageValue.State(
-                {
-                    k: MessageValue.Field(
-                        v.typeval.clone(),
-                        k,
-                        v.name_variable,
-                        v.name_first,
-                        v.name_last,
-                        v.name_size,
-                    )
-                    for k, v in self._fields.items()
-                },
-                self._checksums,
+        """
+        Return an unset message of the same type.
+
+        The clone shares the fields, the accessible fields and the simplification mapping with an
+        unset message, so that cloning does not depend on the number of fields. The shared state is
+        copied when the clone is changed for the first time.
+        """
+        if (
+            self._pristine is None
+            or self._pristine[0] is not self._refinements
+            or self._pristine[1] is not self._parameters
+        ):
+            self._pristine = (
+                self._refinements,
+                self._parameters,
+                MessageValue(
+                    self._type,
+                    self._refinements,
+                    self._skip_verification,
+                    self._parameters,
+                    MessageValue.State(
+                        {
+                            k: MessageValue.Field(
+                                v.typeval.clone(),
+                                k,
+                                v.name_variable,
+                                v.name_first,
+                                v.name_last,
+                                v.name_size,
+                            )
+                            for k, v in self._fields.items()
+                        },
+                        self._checksums,
+                        self._get_parse_plan(),
+                        self._parse_plan_unsupported,
+                        self._preset,
+                    ),
+                ),
+            )
+        return self._pristine[2]._share()
+
+    def _share(self) -> MessageValue:
+        """Return a message which shares the state of this unset message."""
+        result = MessageValue.__new__(MessageValue)
+        result._type = self._type
+        result._value = None
+        result._skip_verification = self._skip_verification
+        result._refinements = self._refinements
+        result._path = []
+        result._parameters = self._parameters
+        result._fields = self._fields
+        result._checksums = self._checksums
+        result._checksum_results = {}
+        result._message_first_name = self._message_first_name
+        result._simplified_mapping = self._simplified_mapping
+        result.accessible_fields = self.accessible_fields
+        result._preset = self._preset
+        result._last_field = self._last_field
+        result._message_last_name = self._message_last_name
+        result._message_size_name = self._message_size_name
+        result._parse_plan = self._parse_plan
+        result._parse_plan_unsupported = self._parse_plan_unsupported
+        result._version = 0
+        result._serialized = bytearray()
+        result._layout = []
+        result._changed_fields = set()
+        result._bitstring = None
+        result._container = None
+        result._pristine = (result._refinements, result._parameters, self)
+        result._shared = True
+        return result
+
+    def _own_state(self) -> None:
+        """Copy the state shared with other clones before the message is changed."""
+        if not self._shared:
+            return
+        self._shared = False
+        self._fields = {k: v.copy() for k, v in self._fields.items()}
+        self._fields[INITIAL.name].typeval.assign(b"")
+        self._simplified_mapping = dict(self._simplified_mapping)
+        self.accessible_fields = list(self.accessible_fields)
+        self._contain_sequences()
+
+    def _contain_sequences(self) -> None:
+        """Let the sequence fields notify the message about changes of their elements."""
+        for f in self._fields.values():
+            if isinstance(f.typeval, SequenceValue):
+                f.typeval._container = self  # noqa: SLF001
+
+    def _save_preset(self) -> MessageValue.Preset:
+        """Save the state of the fields of an unset message (cf. `_preset_fields`)."""
+        return MessageValue.Preset(
+            tuple(self.accessible_fields),
+            self._last_field,
+            tuple((k, v.first) for k, v in self._fields.items() if v.first != UNDEFINED),
+            tuple(
+                (k, v.typeval.expected_size)
+                for k, v in self._fields.items()
+                if isinstance(v.typeval, CompositeValue) and v.typeval.expected_size is not None
             ),
         )
 
+    def _restore_preset(self, preset: MessageValue.Preset) -> None:
+        self.accessible_fields = list(preset.accessible_fields)
+        self._last_field = preset.last_field
+        for k, first in preset.firsts:
+            self._fields[k].first = first
+        for k, size in preset.expected_sizes:
+            typeval = self._fields[k].typeval
+            assert isinstance(typeval, CompositeValue)
+            typeval.set_expected_size(size)
+        self._preset = preset
+
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
             return self._fields == other._fields and self._type == other._type
@@ -862,9 +1099,45 @@ class MessageValue(TypeValue):
 
     def parse(self, value: Bitstring | bytes, _check: bool = True) -> None:
         assert not self._skip_verification
+        self._own_state()
+        self._path.clear()
+        self._invalidate_serialization(self.fields)
+        if isinstance(value, bytes):
+            value = Bitstring.from_bytes(value)
+        if self._parse_with_plan(value):
+            return
+        self._parse_generic(value)
+
+    def try_parse(self, value: Bitstring | bytes) -> ParseResult:
+        """
+        Parse a message and return the result instead of raising an exception if it is invalid.
+
+        Invalid messages which are detected by the parse plan, including invalid messages in
+        refined fields, are rejected without creating any error messages. A message which cannot
+        be handled by the parse plan is parsed as by `parse`, an error is reported as
+        `ParseStatus.INVALID`. The values of the fields of a rejected message are unspecified.
+        """
+        assert not self._skip_verification
+        self._own_state()
         self._path.clear()
+        self._invalidate_serialization(self.fields)
         if isinstance(value, bytes):
             value = Bitstring.from_bytes(value)
+        try:
+            run = self._run_plan(value)
+            if run is not None:
+                rejection = self._plan_rejection(*run)
+                if rejection is not None:
+                    return rejection
+                if not run[0].failed and run[0].steps:
+                    self._apply_plan(*run, len(value))
+                    return VALID
+            self._parse_generic(value)
+        except PyRFLXError:
+            return ParseResult(ParseStatus.INVALID)
+        return VALID
+
+    def _parse_generic(self, value: Bitstring) -> None:
         message_size = len(value)
         current_field_name = self._next_field(INITIAL.name, append_to_path=True)
         last_field_first_in_bitstr = current_field_first_in_bitstr = 0
@@ -935,11 +1208,376 @@ class MessageValue(TypeValue):
                     raise e from None
             current_field_name = self._next_field(current_field_name, append_to_path=True)
 
+    def parse_prefix(self, value: Bitstring | bytes, check: bool = True) -> int:
+        """
+        Parse a message at the start of the given bitstring and return its size in bits.
+
+        The size is determined by the last field on the message path, so that the message does not
+        need to be serialized to determine the number of consumed bits.
+        """
+        self.parse(value, check)
+        assert self._path
+        assert self._path[-1].target == FINAL
+        last = self._fields[self._path[-1].source.name].last
+        assert isinstance(last, Number)
+        return last.value + 1
+
+    def _get_parse_plan(self) -> ParsePlan | None:
+        if (
+            self._parse_plan is None
+            and not self._parse_plan_unsupported
+            and not self._skip_verification
+        ):
+            try:
+                self._parse_plan = ParsePlan(
+                    self._type,
+                    {
+                        k: v.typeval.literals
+                        for k, v in self._fields.items()
+                        if isinstance(v.typeval, EnumValue)
+                    },
+                )
+            except UnsupportedExpressionError:
+                self._parse_plan_unsupported = True
+        return self._parse_plan
+
+    def _unset(self) -> bool:
+        """
+        Return True if no field of the message has been set.
+
+        Sequences are initialized with an empty sequence, so that only non-empty sequences count
+        as set.
+        """
+        return not any(
+            v.typeval.value if isinstance(v.typeval, SequenceValue) else v.typeval.initialized
+            for k, v in self._fields.items()
+            if k != INITIAL.name
+        )
+
+    def _parse_with_plan(self, value: Bitstring) -> bool:
+        """
+        Parse a message using the compiled parse plan of the message.
+
+        The parse plan is only used for messages whose fields have not been set yet. False is
+        returned if the message could not be parsed by the parse plan. In this case, the state of
+        the message is unchanged and the generic parsing algorithm must be used.
+        """
+        run = self._run_plan(value)
+        if run is None or run[0].failed or not run[0].steps:
+            return False
+        self._apply_plan(*run, len(value))
+        return True
+
+    def _run_plan(
+        self,
+        value: Bitstring,
+    ) -> tuple[Cursor, dict[str, list[RefinementValue]]] | None:
+        """
+        Determine the fields of a message whose fields have not been set yet by its parse plan.
+
+        The message is not changed. None is returned if the parse plan cannot be used.
+        """
+        plan = self._get_parse_plan()
+        if plan is None or not self._unset():
+            return None
+
+        try:
+            refinements, refinement_conditions = self._plan_refinements(plan)
+        except UnsupportedExpressionError:
+            return None
+
+        cursor = plan.cursor(value, self._plan_parameters(), refinement_conditions)
+        while cursor.advance() is not None:
+            pass
+        return cursor, refinements
+
+    @staticmethod
+    def _plan_rejection(
+        cursor: Cursor,
+        refinements: abc.Mapping[str, abc.Sequence[RefinementValue]],
+    ) -> ParseResult | None:
+        """Return the result for a message which has been rejected by a parse plan."""
+        if cursor.rejection is not None:
+            return ParseResult(*cursor.rejection)
+        if cursor.failed:
+            return None
+        for step in cursor.steps:
+            if step.refinement is not None:
+                sdu = refinements[step.field][step.refinement].sdu
+                run = sdu._run_plan(step.value)  # noqa: SLF001
+                nested = MessageValue._plan_rejection(*run) if run is not None else None
+                if nested is not None:
+                    return ParseResult(ParseStatus.NESTED_FAILURE, step.field, nested)
+        return None
+
+    def _apply_plan(
+        self,
+        cursor: Cursor,
+        refinements: abc.Mapping[str, abc.Sequence[RefinementValue]],
+        message_size: int,
+    ) -> None:
+        """Set the fields determined by a parse plan."""
+        self._path = cursor.path
+        self.accessible_fields = []
+        for step in cursor.steps:
+            field = self._fields[step.field]
+            field.first = Number(step.first)
+            if isinstance(field.typeval, CompositeValue) and step.sized:
+                field.typeval.set_expected_size(Number(len(step.value)))
+            if step.refinement is not None:
+                assert isinstance(field.typeval, OpaqueValue)
+                field.typeval.set_refinement(refinements[step.field][step.refinement].sdu)
+            if isinstance(step.scalar, int):
+                field.typeval.assign(step.scalar, check=False)
+            elif isinstance(step.scalar, Literal):
+                field.typeval.assign(str(step.scalar.identifier), check=False)
+            else:
+                self._parse_field_value(step.field, field, step.value)
+            self.accessible_fields.append(step.field)
+
+        self._reset_simplified_mapping()
+        # As in `_update_simplified_mapping`, the size of the message is only kept if the end of
+        # the message cannot be determined without the validity of the checksums
+        if self._checksums:
+            self._simplified_mapping[self._message_last_name] = Number(message_size - 1)
+            self._simplified_mapping[self._message_size_name] = Number(message_size)
+        # Eng/RecordFlux/RecordFlux#422
+        self._simplified_mapping.update({ValidChecksum(f): TRUE for f in self._checksums})
+
+    def _plan_refinements(
+        self,
+        plan: ParsePlan,
+    ) -> tuple[dict[str, list[RefinementValue]], dict[str, list[Evaluator | None]]]:
+        """
+        Return the refinements of all fields and their compiled conditions.
+
+        `UnsupportedExpressionError` is raised if a condition cannot be compiled.
+        """
+        refinements: dict[str, list[RefinementValue]] = {}
+        refinement_conditions: dict[str, list[Evaluator | None]] = {}
+        for ref in self._refinements:
+            if ref.pdu.name == self.name:
+                refinements.setdefault(ref.field.name, []).append(ref)
+                refinement_conditions.setdefault(ref.field.name, []).append(
+                    plan.condition(ref.condition),
+                )
+        return refinements, refinement_conditions
+
+    def _plan_parameters(self) -> dict[str, object]:
+        parameters: dict[str, object] = {}
+        for k, v in self._parameters.items():
+            assert isinstance(k, Variable)
+            parameters[k.name] = v.value if isinstance(v, Number) else v
+        return parameters
+
+    def parse_lazy(self, data: Buffer | Bitstring) -> LazyMessage:
+        """
+        Parse a message on demand.
+
+        In contrast to `parse`, the fields are only parsed and decoded when they are accessed (cf.
+        `LazyMessage`). The data is referenced without copying and must not be changed as long as
+        the result is used. This message is used as the prototype of the parsed message and is not
+        changed.
+        """
+        bits = data if isinstance(data, Bitstring) else Bitstring.from_bytes(memoryview(data))
+        plan = self._get_parse_plan()
+        cursor = None
+        refinements: dict[str, list[RefinementValue]] = {}
+
+        if plan is not None:
+            try:
+                refinements, refinement_conditions = self._plan_refinements(plan)
+                cursor = plan.cursor(bits, self._plan_parameters(), refinement_conditions)
+            except UnsupportedExpressionError:
+                pass
+
+        def decode(step: Step) -> object:
+            if step.refinement is not None:
+                return refinements[step.field][step.refinement].sdu.parse_lazy(step.value)
+            return self._view_values([step])[step.field]
+
+        def fallback() -> dict[str, object]:
+            message = self.clone()
+            message.parse(bits)
+            return {
+                f: memoryview(v) if isinstance(v, bytes) else v
+                for f in message.valid_fields
+                for v in [message.get(f)]
+            }
+
+        return LazyMessage(self.name, self.fields, cursor, decode, fallback)
+
+    def parse_many(
+        self,
+        data: Buffer | abc.Iterable[Buffer],
+        offsets: abc.Sequence[int] | None = None,
+    ) -> abc.Iterator[MessageView]:
+        """
+        Parse a sequence of messages.
+
+        The messages are given either as an iterable of buffers or as a single buffer together
+        with the start offsets of the messages (see `batch.buffers`). This message is used as the
+        prototype for all parsed messages, its parse plan is shared. Instead of creating a message
+        value for each message, a read-only view of the field values is returned. Messages which
+        cannot be parsed result in an invalid view containing the error.
+
+        In contrast to `parse` and `parse_lazy`, refinements are not applied: The value of a refined
+        opaque field is returned as raw bytes and the contained message is neither parsed nor
+        checked. It can be parsed separately using the message type of the refinement.
+        """
+        # Refinements are removed, so that the batch of messages is parsed without nested messages
+        prototype = self.clone()
+        prototype._refinements = []
+        plan = prototype._get_parse_plan()
+        parameters = prototype._plan_parameters()
+
+        for buffer in buffers(data, offsets):
+            if not isinstance(buffer, (bytes, bytearray, memoryview)):
+                buffer = memoryview(buffer)
+            bits = Bitstring.from_bytes(buffer)
+            result = plan.run(bits, parameters, {}) if plan else None
+            try:
+                if result is not None and result[0]:
+                    values = prototype._view_values(result[0])
+                    yield MessageView(self.name, self.fields, values)
+                else:
+                    message = prototype.clone()
+                    message.parse(bits)
+                    yield MessageView(
+                        self.name,
+                        self.fields,
+                        {
+                            f: memoryview(v) if isinstance(v, bytes) else v
+                            for f in message.valid_fields
+                            for v in [message.get(f)]
+                        },
+                    )
+            except PyRFLXError as e:
+                yield MessageView(self.name, self.fields, {}, e)
+
+    def parse_columns(
+        self,
+        data: Buffer | abc.Iterable[Buffer],
+        offsets: abc.Sequence[int] | None = None,
+    ) -> Columns:
+        """
+        Parse a sequence of messages and return the field values column by column.
+
+        The messages are given in the same way as for `parse_many`. The values determined by the
+        parse plan are appended directly to the columns. In addition to the values, the numeric
+        values of enumeration fields and the positions of opaque and sequence fields are recorded
+        (see `Columns`), so that the columns can be exported to NumPy or Arrow.
+
+        As for `parse_many`, refinements are not applied: The value of a refined opaque field is
+        returned as raw bytes and the contained message is neither parsed nor checked.
+        """
+        # Refinements are removed, so that the batch of messages is parsed without nested messages
+        prototype = self.clone()
+        prototype._refinements = []
+        plan = prototype._get_parse_plan()
+        parameters = prototype._plan_parameters()
+
+        fields = self.fields
+        columns = Columns(
+            {f: [] for f in fields},
+            {f: [] for f in fields},
+            [],
+            {f: [] for f in fields if isinstance(self._fields[f].typeval, EnumValue)},
+            {f: [] for f in fields if isinstance(self._fields[f].typeval, CompositeValue)},
+            {
+                f: {str(k): v.value for k, v in typeval.literals.items() if isinstance(v, Number)}
+                for f in fields
+                for typeval in [self._fields[f].typeval]
+                if isinstance(typeval, EnumValue)
+            },
+        )
+
+        for buffer in buffers(data, offsets):
+            if not isinstance(buffer, (bytes, bytearray, memoryview)):
+                buffer = memoryview(buffer)
+            bits = Bitstring.from_bytes(buffer)
+            result = plan.run(bits, parameters, {}) if plan else None
+            try:
+                if result is not None and result[0]:
+                    literals = columns.literals
+                    for step in result[0]:
+                        if isinstance(step.scalar, Literal):
+                            literal = str(step.scalar.identifier)
+                            columns._add(  # noqa: SLF001
+                                step.field,
+                                literal,
+                                literals[step.field][literal],
+                            )
+                        elif step.scalar is not None:
+                            columns._add(step.field, step.scalar)  # noqa: SLF001
+                        else:
+                            columns._add(  # noqa: SLF001
+                                step.field,
+                                prototype._view_values([step])[step.field],
+                                span=(step.first // 8, len(step.value) // 8),
+                            )
+                else:
+                    message = prototype.clone()
+                    message.parse(bits)
+                    for f in message.valid_fields:
+                        field = message._fields[f]  # noqa: SLF001
+                        value = message.get(f)
+                        if isinstance(field.typeval, EnumValue):
+                            columns._add(  # noqa: SLF001
+                                f,
+                                value,
+                                field.typeval.numeric_value.value,
+                            )
+                        elif isinstance(field.typeval, CompositeValue):
+                            first = field.first
+                            size = field.typeval.size
+                            assert isinstance(first, Number)
+                            assert isinstance(size, Number)
+                            columns._add(  # noqa: SLF001
+                                f,
+                                memoryview(value) if isinstance(value, bytes) else value,
+                                span=(first.value // 8, size.value // 8),
+                            )
+                        else:
+                            columns._add(f, value)  # noqa: SLF001
+            except PyRFLXError as e:
+                columns._complete(e)  # noqa: SLF001
+            else:
+                columns._complete()  # noqa: SLF001
+
+        return columns
+
+    def _view_values(self, steps: abc.Sequence[Step]) -> dict[str, object]:
+        values: dict[str, object] = {}
+        for step in steps:
+            if isinstance(step.scalar, Literal):
+                values[step.field] = str(step.scalar.identifier)
+            elif step.scalar is not None:
+                values[step.field] = step.scalar
+            else:
+                typeval = self._fields[step.field].typeval
+                if isinstance(typeval, OpaqueValue):
+                    values[step.field] = step.value.as_memoryview()
+                else:
+                    sequence = typeval.clone()
+                    assert isinstance(sequence, SequenceValue)
+                    if step.sized:
+                        sequence.set_expected_size(Number(len(step.value)))
+                    self._parse_field_value(
+                        step.field,
+                        MessageValue.Field(sequence, step.field),
+                        step.value,
+                    )
+                    values[step.field] = sequence.value
+        return values
+
     def _set_unchecked(
         self,
         field_name: str,
         value: bytes | int | str | abc.Sequence[TypeValue],
     ) -> None:
+        self._own_state()
+        self._invalidate_serialization([field_name])
         field = self._fields[field_name]
         field.prev = self._last_field
         self._fields[self._last_field].next = field_name
@@ -960,6 +1598,8 @@ class MessageValue(TypeValue):
         value: bytes | int | str | abc.Sequence[TypeValue] | Bitstring,
         message_size: int | None = None,
     ) -> None:
+        self._own_state()
+
         def set_refinement(fld: MessageValue.Field, fld_name: str) -> None:
             if isinstance(fld.typeval, OpaqueValue):
                 for ref in self._refinements:
@@ -990,6 +1630,7 @@ class MessageValue(TypeValue):
                 raise e
 
         if field_name in self.accessible_fields:
+            self._invalidate_serialization([field_name])
             field = self._fields[field_name]
             f_first = field.first
             f_size = field.typeval.size
@@ -1008,31 +1649,7 @@ class MessageValue(TypeValue):
             if isinstance(field.typeval, CompositeValue) and field_size is not None:
                 field.typeval.set_expected_size(field_size)
             set_refinement(field, field_name)
-            try:
-                if isinstance(value, Bitstring):
-                    buffer = (
-                        value
-                        if self._type.byte_order[Field(field_name)] == ByteOrder.HIGH_ORDER_FIRST
-                        or not (isinstance(field.typeval, ScalarValue))
-                        or len(value) <= 8
-                        or len(value) % 8 != 0
-                        else value.swap()
-                    )
-                    field.typeval.parse(buffer)
-                elif isinstance(value, field.typeval.accepted_type):
-                    field.typeval.assign(value)
-                else:
-                    e = PyRFLXError()
-                    e.push_msg(
-                        f"cannot assign different types: {field.typeval.accepted_type.__name__}"
-                        f" != {type(value).__name__}",
-                    )
-                    raise e
-            except PyRFLXError as e:
-                new_exception = PyRFLXError()
-                new_exception.push_msg(f"cannot set value for field {field_name}")
-                new_exception.extend(e.entries)
-                raise new_exception from e
+            self._parse_field_value(field_name, field, value)
         else:
             error = PyRFLXError()
             error.push_msg(f"cannot access field {field_name}")
@@ -1041,6 +1658,38 @@ class MessageValue(TypeValue):
         self._update_simplified_mapping(message_size)
         check_outgoing_condition_satisfied()
 
+    def _parse_field_value(
+        self,
+        field_name: str,
+        field: MessageValue.Field,
+        value: bytes | int | str | abc.Sequence[TypeValue] | Bitstring,
+    ) -> None:
+        try:
+            if isinstance(value, Bitstring):
+                buffer = (
+                    value
+                    if self._type.byte_order[Field(field_name)] == ByteOrder.HIGH_ORDER_FIRST
+                    or not (isinstance(field.typeval, ScalarValue))
+                    or len(value) <= 8
+                    or len(value) % 8 != 0
+                    else value.swap()
+                )
+                field.typeval.parse(buffer)
+            elif isinstance(value, field.typeval.accepted_type):
+                field.typeval.assign(value)
+            else:
+                e = PyRFLXError()
+                e.push_msg(
+                    f"cannot assign different types: {field.typeval.accepted_type.__name__}"
+                    f" != {type(value).__name__}",
+                )
+                raise e
+        except PyRFLXError as e:
+            new_exception = PyRFLXError()
+            new_exception.push_msg(f"cannot set value for field {field_name}")
+            new_exception.extend(e.entries)
+            raise new_exception from e
+
     def set(
         self,
         field_name: str,
@@ -1056,10 +1705,130 @@ class MessageValue(TypeValue):
                 not self._fields[checksum.field_name].set or checksum.calculated
             ) and self._is_checksum_settable(checksum):
                 self._fields[checksum.field_name].typeval.assign(0)
+                self._invalidate_serialization([checksum.field_name])
                 checksum.calculated = True
                 checksum_value = self._calculate_checksum(checksum)
                 self._set_checked(checksum.field_name, checksum_value)
 
+    def build(
+        self,
+        values: abc.Mapping[str, bytes | int | str | abc.Sequence[TypeValue]],
+    ) -> None:
+        """
+        Set the values of the given fields at once.
+
+        The values are checked in the same way as by `set`. Checksum fields for which no value is
+        given are calculated. If no field of the message has been set before, the message path is
+        determined in a single pass using the parse plan, the checksums are calculated once at the
+        end and all fields are serialized into a single buffer. Otherwise, the fields are set one
+        after another.
+        """
+        for field_name in values:
+            if field_name not in self._fields or field_name == INITIAL.name:
+                e = PyRFLXError()
+                e.push_msg(f'"{field_name}" is not a field of this message')
+                raise e
+
+        if self._build_with_plan(values):
+            return
+
+        for field_name in self.fields:
+            if field_name in values:
+                self.set(field_name, values[field_name])
+
+    def _build_with_plan(  # noqa: PLR0912
+        self,
+        values: abc.Mapping[str, bytes | int | str | abc.Sequence[TypeValue]],
+    ) -> bool:
+        """
+        Build a message using the compiled parse plan of the message.
+
+        False is returned if the message could not be built by the parse plan. In this case, the
+        state of the message is unchanged and the fields must be set one after another.
+        """
+        self._own_state()
+        plan = self._get_parse_plan()
+        if (
+            plan is None
+            or not self._unset()
+            or any(
+                isinstance(self._fields[k].typeval, OpaqueValue) and not isinstance(v, bytes)
+                for k, v in values.items()
+            )
+        ):
+            return False
+
+        try:
+            refinements, refinement_conditions = self._plan_refinements(plan)
+        except UnsupportedExpressionError:
+            return False
+
+        def clear() -> None:
+            for k, v in self._fields.items():
+                if k != INITIAL.name:
+                    v.typeval.clear()
+
+        numbers: dict[str, int] = {}
+        sizes: dict[str, int] = {}
+
+        try:
+            for field_name, value in values.items():
+                field = self._fields[field_name]
+                if isinstance(field.typeval, OpaqueValue):
+                    assert isinstance(value, bytes)
+                    sizes[field_name] = len(value) * 8
+                    continue
+                self._parse_field_value(field_name, field, value)
+                if isinstance(field.typeval, EnumValue):
+                    numbers[field_name] = field.typeval.numeric_value.value
+                elif isinstance(field.typeval, IntegerValue):
+                    numbers[field_name] = field.typeval.value
+                else:
+                    sizes[field_name] = len(field.typeval.bitstring)
+        except PyRFLXError:
+            clear()
+            raise
+
+        for checksum_field_name in self._checksums:
+            if checksum_field_name not in values:
+                self._fields[checksum_field_name].typeval.assign(0)
+                numbers[checksum_field_name] = 0
+
+        result = plan.place(numbers, sizes, self._plan_parameters(), refinement_conditions)
+        if result is None or not values.keys() <= {p.field for p in result[0]}:
+            clear()
+            return False
+
+        placements, path = result
+        self._path = path
+        self.accessible_fields = []
+        for placement in placements:
+            field = self._fields[placement.field]
+            field.first = Number(placement.first)
+            if isinstance(field.typeval, CompositeValue):
+                field.typeval.set_expected_size(Number(placement.size))
+            if isinstance(field.typeval, OpaqueValue):
+                if placement.refinement is not None:
+                    field.typeval.set_refinement(
+                        refinements[placement.field][placement.refinement].sdu,
+                    )
+                self._parse_field_value(placement.field, field, values[placement.field])
+            self.accessible_fields.append(placement.field)
+
+        # All fields are written into a buffer of the final size when the message is serialized
+        size = max((p.first + p.size for p in placements), default=0)
+        self._serialized = bytearray((size + 7) // 8)
+        self._layout = []
+        self._invalidate_serialization(self.fields)
+        self._update_simplified_mapping()
+
+        for checksum in self._checksums.values():
+            if checksum.field_name not in values and self._is_checksum_settable(checksum):
+                checksum.calculated = True
+                self._set_checked(checksum.field_name, self._calculate_checksum(checksum))
+
+        return True
+
     def _set_parsed_value(
         self,
         field_name: str,
@@ -1071,6 +1840,7 @@ class MessageValue(TypeValue):
 
     def _preset_fields(self, fld: str) -> None:
         assert not self._skip_verification
+        self._own_state()
         nxt = self._next_field(fld)
         fields: list[str] = []
 
@@ -1191,11 +1961,13 @@ class MessageValue(TypeValue):
         return True
 
     def update_checksums(self) -> None:
+        self._own_state()
         for checksum in self._checksums.values():
             self._simplified_mapping[ValidChecksum(checksum.field_name)] = TRUE
             self._is_checksum_settable(checksum)
             checksum_value = self._calculate_checksum(checksum)
             self._fields[checksum.field_name].typeval.assign(checksum_value)
+            self._invalidate_serialization([checksum.field_name])
 
     def _calculate_checksum(self, checksum: MessageValue.Checksum) -> int:
         if not checksum.function:
@@ -1205,7 +1977,31 @@ class MessageValue(TypeValue):
                 f"no callable checksum function provided",
             )
             raise e
+        message = self._unchecked_bytestring()
+        arguments = self._checksum_arguments(checksum)
+        if not isinstance(checksum.function, IncrementalChecksumFunction):
+            return checksum.function(message, **arguments)
+        # The checksum is updated based on the previously calculated checksum if only the values
+        # of fields have changed since then
+        previous = self._checksum_results.get(checksum.field_name)
+        if previous is not None and previous[1] == arguments and len(previous[0]) == len(message):
+            result = checksum.function.update(
+                previous[2],
+                previous[0],
+                message,
+                changed_bytes(previous[0], message, [(l[1], l[2]) for l in self._layout]),
+                **arguments,
+            )
+        else:
+            result = checksum.function(message, **arguments)
+        self._checksum_results[checksum.field_name] = (message, arguments, result)
+        return result
 
+    def _checksum_arguments(
+        self,
+        checksum: MessageValue.Checksum,
+    ) -> dict[str, str | int | bytes | tuple[int, int] | list[int]]:
+        """Return the arguments of a checksum function determined by `_is_checksum_settable`."""
         arguments: dict[str, str | int | bytes | tuple[int, int] | list[int]] = {}
         for expr_tuple in checksum.parameters:
             if isinstance(expr_tuple.evaluated_expression, ValueRange):
@@ -1226,7 +2022,7 @@ class MessageValue(TypeValue):
             else:
                 assert isinstance(expr_tuple.evaluated_expression, Number)
                 arguments[str(expr_tuple.expression)] = expr_tuple.evaluated_expression.value
-        return checksum.function(self._unchecked_bytestring(), **arguments)
+        return arguments
 
     def get(self, field_name: str) -> ValueType:
         if field_name not in self.valid_fields:
@@ -1244,14 +2040,26 @@ class MessageValue(TypeValue):
 
     @property
     def bitstring(self) -> Bitstring:
-        bits = ""
+        """
+        Return the serialized message.
+
+        The result is cached until the message is changed. When the message is serialized again,
+        only the changed fields and the fields whose position or size has changed are written into
+        the buffer of the serialized message. Fields which are not affected by a change keep their
+        serialized representation.
+        """
+        if self._bitstring is not None and self._bitstring[0] == self._version:
+            return self._bitstring[1]
+
+        layout: list[tuple[str, int, int, int | None]] = []
+        size = 0
         field = self._next_field(INITIAL.name)
         while field and field != FINAL.name:
             field_val = self._fields[field]
             if (
                 not field_val.set
                 or not isinstance(field_val.first, Number)
-                or not field_val.first.value <= len(bits)
+                or not field_val.first.value <= size
             ):
                 # https://github.com/nedbat/coveragepy/issues/772
                 # A dummy statement is needed to disable the peephole optimizer, so that the break
@@ -1259,30 +2067,74 @@ class MessageValue(TypeValue):
                 # CPython 3.8 and 3.9 are affected. The issue is fixed in CPython 3.10.
                 dummy = 0  # noqa: F841
                 break
-            added_bits = str(self._fields[field].typeval.bitstring)
-            added_bits_adjusted = (
-                added_bits
-                if self._type.byte_order[Field(field)] == ByteOrder.HIGH_ORDER_FIRST
-                or not isinstance(self._fields[field].typeval, ScalarValue)
-                or len(added_bits) <= 8
-                or len(added_bits) % 8 != 0
-                else Bitstring.swap_bitstring(added_bits)
+            field_size = field_val.typeval.size
+            assert isinstance(field_size, Number)
+            layout.append(
+                (
+                    field,
+                    field_val.first.value,
+                    field_size.value,
+                    (
+                        field_val.typeval._version  # noqa: SLF001
+                        if isinstance(field_val.typeval, SequenceValue)
+                        else None
+                    ),
+                ),
             )
-            bits = f"{bits[: field_val.first.value]}{added_bits_adjusted}"
+            size = field_val.first.value + field_size.value
             field = self._next_field(field)
 
-        return Bitstring(bits)
+        # A field overlaying preceding fields overwrites their serialized representation. The
+        # serialized representation of fields is only kept if neither the previous nor the new
+        # layout contains overlays.
+        keep = all(
+            first == (l[i - 1][1] + l[i - 1][2] if i > 0 else 0)
+            for l in (self._layout, layout)
+            for i, (_, first, _, _) in enumerate(l)
+        )
+
+        for i, entry in enumerate(layout):
+            if (
+                keep
+                and i < len(self._layout)
+                and self._layout[i] == entry
+                and entry[0] not in self._changed_fields
+            ):
+                continue
+            self._field_bitstring(entry[0]).write_into(self._serialized, entry[1])
+
+        self._layout = layout
+        self._changed_fields.clear()
+        bits = Bitstring.from_bytes(bytes(self._serialized[: (size + 7) // 8]))[:size]
+        self._bitstring = (self._version, bits)
+
+        return bits
+
+    def _field_bitstring(self, field: str) -> Bitstring:
+        bits = self._fields[field].typeval.bitstring
+        return (
+            bits
+            if self._type.byte_order[Field(field)] == ByteOrder.HIGH_ORDER_FIRST
+            or not isinstance(self._fields[field].typeval, ScalarValue)
+            or len(bits) <= 8
+            or len(bits) % 8 != 0
+            else bits.swap()
+        )
+
+    def _invalidate_serialization(self, fields: abc.Iterable[str] = ()) -> None:
+        """Invalidate the serialized message after the given fields or the layout were changed."""
+        self._version += 1
+        self._changed_fields.update(fields)
+        super()._invalidate_serialization()
 
     @property
     def value(self) -> ValueType:
         raise NotImplementedError
 
     def _unchecked_bytestring(self) -> bytes:
-        bits = str(self.bitstring)
+        bits = self.bitstring
         assert len(bits) % 8 == 0
-        return b"".join(
-            [int(bits[i : i + 8], 2).to_bytes(1, "big") for i in range(0, len(bits), 8)],
-        )
+        return bytes(bits)
 
     @property
     def bytestring(self) -> bytes:
@@ -1355,6 +2207,7 @@ class MessageValue(TypeValue):
         message_size: int | None = None,
         field: Field | None = None,
     ) -> None:
+        self._own_state()
         if field:
             if isinstance(field.typeval, ScalarValue):
                 self._simplified_mapping[field.name_variable] = field.typeval.expr
@@ -1373,21 +2226,7 @@ class MessageValue(TypeValue):
             )
             return
 
-        self._simplified_mapping = {
-            Size(field_type.full_name): field_type.size
-            for field_type in self._type.types.values()
-            if isinstance(field_type, Scalar)
-        }
-        self._simplified_mapping[self._message_first_name] = Number(0)
-        for v in self._fields.values():
-            if isinstance(v.typeval, ScalarValue) and v.set:
-                self._simplified_mapping[v.name_variable] = v.typeval.expr
-            if isinstance(v.typeval, ScalarValue) or v.set:
-                self._simplified_mapping[v.name_size] = v.typeval.size
-            if isinstance(v.first, Number):
-                self._simplified_mapping[v.name_first] = v.first
-            if isinstance(v.last, Number):
-                self._simplified_mapping[v.name_last] = v.last
+        self._reset_simplified_mapping()
 
         nxt = self._next_field(INITIAL.name)
         while nxt:
@@ -1411,6 +2250,24 @@ class MessageValue(TypeValue):
         # Eng/RecordFlux/RecordFlux#422
         self._simplified_mapping.update({ValidChecksum(f): TRUE for f in self._checksums})
 
+    def _reset_simplified_mapping(self) -> None:
+        """Create the mapping of all set fields without considering the message size."""
+        self._simplified_mapping = {
+            Size(field_type.full_name): field_type.size
+            for field_type in self._type.types.values()
+            if isinstance(field_type, Scalar)
+        }
+        self._simplified_mapping[self._message_first_name] = Number(0)
+        for v in self._fields.values():
+            if isinstance(v.typeval, ScalarValue) and v.set:
+                self._simplified_mapping[v.name_variable] = v.typeval.expr
+            if isinstance(v.typeval, ScalarValue) or v.set:
+                self._simplified_mapping[v.name_size] = v.typeval.size
+            if isinstance(v.first, Number):
+                self._simplified_mapping[v.name_first] = v.first
+            if isinstance(v.last, Number):
+                self._simplified_mapping[v.name_last] = v.last
+
     def _simplified(self, expr: Expr, max_iterations: int = 16) -> Expr:
         if expr in {TRUE, FALSE}:
             return expr
@@ -1459,6 +2316,8 @@ class MessageValue(TypeValue):
         return res
 
     class Checksum:
+        __slots__ = ("calculated", "field_name", "function", "parameters")
+
         def __init__(self, field_name: str, parameters: abc.Sequence[Expr]):
             self.field_name = field_name
             self.function: ChecksumFunction | None = None
@@ -1475,6 +2334,19 @@ class MessageValue(TypeValue):
                 self.parameters.append(Expressiontuple(expr))
 
     class Field(Base):
+        __slots__ = (
+            "_first",
+            "_is_scalar",
+            "_last",
+            "name_first",
+            "name_last",
+            "name_size",
+            "name_variable",
+            "next",
+            "prev",
+            "typeval",
+        )
+
         def __init__(  # noqa: PLR0913
             self,
             type_value: TypeValue,
@@ -1500,7 +2372,28 @@ class MessageValue(TypeValue):
         def _calculate_last(self) -> Expr:
             if self.first == UNDEFINED:
                 return UNDEFINED
-            return Sub(Add(self._first, self.typeval.size), Number(1)).simplified()
+            size = self.typeval.size
+            if isinstance(self._first, Number) and isinstance(size, Number):
+                return Number(self._first.value + size.value - 1)
+            return Sub(Add(self._first, size), Number(1)).simplified()
+
+        def copy(self) -> MessageValue.Field:
+            """Return a copy of the field at the same position without a value."""
+            result = MessageValue.Field.__new__(MessageValue.Field)
+            result.typeval = self.typeval.clone()
+            if isinstance(self.typeval, CompositeValue) and self.typeval.expected_size is not None:
+                assert isinstance(result.typeval, CompositeValue)
+                result.typeval.set_expected_size(self.typeval.expected_size)
+            result.name_variable = self.name_variable
+            result.name_first = self.name_first
+            result.name_last = self.name_last
+            result.name_size = self.name_size
+            result.prev = self.prev
+            result.next = self.next
+            result._is_scalar = self._is_scalar
+            result._first = self._first
+            result._last = self._last
+            return result
 
         @property
         def first(self) -> Expr:
@@ -1538,6 +2431,16 @@ class MessageValue(TypeValue):
     class State:
         fields: abc.Mapping[str, MessageValue.Field] | None = None
         checksums: abc.Mapping[str, MessageValue.Checksum] | None = None
+        parse_plan: ParsePlan | None = None
+        parse_plan_unsupported: bool = False
+        preset: MessageValue.Preset | None = None
+
+    @dataclass(frozen=True)
+    class Preset:
+        accessible_fields: tuple[str, ...]
+        last_field: str
+        firsts: tuple[tuple[str, Expr], ...]
+        expected_sizes: tuple[tuple[str, Expr], ...]
 
 
 class RefinementValue:
@@ -3,16 +3,17 @@ from __future__ import annotations
 import textwrap
 from collections import OrderedDict, defaultdict
 from collections.abc import Callable, Iterable, Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
-from rflx import const, expr, lang, model, ty
+from rflx import const, expr, lang, model, parse_cache, process_pool, ty
 from rflx.common import STDIN, unique
 from rflx.const import RESERVED_WORDS
 from rflx.error import fail
 from rflx.identifier import ID, StrID
 from rflx.integration import Integration
 from rflx.model import AlwaysVerify, Cache, declaration as decl, statement as stmt
+from rflx.model.cache import fingerprint
 from rflx.rapidflux import (
     NO_LOCATION,
     Annotation,
@@ -1751,12 +1752,44 @@ class ContextClause:
         return f"{str(self.name).lower()}.rflx"
 
 
+@dataclass(frozen=True)
+class CachedSpecification:
+    """
+    Result of parsing and evaluating a specification file.
+
+    The error entries are separated into the entries of the style checks, the entries determined
+    while creating the specification file and the entries determined while evaluating the
+    declarations, as they are reported at different stages of parsing.
+    """
+
+    package: ID
+    context_clauses: list[ContextClause]
+    model_style_checks: frozenset[const.StyleCheck]
+    style_entries: list[ErrorEntry]
+    creation_entries: list[ErrorEntry]
+    declarations: list[model.UncheckedTopLevelDeclaration]
+    evaluation_entries: list[ErrorEntry]
+
+
 @dataclass(frozen=True)
 class SpecificationFile:
+    """
+    Parsed specification file.
+
+    The syntax tree is not available for a specification file restored from the parse cache. In
+    this case, the evaluated declarations are contained in the cached result. The cache key and
+    the error entries are only set for specification files which are to be added to the cache.
+    """
+
     filename: Path
-    spec: lang.Specification
+    spec: lang.Specification | None
+    package: ID
     context_clauses: list[ContextClause]
     model_style_checks: frozenset[const.StyleCheck]
+    cache_key: str | None = None
+    style_entries: list[ErrorEntry] = field(default_factory=list)
+    creation_entries: list[ErrorEntry] = field(default_factory=list)
+    cached: CachedSpecification | None = None
 
     @staticmethod
     def create(
@@ -1767,9 +1800,11 @@ class SpecificationFile:
     ) -> SpecificationFile:
         check_naming(error, spec.f_package_declaration, filename)
 
+        identifier = spec.f_package_declaration.f_identifier
         return SpecificationFile(
             filename,
             spec,
+            ID(identifier.text, location=node_location(identifier, filename)),
             [
                 ContextClause(
                     create_id(error, context.f_item, filename),
@@ -1780,9 +1815,24 @@ class SpecificationFile:
             model_style_checks,
         )
 
-    @property
-    def package(self) -> ID:
-        return ID(self.spec.f_package_declaration.f_identifier.text)
+    @staticmethod
+    def restore(filename: Path, cached: CachedSpecification) -> SpecificationFile:
+        return SpecificationFile(
+            filename,
+            None,
+            cached.package,
+            cached.context_clauses,
+            cached.model_style_checks,
+            cached=cached,
+        )
+
+
+@dataclass(frozen=True)
+class _ParsedFile:
+    filename: Path
+    source: str
+    cache_key: str | None
+    result: CachedSpecification | list[ErrorEntry] | None
 
 
 class Parser:
@@ -1791,9 +1841,11 @@ class Parser:
         cache: Cache | None = None,
         workers: int = 1,
         integration_files_dir: Path | None = None,
+        summarize_paths: bool = False,
     ) -> None:
         self._cache = AlwaysVerify() if cache is None else cache
         self._workers = workers
+        self._summarize_paths = summarize_paths
         self._specifications: OrderedDict[ID, SpecificationFile] = OrderedDict()
         self._integration: Integration = Integration(integration_files_dir)
 
@@ -1803,11 +1855,14 @@ class Parser:
         include_paths = []
         specifications = []
 
-        for f in unique(specfiles):
+        files = list(unique(specfiles))
+
+        for f in files:
             if f.parent.is_dir() and f.parent not in include_paths:
                 include_paths.append(f.parent)
 
-            spec = self._parse_file(error, f)
+        for parsed in self._parse_files(files):
+            spec = self._load_file(error, parsed)
             if spec:
                 specifications.append(spec)
 
@@ -1870,8 +1925,36 @@ class Parser:
         ]
 
         style_checks: dict[Path, frozenset[const.StyleCheck]] = {}
+        cache = self._cache.specifications
         for spec_node in self._specifications.values():
-            self._evaluate_specification(error, declarations, spec_node.spec, spec_node.filename)
+            if spec_node.cached is not None:
+                declarations.extend(spec_node.cached.declarations)
+                error.extend(spec_node.cached.evaluation_entries)
+            else:
+                assert spec_node.spec is not None
+                file_error = RecordFluxError()
+                file_declarations: list[model.UncheckedTopLevelDeclaration] = []
+                evaluate_specification(
+                    file_error,
+                    file_declarations,
+                    spec_node.spec,
+                    spec_node.filename,
+                )
+                declarations.extend(file_declarations)
+                error.extend(file_error.entries)
+                if cache is not None and spec_node.cache_key is not None:
+                    cache.add(
+                        spec_node.cache_key,
+                        CachedSpecification(
+                            spec_node.package,
+                            spec_node.context_clauses,
+                            spec_node.model_style_checks,
+                            spec_node.style_entries,
+                            spec_node.creation_entries,
+                            file_declarations,
+                            file_error.entries,
+                        ),
+                    )
             style_checks[spec_node.filename] = spec_node.model_style_checks
 
         return model.UncheckedModel(declarations, style_checks, error)
@@ -1882,6 +1965,7 @@ class Parser:
         checked_model = unchecked_model.checked(
             self._cache,
             self._workers,
+            self._summarize_paths,
         )
         self._integration.validate(checked_model, error)
         error.propagate()
@@ -1895,30 +1979,103 @@ class Parser:
         return {
             spec_node.spec.f_package_declaration.f_identifier.text: spec_node.spec
             for spec_node in self._specifications.values()
+            if spec_node.spec is not None
         }
 
-    def _parse_file(self, error: RecordFluxError, filename: Path) -> SpecificationFile | None:
-        logging.info("Parsing {filename}", filename=filename)
+    def _parse_files(self, filenames: Sequence[Path]) -> list[_ParsedFile]:
+        """
+        Parse specification files.
+
+        Files which are not contained in the parse cache are parsed and evaluated concurrently, if
+        multiple workers are available and more than one file has to be parsed. Otherwise, the
+        files are parsed when they are loaded (see `_load_file`), so that the errors are reported
+        in the same order in both cases.
+        """
+        cache = self._cache.specifications
+        sources: list[str] = []
+        keys: list[str | None] = []
+        results: list[CachedSpecification | list[ErrorEntry] | None] = []
+
+        for filename in filenames:
+            logging.info("Parsing {filename}", filename=filename)
+            source = filename.read_text()
+            source_code.register(filename, source)
+            sources.append(source)
+            key = None
+            cached = None
+            if cache is not None:
+                key = parse_cache.key(filename, source, fingerprint())
+                cached = cache.get(key)
+            keys.append(key)
+            results.append(cached if isinstance(cached, CachedSpecification) else None)
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if self._workers > 1 and len(pending) > 1:
+            executor = process_pool.executor(self._workers)
+            for i, result in zip(
+                pending,
+                executor.map(
+                    _parse_specification,
+                    [filenames[i] for i in pending],
+                    [sources[i] for i in pending],
+                ),
+            ):
+                results[i] = result
+                key = keys[i]
+                if (
+                    cache is not None
+                    and key is not None
+                    and isinstance(result, CachedSpecification)
+                ):
+                    cache.add(key, result)
+
+        return [
+            _ParsedFile(filename, source, key, result)
+            for filename, source, key, result in zip(filenames, sources, keys, results)
+        ]
 
-        source_code_str = filename.read_text()
-        source_code.register(filename, source_code_str)
-        unit = lang.AnalysisContext().get_from_buffer(str(filename), source_code_str)
+    def _load_file(self, error: RecordFluxError, parsed: _ParsedFile) -> SpecificationFile | None:
+        """Report the errors of a parsed specification file and load its integration file."""
+        if parsed.result is None:
+            return self._parse_source(error, parsed.filename, parsed.source, parsed.cache_key)
 
-        basic_style_checks, model_style_checks = style.determine_enabled_checks(
-            error,
-            source_code_str,
-            filename,
-        )
-        error.extend(style.check(filename, basic_style_checks).entries)
+        if isinstance(parsed.result, CachedSpecification):
+            error.extend(parsed.result.style_entries)
+            self._integration.load_integration_file(parsed.filename, error)
+            error.extend(parsed.result.creation_entries)
+            return SpecificationFile.restore(parsed.filename, parsed.result)
 
-        if diagnostics_to_error(unit.diagnostics, error, filename):
-            return None
+        error.extend(parsed.result)
+        return None
 
-        assert isinstance(unit.root, lang.Specification)
+    def _parse_source(
+        self,
+        error: RecordFluxError,
+        filename: Path,
+        source: str,
+        cache_key: str | None,
+    ) -> SpecificationFile | None:
+        unit, model_style_checks, style_error = _parse_unit(filename, source)
+        error.extend(style_error.entries)
+
+        if unit is None:
+            return None
 
         self._integration.load_integration_file(filename, error)
 
-        return SpecificationFile.create(error, unit.root, filename, model_style_checks)
+        creation_error = RecordFluxError()
+        spec = SpecificationFile.create(creation_error, unit, filename, model_style_checks)
+        error.extend(creation_error.entries)
+
+        if cache_key is None:
+            return spec
+
+        return replace(
+            spec,
+            cache_key=cache_key,
+            style_entries=style_error.entries,
+            creation_entries=creation_error.entries,
+        )
 
     def _parse_withed_files(
         self,
@@ -1929,29 +2086,47 @@ class Parser:
         if not context_clauses:
             return
 
-        nested_context_clauses: list[ContextClause] = []
+        withed_files: list[tuple[ContextClause, Path | None]] = []
         for context_clause in context_clauses:
             if context_clause.name in self._specifications:
                 continue
-            for path in include_paths:
-                f = path / context_clause.withed_file
-                if f.exists():
-                    spec = self._parse_file(error, f)
-                    if spec:
-                        self._specifications[spec.package] = spec
-                        nested_context_clauses.extend(
-                            [
-                                c
-                                for c in spec.context_clauses
-                                if c
-                                not in [
-                                    *context_clauses,
-                                    *nested_context_clauses,
-                                ]
-                                and c.name not in self._specifications
-                            ],
-                        )
-                    break
+            withed_files.append(
+                (
+                    context_clause,
+                    next(
+                        (
+                            path / context_clause.withed_file
+                            for path in include_paths
+                            if (path / context_clause.withed_file).exists()
+                        ),
+                        None,
+                    ),
+                ),
+            )
+
+        files = list(unique(f for _, f in withed_files if f is not None))
+        parsed_files = dict(zip(files, self._parse_files(files)))
+
+        nested_context_clauses: list[ContextClause] = []
+        for context_clause, f in withed_files:
+            if context_clause.name in self._specifications:
+                continue
+            if f is not None:
+                spec = self._load_file(error, parsed_files[f])
+                if spec:
+                    self._specifications[spec.package] = spec
+                    nested_context_clauses.extend(
+                        [
+                            c
+                            for c in spec.context_clauses
+                            if c
+                            not in [
+                                *context_clauses,
+                                *nested_context_clauses,
+                            ]
+                            and c.name not in self._specifications
+                        ],
+                    )
             else:
                 error.extend(
                     [
@@ -1965,76 +2140,135 @@ class Parser:
 
         self._parse_withed_files(error, nested_context_clauses, include_paths)
 
-    def _evaluate_specification(
-        self,
-        error: RecordFluxError,
-        declarations: list[model.UncheckedTopLevelDeclaration],
-        spec: lang.Specification,
-        filename: Path,
-    ) -> None:
-        handlers: Mapping[
-            str,
-            Callable[
-                [
-                    RecordFluxError,
-                    ID,
-                    lang.TypeDef,
-                    Path,
-                    lang.Parameters | None,
-                ],
-                model.UncheckedTypeDecl | None,
+
+def evaluate_specification(
+    error: RecordFluxError,
+    declarations: list[model.UncheckedTopLevelDeclaration],
+    spec: lang.Specification,
+    filename: Path,
+) -> None:
+    handlers: Mapping[
+        str,
+        Callable[
+            [
+                RecordFluxError,
+                ID,
+                lang.TypeDef,
+                Path,
+                lang.Parameters | None,
             ],
-        ] = {
-            "SequenceTypeDef": create_sequence,
-            "ModularTypeDef": create_modular,
-            "RangeTypeDef": create_range,
-            "UnsignedTypeDef": create_unsigned,
-            "MessageTypeDef": create_message,
-            "NullMessageTypeDef": create_null_message,
-            "TypeDerivationDef": create_derived_message,
-            "EnumerationTypeDef": create_enumeration,
-        }
-        logging.info("Processing {name}", name=spec.f_package_declaration.f_identifier.text)
-        package_id = create_id(error, spec.f_package_declaration.f_identifier, filename)
-
-        for t in spec.f_package_declaration.f_declarations:
-            if isinstance(t, lang.TypeDecl):
-                type_id = create_id(error, t.f_identifier, filename)
-                identifier = ID(package_id * type_id, location=type_id.location)
-                if t.f_definition.kind_name != "MessageTypeDef" and t.f_parameters:
-                    error.extend(
-                        [
-                            ErrorEntry(
-                                "only message types can be parameterized",
-                                Severity.ERROR,
-                                node_location(t.f_parameters.f_parameters, filename),
-                            ),
-                        ],
-                    )
-                validate_handler(
-                    error,
-                    "definition",
-                    t.f_definition,
-                    list(handlers.keys()),
-                    filename,
-                )
-                new_type = handlers[t.f_definition.kind_name](
-                    error,
-                    identifier,
-                    t.f_definition,
-                    filename,
-                    t.f_parameters,
+            model.UncheckedTypeDecl | None,
+        ],
+    ] = {
+        "SequenceTypeDef": create_sequence,
+        "ModularTypeDef": create_modular,
+        "RangeTypeDef": create_range,
+        "UnsignedTypeDef": create_unsigned,
+        "MessageTypeDef": create_message,
+        "NullMessageTypeDef": create_null_message,
+        "TypeDerivationDef": create_derived_message,
+        "EnumerationTypeDef": create_enumeration,
+    }
+    logging.info("Processing {name}", name=spec.f_package_declaration.f_identifier.text)
+    package_id = create_id(error, spec.f_package_declaration.f_identifier, filename)
+
+    for t in spec.f_package_declaration.f_declarations:
+        if isinstance(t, lang.TypeDecl):
+            type_id = create_id(error, t.f_identifier, filename)
+            identifier = ID(package_id * type_id, location=type_id.location)
+            if t.f_definition.kind_name != "MessageTypeDef" and t.f_parameters:
+                error.extend(
+                    [
+                        ErrorEntry(
+                            "only message types can be parameterized",
+                            Severity.ERROR,
+                            node_location(t.f_parameters.f_parameters, filename),
+                        ),
+                    ],
                 )
-                if new_type is not None:
-                    declarations.append(new_type)
-            elif isinstance(t, lang.RefinementDecl):
-                declarations.append(create_refinement(error, t, package_id, filename))
-            elif isinstance(t, lang.StateMachineDecl):
-                declarations.append(create_state_machine(error, t, package_id, filename))
-            elif isinstance(t, lang.SessionDecl):
-                add_error_for_deprecated_session(error, t, filename)
-            else:
-                raise NotImplementedError(f"Declaration kind {t.kind_name} unsupported")
+            validate_handler(
+                error,
+                "definition",
+                t.f_definition,
+                list(handlers.keys()),
+                filename,
+            )
+            new_type = handlers[t.f_definition.kind_name](
+                error,
+                identifier,
+                t.f_definition,
+                filename,
+                t.f_parameters,
+            )
+            if new_type is not None:
+                declarations.append(new_type)
+        elif isinstance(t, lang.RefinementDecl):
+            declarations.append(create_refinement(error, t, package_id, filename))
+        elif isinstance(t, lang.StateMachineDecl):
+            declarations.append(create_state_machine(error, t, package_id, filename))
+        elif isinstance(t, lang.SessionDecl):
+            add_error_for_deprecated_session(error, t, filename)
+        else:
+            raise NotImplementedError(f"Declaration kind {t.kind_name} unsupported")
+
+
+def _parse_unit(
+    filename: Path,
+    source: str,
+) -> tuple[lang.Specification | None, frozenset[const.StyleCheck], RecordFluxError]:
+    """
+    Parse the source of a specification file and check its style.
+
+    The returned error contains the entries of the style checks followed by the syntax errors. No
+    specification is returned if the file contains syntax errors.
+    """
+    unit = lang.AnalysisContext().get_from_buffer(str(filename), source)
+
+    error = RecordFluxError()
+    basic_style_checks, model_style_checks = style.determine_enabled_checks(
+        error,
+        source,
+        filename,
+    )
+    error.extend(style.check(filename, basic_style_checks).entries)
+
+    if diagnostics_to_error(unit.diagnostics, error, filename):
+        return None, model_style_checks, error
+
+    assert isinstance(unit.root, lang.Specification)
+
+    return unit.root, model_style_checks, error
+
+
+def _parse_specification(filename: Path, source: str) -> CachedSpecification | list[ErrorEntry]:
+    """
+    Parse and evaluate a specification file in a worker process.
+
+    The syntax tree cannot be transferred between processes. Instead, the evaluated declarations
+    are returned in the same form as stored in the parse cache. If the file contains syntax errors,
+    only the error entries are returned.
+    """
+    unit, model_style_checks, style_error = _parse_unit(filename, source)
+
+    if unit is None:
+        return style_error.entries
+
+    creation_error = RecordFluxError()
+    spec = SpecificationFile.create(creation_error, unit, filename, model_style_checks)
+
+    evaluation_error = RecordFluxError()
+    declarations: list[model.UncheckedTopLevelDeclaration] = []
+    evaluate_specification(evaluation_error, declarations, unit, filename)
+
+    return CachedSpecification(
+        spec.package,
+        spec.context_clauses,
+        model_style_checks,
+        style_error.entries,
+        creation_error.entries,
+        declarations,
+        evaluation_error.entries,
+    )
 
 
 def _check_for_duplicate_specifications(
@@ -2049,12 +2283,12 @@ def _check_for_duplicate_specifications(
                         ErrorEntry(
                             "duplicate specification",
                             Severity.ERROR,
-                            node_location(n2.spec.f_package_declaration.f_identifier, n2.filename),
+                            n2.package.location,
                         ),
                         ErrorEntry(
                             "previous specification",
                             Severity.NOTE,
-                            node_location(n1.spec.f_package_declaration.f_identifier, n1.filename),
+                            n1.package.location,
                         ),
                     ],
                 )
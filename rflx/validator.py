@@ -3,9 +3,11 @@ from __future__ import annotations
 import importlib
 import json
 from collections import defaultdict
-from collections.abc import Iterable, Mapping, Sequence
-from dataclasses import dataclass
-from itertools import product
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from itertools import product, repeat
 from pathlib import Path
 from types import TracebackType
 from typing import TextIO
@@ -14,6 +16,7 @@ from ruamel.yaml.main import YAML
 from typing_extensions import Self
 
 from rflx import expr, expr_proof
+from rflx.const import MP_CONTEXT
 from rflx.identifier import ID, StrID
 from rflx.model import (
     AlwaysVerify,
@@ -21,12 +24,14 @@ from rflx.model import (
     Link,
     Message,
     Model,
+    NeverVerify,
     Refinement,
     Sequence as SequenceDecl,
     TypeDecl,
 )
 from rflx.pyrflx import ChecksumFunction, Package, PyRFLX, PyRFLXError
 from rflx.pyrflx.typevalue import MessageValue
+from rflx.rapidflux import logging
 from rflx.specification import Parser
 
 
@@ -37,9 +42,14 @@ class Validator:
         checksum_module: str | None = None,
         cache: Cache | None = None,
         split_disjunctions: bool = False,
+        workers: int = 1,
     ):
+        self._files = [Path(f) for f in files]
+        self._checksum_module = checksum_module
+        self._split_disjunctions = split_disjunctions
+        self._workers = workers
         model = self._create_model(
-            [Path(f) for f in files],
+            self._files,
             AlwaysVerify() if cache is None else cache,
             split_disjunctions,
         )
@@ -102,39 +112,28 @@ class Validator:
 
         incorrectly_classified = 0
         coverage_info = CoverageInformation(list(self._pyrflx), coverage)
-
-        paths = [
-            *[(p, True) for p in paths_valid or []],
-            *[(p, False) for p in paths_invalid or []],
-        ]
-
-        with OutputWriter(json_output) as output_writer:
-            for provided_path, is_valid in paths:
-                if provided_path.is_dir():
-                    files = sorted(provided_path.glob("*.raw"))
-                    if not files:
+        samples = self._collect_samples(paths_valid, paths_invalid)
+
+        with OutputWriter(json_output) as output_writer, closing(
+            self._validate_messages(
+                message_identifier,
+                message_value,
+                samples,
+                json_output is not None,
+                coverage,
+            ),
+        ) as validation_results:
+            for validation_result in validation_results:
+                coverage_info.merge(validation_result.covered_links)
+                validation_result.print_console_output()
+                output_writer.write_result(validation_result)
+                if not validation_result.validation_success:
+                    incorrectly_classified += 1
+                    if abort_on_error:
                         raise ValidationError(
-                            f"{provided_path} contains no files with a .raw file extension, please "
-                            "provide a directory with .raw files or a list of individual files with"
-                            " any extension",
+                            f"aborted: message {validation_result.message_path} was classified"
+                            " incorrectly",
                         )
-                else:
-                    files = [provided_path]
-                for path in files:
-                    validation_result = self._validate_message(
-                        path,
-                        is_valid,
-                        message_value,
-                    )
-                    coverage_info.update(validation_result.parsed_message)
-                    validation_result.print_console_output()
-                    output_writer.write_result(validation_result)
-                    if not validation_result.validation_success:
-                        incorrectly_classified += 1
-                        if abort_on_error:
-                            raise ValidationError(
-                                f"aborted: message {path} was classified incorrectly",
-                            )
             coverage_info.print_coverage()
 
         error_msgs = []
@@ -183,6 +182,76 @@ class Validator:
                 )
             raise ValidationError(f"output file already exists: {json_output}")
 
+    @staticmethod
+    def _collect_samples(
+        paths_valid: list[Path] | None,
+        paths_invalid: list[Path] | None,
+    ) -> list[tuple[Path, bool]]:
+        paths = [
+            *[(p, True) for p in paths_valid or []],
+            *[(p, False) for p in paths_invalid or []],
+        ]
+        samples = []
+
+        for provided_path, is_valid in paths:
+            if provided_path.is_dir():
+                files = sorted(provided_path.glob("*.raw"))
+                if not files:
+                    raise ValidationError(
+                        f"{provided_path} contains no files with a .raw file extension, please "
+                        "provide a directory with .raw files or a list of individual files with"
+                        " any extension",
+                    )
+            else:
+                files = [provided_path]
+            samples.extend((f, is_valid) for f in files)
+
+        return samples
+
+    def _validate_messages(
+        self,
+        message_identifier: ID,
+        message_value: MessageValue,
+        samples: Sequence[tuple[Path, bool]],
+        details: bool,
+        coverage: bool,
+    ) -> Generator[ValidationResult, None, None]:
+        """
+        Validate the given samples and return the results in the order of the samples.
+
+        If more than one worker is used, the samples are distributed among a pool of processes.
+        Each worker process creates its own model on startup, so that only the sample paths and
+        the results of the validation are transferred between the processes.
+        """
+        if self._workers <= 1 or len(samples) <= 1:
+            for path, is_valid in samples:
+                yield self._validate_message(path, is_valid, message_value, details, coverage)
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=MP_CONTEXT,
+            initializer=_initialize_worker,
+            initargs=(
+                self._files,
+                self._checksum_module,
+                self._split_disjunctions,
+                message_identifier,
+            ),
+        )
+        try:
+            yield from executor.map(
+                _validate_sample,
+                repeat(message_identifier),
+                [p for p, _ in samples],
+                [v for _, v in samples],
+                repeat(details),
+                repeat(coverage),
+                chunksize=max(1, len(samples) // (self._workers * 4)),
+            )
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def _create_model(
         self,
         files: Sequence[Path],
@@ -331,7 +400,16 @@ class Validator:
         message_path: Path,
         valid_original_message: bool,
         message_value: MessageValue,
+        details: bool = True,
+        coverage: bool = False,
     ) -> ValidationResult:
+        """
+        Validate a single sample.
+
+        The serialized message and the field values of the parsed message are only determined if
+        `details` is true. The links covered by the parsed message are only determined if
+        `coverage` is true.
+        """
         if not message_path.is_file():
             raise ValidationError(f"{message_path} is not a regular file")
 
@@ -365,18 +443,25 @@ class Validator:
 
         return ValidationResult(
             valid_original_message == valid_parser_result,
-            parsed_message,
             parser_error,
             message_path,
             original_message,
             valid_original_message,
             valid_parser_result,
+            (
+                parsed_message.bytestring
+                if details and parsed_message.valid_message
+                else None
+            ),
+            parsed_message.as_json() if details else None,
+            CoverageInformation.covered_links(parsed_message) if coverage else {},
         )
 
 
 class CoverageInformation:
     def __init__(self, packages: Sequence[Package], coverage: bool) -> None:
         self._total_message_coverage: dict[ID, dict[Link, bool]] = {}
+        self._links: dict[ID, list[Link]] = {}
         self._spec_files: dict[str, list[ID]] = defaultdict(list)
         self._coverage = coverage
 
@@ -389,6 +474,7 @@ class CoverageInformation:
                 self._total_message_coverage[message.identifier] = {
                     link: False for link in message.model.structure
                 }
+                self._links[message.identifier] = list(message.model.structure)
 
                 assert message.model.location.source is not None
                 file_name = message.model.location.source.name
@@ -401,12 +487,31 @@ class CoverageInformation:
 
     def update(self, message_value: MessageValue) -> None:
         if self._coverage:
-            messages = [*message_value.inner_messages(), message_value]
-            for message in messages:
-                for link in message.path:
-                    if not self._total_message_coverage[message.identifier][link]:
+            self.merge(self.covered_links(message_value))
+
+    def merge(self, covered_links: Mapping[ID, Iterable[int]]) -> None:
+        """
+        Add covered links to the coverage information.
+
+        The links of a message are given by their index in the structure of the message.
+        """
+        if self._coverage:
+            for identifier, indices in covered_links.items():
+                message_coverage = self._total_message_coverage[identifier]
+                for index in indices:
+                    link = self._links[identifier][index]
+                    if not message_coverage[link]:
                         self.total_covered_links += 1
-                        self._total_message_coverage[message.identifier][link] = True
+                        message_coverage[link] = True
+
+    @staticmethod
+    def covered_links(message_value: MessageValue) -> dict[ID, set[int]]:
+        """Return the indices of all links on the paths of a message and its inner messages."""
+        result: dict[ID, set[int]] = defaultdict(set)
+        for message in [*message_value.inner_messages(), message_value]:
+            indices = {link: i for i, link in enumerate(message.model.structure)}
+            result[message.identifier].update(indices[link] for link in message.path)
+        return dict(result)
 
     def file_total_links(self, file_name: str) -> int:
         assert file_name in self._spec_files
@@ -477,13 +582,22 @@ class CoverageInformation:
 
 @dataclass
 class ValidationResult:
+    """
+    Result of the validation of a single sample.
+
+    The result contains only plain data and can be transferred between processes. Instead of the
+    parsed message, the serialized message and the field values are contained.
+    """
+
     validation_success: bool
-    parsed_message: MessageValue
     parser_error: str | None
     message_path: Path
     original_message: bytes
     valid_original_message: bool
     valid_parser_result: bool
+    parsed_bytes: bytes | None = None
+    parsed_fields: object = None
+    covered_links: dict[ID, set[int]] = field(default_factory=dict)
 
     def as_json(self) -> dict[str, object]:
         output = {
@@ -492,9 +606,9 @@ class ValidationResult:
             "recognized as": self.valid_parser_result,
             "original": self.original_message.hex(),
         }
-        if self.parsed_message.valid_message:
-            output["parsed"] = self.parsed_message.bytestring.hex()
-        output["parsed fields"] = self.parsed_message.as_json()
+        if self.parsed_bytes is not None:
+            output["parsed"] = self.parsed_bytes.hex()
+        output["parsed fields"] = self.parsed_fields
         if self.parser_error is not None:
             output["error"] = self.parser_error
 
@@ -555,3 +669,43 @@ class OutputWriter:
 
 class ValidationError(Exception):
     pass
+
+
+class _VerifiedCache(NeverVerify):
+    """Cache for models which have already been verified by the main process."""
+
+    def __init__(self) -> None:
+        super().__init__(warn_skipped=False)
+
+
+# Message prototypes of a worker process, which are created once by the initializer of the process
+_WORKER_MESSAGES: dict[ID, MessageValue] = {}
+
+
+def _initialize_worker(
+    files: Sequence[Path],
+    checksum_module: str | None,
+    split_disjunctions: bool,
+    message_identifier: ID,
+) -> None:
+    logging.set_quiet(True)
+    validator = Validator(files, checksum_module, _VerifiedCache(), split_disjunctions)
+    _WORKER_MESSAGES[message_identifier] = validator._pyrflx.package(  # noqa: SLF001
+        message_identifier.parent,
+    ).new_message(message_identifier.name)
+
+
+def _validate_sample(
+    message_identifier: ID,
+    path: Path,
+    is_valid: bool,
+    details: bool,
+    coverage: bool,
+) -> ValidationResult:
+    return Validator._validate_message(  # noqa: SLF001
+        path,
+        is_valid,
+        _WORKER_MESSAGES[message_identifier],
+        details,
+        coverage,
+    )
@@ -0,0 +1,36 @@
+from hypothesis import given, strategies as st
+
+from rflx.pyrflx import InternetChecksum
+
+
+@st.composite
+def changed_messages(
+    draw: st.DrawFn,
+) -> tuple[bytes, bytes, list[tuple[int, int]], dict[str, tuple[int, int]]]:
+    size = draw(st.integers(min_value=1, max_value=32))
+    message = st.one_of(
+        st.just(bytes(size)),
+        st.binary(min_size=size, max_size=size),
+    )
+    old = draw(message)
+    new = draw(message)
+    changes = [(i, i + 1) for i in range(size) if old[i] != new[i]]
+    bounds = sorted(draw(st.sets(st.integers(min_value=0, max_value=size), min_size=2)))
+    ranges = {
+        f"Range_{i}": (first * 8, last * 8 - 1)
+        for i, (first, last) in enumerate(zip(bounds[::2], bounds[1::2]))
+        if first < last
+    }
+    return old, new, changes, ranges
+
+
+@given(changed_messages())
+def test_internet_checksum_update(
+    message: tuple[bytes, bytes, list[tuple[int, int]], dict[str, tuple[int, int]]],
+) -> None:
+    old, new, changes, ranges = message
+    function = InternetChecksum()
+    assert function.update(function(old, **ranges), old, new, changes, **ranges) == function(
+        new,
+        **ranges,
+    )
@@ -42,6 +42,7 @@ def validator_mock(
     checksum_module: str | None = None,  # noqa: ARG001
     cache: object | None = None,  # noqa: ARG001
     split_disjunctions: bool = False,  # noqa: ARG001
+    workers: int = 1,  # noqa: ARG001
 ) -> None:
     return None
 
@@ -91,6 +92,33 @@ def test_main_check() -> None:
     assert cli.main(["rflx", "check", MESSAGE_SPEC_FILE, STATE_MACHINE_SPEC_FILE]) == 0
 
 
+def test_main_check_cache_stats(capfd: pytest.CaptureFixture[str]) -> None:
+    assert cli.main(["rflx", "--no-caching", "--cache-stats", "check", MESSAGE_SPEC_FILE]) == 0
+    assert re.search(
+        r"^Cache statistics \(specifications\): disabled\n"
+        r"Cache statistics \(verification\): disabled\n"
+        r"Cache statistics \(proofs\): disabled\n"
+        r"Process pool statistics: \d+ starts, \d+ reuses, \d+\.\d\d s startup time,"
+        r" \d+\.\d\d s saved$",
+        capfd.readouterr().out,
+        re.MULTILINE,
+    )
+
+
+def test_main_check_cache_stats_error(capfd: pytest.CaptureFixture[str]) -> None:
+    assert cli.main(["rflx", "--cache-stats", "check", "non-existent file"]) == 1
+    assert re.search(r"^Process pool statistics: ", capfd.readouterr().out, re.MULTILINE)
+
+
+def test_print_cache_statistics(tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    cli.print_cache_statistics(cli.Cache(tmp_path / "verification.sqlite", record_statistics=True))
+    assert capfd.readouterr().out == (
+        "Cache statistics (specifications): 0 hits, 0 misses\n"
+        "Cache statistics (verification): 0 hits, 0 misses\n"
+        "Cache statistics (proofs): 0 hits, 0 misses\n"
+    )
+
+
 def test_main_check_quiet() -> None:
     assert cli.main(["rflx", "-q", "check", MESSAGE_SPEC_FILE, STATE_MACHINE_SPEC_FILE]) == 0
     assert cli.main(["rflx", "--quiet", "check", MESSAGE_SPEC_FILE, STATE_MACHINE_SPEC_FILE]) == 0
@@ -1,6 +1,6 @@
 import pytest
 
-from rflx.common import Base, verbose_repr
+from rflx.common import Base, CacheStatistics, verbose_repr
 
 
 class C1(Base):
@@ -14,6 +14,13 @@ class C2(C1):
         self._data2 = data2
 
 
+class C3(Base):
+    __slots__ = ("data",)
+
+    def __init__(self, data: int) -> None:
+        self.data = data
+
+
 @pytest.mark.parametrize(("left", "right"), [(C1(1), C1(1)), (C2(2, 2), C2(2, 2))])
 def test_base_compare_equal(left: Base, right: Base) -> None:
     assert left == right
@@ -37,5 +44,17 @@ def test_base_repr(monkeypatch: pytest.MonkeyPatch) -> None:
     assert repr(C2(1, {2: 3, 4: 5})) == "\n    C2(\n        data=1,\n        _data2={2: 3, 4: 5})"
 
 
+def test_base_repr_slots(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RFLX_TESTING", "")
+
+    assert not hasattr(C3(1), "__dict__")
+    assert repr(C3(1)) == "\n    C3(\n        data=1)"
+
+
 def test_verbose_repr() -> None:
     assert verbose_repr(1, []) == "\n    int(\n    )\n    # 1\n    "
+
+
+def test_cache_statistics_str() -> None:
+    assert str(CacheStatistics()) == "0 hits, 0 misses"
+    assert str(CacheStatistics(2, 1)) == "2 hits, 1 misses"
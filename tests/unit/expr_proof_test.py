@@ -1,9 +1,10 @@
 from collections.abc import Callable
+from pathlib import Path
 
 import pytest
 import z3
 
-from rflx import ty
+from rflx import proof_cache, ty
 from rflx.expr import (
     FALSE,
     TRUE,
@@ -38,8 +39,16 @@ from rflx.expr import (
     Sub,
     Variable,
 )
-from rflx.expr_proof import Proof, ProofResult, Z3TypeError, _to_z3
-from rflx.rapidflux import Location
+from rflx.expr_proof import (
+    ParallelProofs,
+    PathProofs,
+    Proof,
+    ProofResult,
+    Z3TypeError,
+    _to_z3,
+)
+from rflx.proof_cache import Outcome, ProofCache
+from rflx.rapidflux import ErrorEntry, Location, RecordFluxError, Severity
 from tests.utils import assert_equal
 
 
@@ -56,6 +65,82 @@ def test_proof_invalid_logic() -> None:
     ]
 
 
+def test_proof_cached(tmp_path: Path) -> None:
+    goal = Greater(Variable("X"), Number(10))
+    facts = [
+        Less(Variable("X"), Number(5), location=Location((1, 2))),
+        Greater(Variable("X"), Number(0), location=Location((3, 4))),
+    ]
+    key, _ = proof_cache.key("QF_NIA", _to_z3(goal), [_to_z3(f) for f in facts])
+    cache = ProofCache(tmp_path / "proofs.sqlite")
+
+    with proof_cache.active(cache):
+        p = Proof(goal, facts)
+        assert p.result == ProofResult.UNSAT
+        assert cache.get(key) == Outcome("UNSAT")
+        error = p.error
+        outcome = cache.get(key)
+        assert outcome is not None
+        assert outcome.core is not None
+
+        p = Proof(goal, list(reversed(facts)))
+        assert p.result == ProofResult.UNSAT
+        assert sorted(p.error, key=lambda e: e[0]) == sorted(error, key=lambda e: e[0])
+
+        cache.add(key, Outcome("UNKNOWN", "cached"))
+        p = Proof(goal, facts)
+        assert p.result == ProofResult.UNKNOWN
+        assert p.error == [("cached", goal.location)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_path_proofs(workers: int) -> None:
+    x = Variable("X")
+    y = Variable("Y")
+    path_proofs = PathProofs(
+        [
+            [Greater(x, Number(0))],
+            [Less(x, Number(0))],
+            [Greater(x, Number(5))],
+            [Equal(y, x)],
+        ],
+        [Greater(y, Number(1))],
+        workers,
+    )
+
+    for path in [(0,), (1,), (0, 1), (0, 2), (1, 2), (0, 1, 3), (0, 2, 3)]:
+        path_proofs.add_path(path)
+
+    assert path_proofs.check() == {(0,), (1,), (0, 2), (0, 2, 3)}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_path_proofs_goals(workers: int) -> None:
+    x = Variable("X")
+    path_proofs = PathProofs(
+        [[Greater(x, Number(0))], [Less(x, Number(0))], [Greater(x, Number(5))]],
+        [],
+        workers,
+    )
+    proofs = ParallelProofs(workers)
+
+    def error(message: str) -> list[ErrorEntry]:
+        return [ErrorEntry(message, Severity.ERROR, Location((1, 1)))]
+
+    path_proofs.add((0, 2), Less(x, Number(3)), [], sat_error=error("A"))
+    path_proofs.add((0,), Greater(x, Number(3)), [], sat_error=error("B"))
+    path_proofs.add((0, 1), Greater(x, Number(3)), [], sat_error=error("C"))
+    path_proofs.add((1,), Less(x, Number(3)), [], unsat_error=error("D"))
+    path_proofs.add((1,), Greater(x, Number(-1)), [Less(x, Number(-3))], unsat_error=error("E"))
+
+    assert path_proofs.check(proofs) == set()
+
+    result = RecordFluxError()
+    proofs.check(result)
+
+    assert [e.message for e in result.entries] == ["B", "E"]
+
+
 def test_to_z3_true() -> None:
     assert _to_z3(TRUE) == z3.BoolVal(val=True)
 
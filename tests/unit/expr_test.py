@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+import pickle
 import textwrap
 from collections.abc import Callable, Mapping
 
@@ -622,6 +623,46 @@ def test_number_hashable() -> None:
     assert {Number(1), Number(2)}
 
 
+def test_expr_hash() -> None:
+    assert hash(First("X")) == hash(First("X"))
+    assert hash(Add(Variable("X"), Number(1))) == hash(Add(Variable("X"), Number(1)))
+    assert hash(Size("X")) != hash(Size("Y"))
+    assert hash(Size("X")) != hash(First("X"))
+
+
+def test_expr_mapping() -> None:
+    mapping: dict[Expr, Expr] = {
+        First("X"): Number(0),
+        Last("X"): Number(7),
+        Size("X"): Number(8),
+        Size("Y"): Number(16),
+        Add(Last("X"), Number(1)): Number(8),
+    }
+    assert len(mapping) == 5
+    assert mapping[Size("Y")] == Number(16)
+    assert mapping[Add(Last("X"), Number(1))] == Number(8)
+    assert Add(Last("X"), Number(2)) not in mapping
+
+
+def test_expr_eq_identity() -> None:
+    expression = Add(Variable("X"), Number(1))
+    equal = Add(Variable("X"), Number(1))
+    assert expression == expression  # noqa: PLR0124
+    assert expression == equal
+    assert hash(expression) == hash(equal)
+    assert expression != Add(Variable("X"), Number(2))
+
+
+def test_expr_hash_pickle() -> None:
+    expression = Add(Variable("X"), Number(1))
+    hash(expression)
+    copy = pickle.loads(pickle.dumps(expression))
+    # The hash of a string depends on the process, so that a cached hash must not be transferred
+    assert not hasattr(copy, "_hash")
+    assert copy == expression
+    assert hash(copy) == hash(expression)
+
+
 @pytest.mark.parametrize("operation", [Add, Mul, Sub, Div, Pow])
 def test_math_expr_type(operation: Callable[[Expr, Expr], Expr]) -> None:
     assert_type(
@@ -1,33 +1,86 @@
+import json
+import os
 import re
+import sqlite3
 from pathlib import Path
 
 import pytest
 
 from rflx import expr, model
+from rflx.common import CacheStatistics
 from rflx.identifier import ID
 from rflx.model import cache
-from rflx.rapidflux import Location, RecordFluxError
+from rflx.rapidflux import Location
 from tests.data import models
 from tests.utils import assert_stderr_regex
 
 
 def test_init(tmp_path: Path) -> None:
-    file = tmp_path / "test.json"
+    file = tmp_path / "test.sqlite"
     cache.Cache(file)
     assert not file.exists()
 
 
-def test_init_valid(tmp_path: Path) -> None:
-    file = tmp_path / "test.json"
-    file.write_text("{}")
-    cache.Cache(file)
+def test_init_invalid(tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    file = tmp_path / "test.sqlite"
+    file.write_text("invalid")
+    c = cache.Cache(file)
+    assert not c._verified  # noqa: SLF001
+    assert_stderr_regex(
+        r"^warning: verification cache will be ignored due to error: .*$",
+        capfd,
+    )
+
+
+def test_migration(tmp_path: Path) -> None:
+    d = cache.Digest(models.tlv_message())
+    assert d.value
+    legacy_file = tmp_path / "test.json"
+    legacy_file.write_text(f'{{"{d.key}": ["{d.value}"]}}')
+    assert cache.Cache(tmp_path / "test.sqlite").is_verified(d)
+    assert not legacy_file.exists()
+    assert cache.Cache(tmp_path / "test.sqlite").is_verified(d)
+
+
+def test_migration_failed(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    d = cache.Digest(models.tlv_message())
+    assert d.value
+    legacy_file = tmp_path / "test.json"
+    legacy_file.write_text(f'{{"{d.key}": ["{d.value}"]}}')
+    legacy_file.with_suffix(".lock").touch()
+
+    def connect(_: cache.Cache) -> sqlite3.Connection:
+        raise sqlite3.OperationalError("disk I/O error")
+
+    with monkeypatch.context() as m:
+        m.setattr(cache.Cache, "_connect", connect)
+        assert not cache.Cache(tmp_path / "test.sqlite").is_verified(d)
+
+    assert_stderr_regex(
+        r"^warning: verification cache could not be updated: disk I/O error$",
+        capfd,
+    )
+    assert legacy_file.exists()
+    assert legacy_file.with_suffix(".lock").exists()
+    assert cache.Cache(tmp_path / "test.sqlite").is_verified(d)
+    assert not legacy_file.exists()
+    assert not legacy_file.with_suffix(".lock").exists()
 
 
 @pytest.mark.parametrize("content", ["invalid", "[]", "{A: B}"])
-def test_init_invalid(content: str, tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
-    file = tmp_path / "test.json"
-    file.write_text(content)
-    cache.Cache(file)
+def test_migration_invalid(
+    content: str,
+    tmp_path: Path,
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    legacy_file = tmp_path / "test.json"
+    legacy_file.write_text(content)
+    cache.Cache(tmp_path / "test.sqlite")
+    assert not legacy_file.exists()
     assert_stderr_regex(
         r"^"
         r"warning: verification cache will be ignored due to invalid format:\n"
@@ -37,6 +90,18 @@ def test_init_invalid(content: str, tmp_path: Path, capfd: pytest.CaptureFixture
     )
 
 
+def test_proofs(tmp_path: Path) -> None:
+    assert cache.Cache(tmp_path / "test.sqlite").proofs is not None
+    assert cache.AlwaysVerify().proofs is None
+    assert cache.NeverVerify().proofs is None
+
+
+def test_specifications(tmp_path: Path) -> None:
+    assert cache.Cache(tmp_path / "test.sqlite").specifications is not None
+    assert cache.AlwaysVerify().specifications is None
+    assert cache.NeverVerify().specifications is None
+
+
 def test_verified(tmp_path: Path) -> None:
     m1 = model.Message(
         ID("P::M", Location((1, 1))),
@@ -83,7 +148,7 @@ def test_verified(tmp_path: Path) -> None:
         location=Location((1, 1), end=(1, 2)),
     )
     d3 = cache.Digest(m3)
-    c = cache.Cache(tmp_path / "test.json")
+    c = cache.Cache(tmp_path / "test.sqlite")
     assert not c.is_verified(d1)
     assert not c.is_verified(d2)
     assert not c.is_verified(d3)
@@ -105,6 +170,72 @@ def test_verified(tmp_path: Path) -> None:
     assert c.is_verified(d3)
 
 
+def test_statistics(tmp_path: Path) -> None:
+    d = cache.Digest(models.tlv_message())
+    c = cache.Cache(tmp_path / "test.sqlite")
+    assert c.statistics() == CacheStatistics(0, 0)
+    assert not c.is_verified(d)
+    c.add_verified(d)
+    assert c.is_verified(d)
+    assert c.statistics() == CacheStatistics(0, 1)
+    assert cache.Cache(tmp_path / "test.sqlite").statistics() == CacheStatistics(0, 0)
+    c.flush()
+    c = cache.Cache(tmp_path / "test.sqlite")
+    assert c.is_verified(d)
+    assert c.is_verified(d)
+    assert c.statistics() == CacheStatistics(1, 0)
+    assert cache.AlwaysVerify().statistics() is None
+    assert cache.NeverVerify().statistics() is None
+
+
+def test_flush(tmp_path: Path) -> None:
+    d = cache.Digest(models.tlv_message())
+    c = cache.Cache(tmp_path / "test.sqlite")
+    c.add_verified(d)
+    assert not cache.Cache(tmp_path / "test.sqlite").is_verified(d)
+    assert c.flush()
+    assert cache.Cache(tmp_path / "test.sqlite").is_verified(d)
+
+
+def test_flush_failed(tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    d = cache.Digest(models.tlv_message())
+    c = cache.Cache(tmp_path / "test.sqlite")
+    c.add_verified(d)
+    (tmp_path / "test.sqlite").write_text("invalid")
+    assert not c.flush()
+    assert_stderr_regex(r"^warning: verification cache could not be updated: .*$", capfd)
+    (tmp_path / "test.sqlite").unlink()
+    assert c.flush()
+    assert cache.Cache(tmp_path / "test.sqlite").is_verified(d)
+
+
+def test_concurrent_writers(tmp_path: Path) -> None:
+    d1 = cache.Digest(models.tlv_message())
+    d2 = cache.Digest(models.ethernet_frame())
+    c1 = cache.Cache(tmp_path / "test.sqlite")
+    c2 = cache.Cache(tmp_path / "test.sqlite")
+    c1.add_verified(d1)
+    c2.add_verified(d2)
+    c2.flush()
+    c1.flush()
+    c = cache.Cache(tmp_path / "test.sqlite")
+    assert c.is_verified(d1)
+    assert c.is_verified(d2)
+
+
+def test_digest_summarized_paths() -> None:
+    message = models.tlv_message()
+    summarized = model.Message(
+        message.identifier,
+        message.structure,
+        message.types,
+        location=message.location,
+        skip_verification=True,
+        summarize_paths=True,
+    )
+    assert cache.Digest(summarized).value != cache.Digest(message).value
+
+
 def test_always_verify() -> None:
     d = cache.Digest(models.tlv_message())
     c = cache.AlwaysVerify()
@@ -113,6 +244,14 @@ def test_always_verify() -> None:
     assert not c.is_verified(d)
 
 
+def test_never_verify_without_warning(capfd: pytest.CaptureFixture[str]) -> None:
+    c = cache.NeverVerify(warn_skipped=False)
+    assert c.is_verified(cache.Digest(models.tlv_message()))
+    assert c.proofs is None
+    assert c.specifications is None
+    assert capfd.readouterr().err == ""
+
+
 def test_never_verify() -> None:
     d = cache.Digest(models.tlv_message())
     c = cache.NeverVerify()
@@ -121,31 +260,41 @@ def test_never_verify() -> None:
     assert c.is_verified(d)
 
 
-@pytest.mark.timeout(2)
-@pytest.mark.parametrize("load", [True, False])
-def test_cache_timeout(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, load: bool) -> None:
-    cache_path = tmp_path / "cache_path.json"
-    lock_file = cache_path.with_suffix(".lock")
-    lock_file.write_text("42")
-    monkeypatch.setattr(cache.FileLock, "LOCK_TIMEOUT", 0.1)
-    expected_regex = (
-        "^error: failed to acquire cache lock after 0.1 seconds\n"
-        'note: the cache is locked by a process with a PID of "42"\n'
-        "help: if the process that owns the lock isn't active anymore, deleting "
-        f'"{lock_file}" will solve this issue$'
-    )
+def test_fingerprint(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cache, "dependencies", lambda: ["A 1.0"])
+    package = tmp_path / "rflx"
+    (package / "model").mkdir(parents=True)
+    (package / "pyrflx").mkdir()
+    (package / "__init__.py").write_text("A")
+    (package / "model" / "__init__.py").write_text("B")
+    (package / "pyrflx" / "__init__.py").write_text("C")
+    stamp_file = tmp_path / "cache" / "fingerprint.json"
+
+    fingerprint = cache._fingerprint(package, stamp_file)  # noqa: SLF001
+    assert not stamp_file.exists()
+
+    stamp_file.parent.mkdir()
+    assert cache._fingerprint(package, stamp_file) == fingerprint  # noqa: SLF001
+    stamp = json.loads(stamp_file.read_text())
+    assert stamp["fingerprint"] == fingerprint
+    assert sorted(stamp["files"]) == [".", "__init__.py", "model", "model/__init__.py"]
+
+    # The stored fingerprint is used as long as no relevant file has changed
+    stamp["fingerprint"] = "X"
+    stamp_file.write_text(json.dumps(stamp))
+    (package / "pyrflx" / "__init__.py").write_text("CC")
+    assert cache._fingerprint(package, stamp_file) == "X"  # noqa: SLF001
 
-    def _patched_cache_init(self: cache.Cache, file: Path) -> None:
-        self._file = file
-        self._verified = {}
+    (package / "model" / "__init__.py").write_text("BB")
+    modified = cache._fingerprint(package, stamp_file)  # noqa: SLF001
+    assert modified not in [fingerprint, "X"]
+    assert cache._fingerprint(package, stamp_file) == modified  # noqa: SLF001
 
-    # Prevent the constructor to call _load_cache itself.
-    monkeypatch.setattr(cache.Cache, "__init__", _patched_cache_init)
-    c = cache.Cache(cache_path)
+    (package / "model" / "message.py").write_text("D")
+    os.utime(package / "model", ns=(0, 0))
+    added = cache._fingerprint(package, stamp_file)  # noqa: SLF001
+    assert added not in [fingerprint, modified]
 
-    if load:
-        with pytest.raises(RecordFluxError, match=expected_regex):
-            c._load_cache()  # noqa: SLF001
-    else:
-        with pytest.raises(RecordFluxError, match=expected_regex):
-            c._write_cache()  # noqa: SLF001
+    monkeypatch.setattr(cache, "dependencies", lambda: ["A 2.0"])
+    updated = cache._fingerprint(package, stamp_file)  # noqa: SLF001
+    assert updated not in [fingerprint, modified, added]
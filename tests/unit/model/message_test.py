@@ -1938,6 +1938,79 @@ def test_no_valid_path() -> None:
     )
 
 
+def test_no_valid_path_summarized() -> None:
+    f1 = Field(ID("F1", Location((10, 5))))
+    f2 = Field(ID("F2", Location((11, 6))))
+    f3 = Field(ID("F3", Location((12, 7))))
+    structure = [
+        Link(INITIAL, Field(ID("F1", Location((10, 8))))),
+        Link(
+            f1,
+            Field(ID("F2", Location((11, 9)))),
+            condition=LessEqual(Variable("F1"), Number(80), Location((20, 2))),
+        ),
+        Link(
+            f1,
+            Field(ID("F3", Location((12, 10)))),
+            condition=Greater(Variable("F1"), Number(80), Location((21, 3))),
+        ),
+        Link(
+            f2,
+            Field(ID("F3", Location((13, 10)))),
+            condition=Greater(Variable("F1"), Number(80), Location((22, 4))),
+        ),
+        Link(f3, FINAL, condition=LessEqual(Variable("F1"), Number(80), Location((23, 5)))),
+    ]
+    types = {
+        f1: models.integer(),
+        f2: models.integer(),
+        f3: models.integer(),
+    }
+    with pytest.raises(
+        RecordFluxError,
+        match=(
+            r"^"
+            r'<stdin>:11:6: error: field "F2" has no satisfiable condition at any outgoing link\n'
+            r'<stdin>:12:7: error: field "F3" has no satisfiable condition at any outgoing link'
+            r"$"
+        ),
+    ):
+        Message(
+            ID("P::M", Location((1, 1))),
+            structure,
+            types,
+            location=Location((1, 1), end=(1, 2)),
+            summarize_paths=True,
+        )
+
+
+@pytest.mark.parametrize(
+    "create_message",
+    [
+        models.tlv_message,
+        models.ethernet_frame,
+        models.enumeration_message,
+        models.sequence_message,
+        models.expression_message,
+        models.fixed_size_message,
+    ],
+)
+def test_summarized_paths(create_message: abc.Callable[[], Message]) -> None:
+    message = create_message()
+    summarized = Message(
+        message.identifier,
+        message.structure,
+        message.types,
+        message.checksums,
+        message.byte_order,
+        location=message.location,
+        summarize_paths=True,
+    )
+    assert summarized.summarize_paths
+    assert summarized.structure == message.structure
+    assert not message.summarize_paths
+
+
 def test_invalid_path_1() -> None:
     f1 = Field(ID("F1", Location((20, 10))))
     structure = [
@@ -7,7 +7,7 @@ from pathlib import Path
 
 import pytest
 
-from rflx.expr import Equal, Number
+from rflx.expr import TRUE, Equal, Expr, Number
 from rflx.identifier import ID
 from rflx.model import (
     BOOLEAN,
@@ -567,7 +567,7 @@ def test_unchecked_model_checked(
     expected: list[Callable[[], TopLevelDeclaration]],
     tmp_path: Path,
 ) -> None:
-    cache = Cache(tmp_path / "test.json")
+    cache = Cache(tmp_path / "test.sqlite")
 
     declarations = [d() for d in expected]
 
@@ -730,9 +730,88 @@ def test_unchecked_model_checked_error(
     expect_cached: list[str],
     tmp_path: Path,
 ) -> None:
-    cache = Cache(tmp_path / "test.json")
+    cache = Cache(tmp_path / "test.sqlite")
 
     with pytest.raises(RecordFluxError, match=expected):
         UncheckedModel(unchecked, {}, RecordFluxError()).checked(cache=cache)
 
     assert list(cache._verified) == expect_cached  # noqa: SLF001
+
+
+def unchecked_message(identifier: str, condition: Expr = TRUE) -> UncheckedMessage:
+    return UncheckedMessage(
+        ID(identifier, Location((1, 1))),
+        [
+            Link(
+                INITIAL,
+                Field("F"),
+                size=Number(16, location=Location((1, 1))),
+                location=Location((1, 1)),
+            ),
+            Link(Field(ID("F", Location((2, 1)))), FINAL, condition, location=Location((2, 2))),
+        ],
+        [],
+        [(Field(ID("F", location=Location((1, 1)))), UNCHECKED_OPAQUE.identifier, [])],
+        None,
+        None,
+        location=Location((1, 1), end=(1, 2)),
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_unchecked_model_checked_concurrently(workers: int, tmp_path: Path) -> None:
+    cache = Cache(tmp_path / "test.sqlite")
+
+    assert UncheckedModel(
+        [UNCHECKED_OPAQUE, *[unchecked_message(f"P::M{i}") for i in range(3)]],
+        {},
+        RecordFluxError(),
+    ).checked(cache=cache, workers=workers) == Model(
+        [
+            OPAQUE,
+            *[
+                unchecked_message(f"P::M{i}").checked([OPAQUE], skip_verification=True)
+                for i in range(3)
+            ],
+        ],
+    )
+
+    assert list(cache._verified) == ["P::M0", "P::M1", "P::M2"]  # noqa: SLF001
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_unchecked_model_checked_concurrently_error(workers: int, tmp_path: Path) -> None:
+    cache = Cache(tmp_path / "test.sqlite")
+
+    with pytest.raises(
+        RecordFluxError,
+        match=(
+            r"^"
+            r"<stdin>:5:7: error: condition is always true\n"
+            r"<stdin>:5:7: error: proven to be always true\n"
+            r'<stdin>:5:7: note: unsatisfied "\(1 = 1\) = False"\n'
+            r"<stdin>:6:7: error: condition is always true\n"
+            r"<stdin>:6:7: error: proven to be always true\n"
+            r'<stdin>:6:7: note: unsatisfied "\(2 = 2\) = False"'
+            r"$"
+        ),
+    ):
+        UncheckedModel(
+            [
+                UNCHECKED_OPAQUE,
+                unchecked_message("P::M0"),
+                unchecked_message(
+                    "P::M1",
+                    Equal(Number(1), Number(1), location=Location((5, 7))),
+                ),
+                unchecked_message("P::M2"),
+                unchecked_message(
+                    "P::M3",
+                    Equal(Number(2), Number(2), location=Location((6, 7))),
+                ),
+            ],
+            {},
+            RecordFluxError(),
+        ).checked(cache=cache, workers=workers)
+
+    assert list(cache._verified) == ["P::M0", "P::M2"]  # noqa: SLF001
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+from pathlib import Path
+
+import pytest
+
+from rflx import parse_cache
+from rflx.common import CacheStatistics
+from rflx.parse_cache import ParseCache
+
+
+def test_key_dependent_on_file() -> None:
+    assert parse_cache.key(Path("a.rflx"), "package A is end A;", "X") == parse_cache.key(
+        Path("a.rflx"),
+        "package A is end A;",
+        "X",
+    )
+    assert parse_cache.key(Path("a.rflx"), "package A is end A;", "X") != parse_cache.key(
+        Path("b/a.rflx"),
+        "package A is end A;",
+        "X",
+    )
+    assert parse_cache.key(Path("a.rflx"), "package A is end A;", "X") != parse_cache.key(
+        Path("a.rflx"),
+        "package A is  end A;",
+        "X",
+    )
+    assert parse_cache.key(Path("a.rflx"), "package A is end A;", "X") != parse_cache.key(
+        Path("a.rflx"),
+        "package A is end A;",
+        "Y",
+    )
+
+
+def test_get_add(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path / "specifications", secret_file=tmp_path / "secret")
+
+    assert cache.get("A") is None
+
+    cache.add("A", (1, ["B"]))
+    cache.add("B", {"C": 2})
+
+    assert cache.get("A") == (1, ["B"])
+    assert cache.get("B") == {"C": 2}
+    assert ParseCache(
+        tmp_path / "specifications",
+        secret_file=tmp_path / "secret",
+    ).get("A") == (1, ["B"])
+    assert sorted(f.name for f in (tmp_path / "specifications").iterdir()) == [
+        "A.pickle",
+        "B.pickle",
+    ]
+
+
+def test_invalid_entry(tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    directory = tmp_path / "specifications"
+    directory.mkdir()
+    (directory / "A.pickle").write_text("invalid")
+    cache = ParseCache(directory, secret_file=tmp_path / "secret")
+
+    assert cache.get("A") is None
+    assert capfd.readouterr().err == (
+        "warning: ignoring entry of parse cache which cannot be authenticated: "
+        f'"{directory / "A.pickle"}"\n'
+    )
+
+    cache.add("A", 1)
+
+    assert cache.get("A") == 1
+
+
+def test_statistics(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path / "specifications", secret_file=tmp_path / "secret")
+
+    assert cache.statistics() == CacheStatistics(0, 0)
+
+    cache.get("A")
+    cache.add("A", 1)
+    cache.get("A")
+    cache.get("A")
+
+    assert cache.statistics() == CacheStatistics(2, 1)
+
+
+def test_unpicklable_value(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path / "specifications", secret_file=tmp_path / "secret")
+
+    cache.add("A", threading.Lock())
+
+    assert cache.get("A") is None
+    assert not (tmp_path / "specifications").exists()
+
+
+def test_eviction(tmp_path: Path) -> None:
+    directory = tmp_path / "specifications"
+    cache = ParseCache(directory, capacity=2, secret_file=tmp_path / "secret")
+
+    for i in range(parse_cache._EVICTION_INTERVAL - 1):  # noqa: SLF001
+        cache.add(str(i), i)
+        os.utime(directory / f"{i}.pickle", ns=(i, i))
+    assert cache.get("0") == 0
+
+    cache.add("X", "X")
+
+    assert sorted(f.name for f in directory.iterdir()) == ["0.pickle", "X.pickle"]
+
+
+class Exploit:
+    def __init__(self, marker: Path) -> None:
+        self.marker = marker
+
+    def __reduce__(self) -> tuple[object, tuple[Path]]:
+        return (Path.touch, (self.marker,))
+
+
+def test_tampered_entry(tmp_path: Path) -> None:
+    directory = tmp_path / "specifications"
+    marker = tmp_path / "marker"
+    cache = ParseCache(directory, secret_file=tmp_path / "secret")
+    cache.add("A", 1)
+    cache.add("B", 2)
+
+    entry = directory / "A.pickle"
+    content = entry.read_bytes()
+    entry.write_bytes(content[:-1] + bytes([content[-1] ^ 1]))
+    assert cache.get("A") is None
+
+    entry.write_bytes(content[:32] + pickle.dumps(Exploit(marker)))
+    assert cache.get("A") is None
+    assert not marker.exists()
+
+    (directory / "B.pickle").replace(entry)
+    assert cache.get("A") is None
+
+    cache.add("A", 1)
+    assert ParseCache(directory, secret_file=tmp_path / "other").get("A") is None
+    assert cache.get("A") == 1
+
+
+def test_secret(tmp_path: Path) -> None:
+    secret_file = tmp_path / "cache" / "secret"
+    ParseCache(tmp_path / "specifications", secret_file=secret_file).add("A", 1)
+    secret = secret_file.read_bytes()
+
+    assert len(secret) == 32
+    assert secret_file.stat().st_mode & 0o077 == 0
+    assert ParseCache(tmp_path / "specifications", secret_file=secret_file).get("A") == 1
+    assert secret_file.read_bytes() == secret
+
+
+def test_invalid_secret(tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    secret_file = tmp_path / "secret"
+    secret_file.write_bytes(b"X")
+    cache = ParseCache(tmp_path / "specifications", secret_file=secret_file)
+
+    cache.add("A", 1)
+
+    assert cache.get("A") is None
+    assert not (tmp_path / "specifications").exists()
+    assert capfd.readouterr().err == (
+        f'warning: parse cache will be ignored due to error: invalid secret in "{secret_file}"\n'
+    )
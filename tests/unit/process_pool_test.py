@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from rflx import process_pool
+
+
+def test_executor() -> None:
+    before = process_pool.statistics()
+
+    executor = process_pool.executor(2)
+
+    assert process_pool.executor(2) is executor
+    assert list(executor.map(abs, [-1, 2, -3])) == [1, 2, 3]
+
+    after = process_pool.statistics()
+
+    assert after.reuses > before.reuses
+    assert after.starts - before.starts <= 1
+
+
+def test_shutdown() -> None:
+    executor = process_pool.executor(2)
+
+    process_pool.shutdown()
+
+    with pytest.raises(RuntimeError, match="^cannot schedule new futures after shutdown$"):
+        executor.submit(abs, -1)
+
+    assert process_pool.executor(2) is not executor
+
+
+def test_executor_broken() -> None:
+    executor = process_pool.executor(2)
+
+    with pytest.raises(BrokenProcessPool):
+        executor.submit(os._exit, 1).result()
+
+    assert process_pool.executor(2) is not executor
+    assert list(process_pool.executor(2).map(abs, [-1, 2])) == [1, 2]
+
+
+def test_executor_in_worker() -> None:
+    with pytest.raises(AssertionError, match="^process pool requested by a process of a pool$"):
+        process_pool.executor(2).submit(process_pool.executor, 1).result()
+
+
+def test_statistics_saved_time() -> None:
+    assert process_pool.Statistics().saved_time == 0
+    assert process_pool.Statistics(2, 4, 3.0).saved_time == 6.0
+
+
+def test_statistics_str() -> None:
+    assert str(process_pool.Statistics(2, 4, 3.0)) == (
+        "2 starts, 4 reuses, 3.00 s startup time, 6.00 s saved"
+    )
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import pickle
+import sqlite3
+from itertools import repeat
+from pathlib import Path
+
+import z3
+
+from rflx import process_pool, proof_cache
+from rflx.common import CacheStatistics
+from rflx.proof_cache import Outcome, ProofCache
+
+
+def test_key_independent_of_order_of_facts() -> None:
+    x, y = z3.Ints("X Y")
+
+    key_1, order_1 = proof_cache.key("QF_NIA", x > 0, [x < 10, y == x + 1, y > 2])
+    key_2, order_2 = proof_cache.key("QF_NIA", x > 0, [y > 2, x < 10, y == x + 1])
+
+    assert key_1 == key_2
+    assert [[x < 10, y == x + 1, y > 2][i] for i in order_1] == [
+        [y > 2, x < 10, y == x + 1][i] for i in order_2
+    ]
+
+
+def test_key_independent_of_names_of_variables() -> None:
+    x, y, a, b = z3.Ints("X Y A B")
+
+    assert (
+        proof_cache.key("QF_NIA", x > y, [y == 1])[0]
+        == proof_cache.key("QF_NIA", a > b, [b == 1])[0]
+    )
+
+
+def test_key_dependent_on_proof_problem() -> None:
+    x, y = z3.Ints("X Y")
+
+    assert proof_cache.key("QF_NIA", x > y, [y == 1]) != proof_cache.key("QF_NIA", x > y, [y == 2])
+    assert proof_cache.key("QF_NIA", x > y, [y == 1]) != proof_cache.key("QF_NIA", y > x, [y == 1])
+    assert proof_cache.key("QF_NIA", x > y, [y == 1]) != proof_cache.key("QF_LIA", x > y, [y == 1])
+    assert proof_cache.key("QF_NIA", None, [y == 1]) != proof_cache.key("QF_NIA", y == 1, [])
+
+
+def test_get_add(tmp_path: Path) -> None:
+    cache = ProofCache(tmp_path / "proofs.sqlite")
+
+    assert cache.get("A") is None
+
+    cache.add("A", Outcome("UNSAT", None, ("F0", "goal")))
+    cache.add("B", Outcome("UNKNOWN", "timeout"))
+
+    assert cache.get("A") == Outcome("UNSAT", None, ("F0", "goal"))
+    assert cache.get("B") == Outcome("UNKNOWN", "timeout")
+    assert ProofCache(tmp_path / "proofs.sqlite").get("A") is None
+
+    cache.flush()
+
+    assert ProofCache(tmp_path / "proofs.sqlite").get("A") == Outcome("UNSAT", None, ("F0", "goal"))
+
+
+def test_flush_batch(tmp_path: Path) -> None:
+    cache = ProofCache(tmp_path / "proofs.sqlite")
+
+    for i in range(proof_cache._BATCH_SIZE - 1):  # noqa: SLF001
+        cache.add(str(i), Outcome("SAT"))
+
+    assert ProofCache(tmp_path / "proofs.sqlite").get("0") is None
+
+    cache.add("X", Outcome("SAT"))
+
+    assert ProofCache(tmp_path / "proofs.sqlite").get("0") == Outcome("SAT")
+    assert ProofCache(tmp_path / "proofs.sqlite").get("X") == Outcome("SAT")
+
+
+def test_invalid_file(tmp_path: Path) -> None:
+    file = tmp_path / "proofs.sqlite"
+    file.write_text("invalid")
+    cache = ProofCache(file)
+
+    cache.add("A", Outcome("SAT"))
+    cache.flush()
+
+    assert ProofCache(file).get("A") is None
+
+
+def test_pickle(tmp_path: Path) -> None:
+    cache = ProofCache(tmp_path / "proofs.sqlite")
+    cache.add("A", Outcome("SAT"))
+    cache.flush()
+
+    copy = pickle.loads(pickle.dumps(cache))
+
+    assert copy.get("A") == Outcome("SAT")
+    assert pickle.loads(pickle.dumps(cache)) is copy
+    assert pickle.loads(pickle.dumps(ProofCache(tmp_path / "proofs.sqlite"))) is copy
+    assert pickle.loads(pickle.dumps(ProofCache(tmp_path / "other.sqlite"))) is not copy
+
+
+def test_statistics(tmp_path: Path) -> None:
+    assert ProofCache(tmp_path / "proofs.sqlite").statistics() is None
+
+    cache = ProofCache(tmp_path / "proofs.sqlite", record_statistics=True)
+    copy = pickle.loads(pickle.dumps(cache))
+
+    assert cache.statistics() == CacheStatistics(0, 0)
+
+    cache.add("A", Outcome("SAT"))
+    assert cache.get("A") == Outcome("SAT")
+    assert cache.statistics() == CacheStatistics(1, 0)
+
+    with proof_cache.active(copy):
+        assert copy.get("A") == Outcome("SAT")
+        assert copy.get("B") is None
+
+    assert cache.statistics() == CacheStatistics(1, 0)
+
+    copy.flush()
+
+    assert cache.statistics() == CacheStatistics(2, 1)
+    assert ProofCache(tmp_path / "proofs.sqlite", record_statistics=True).statistics() == (
+        CacheStatistics(0, 0)
+    )
+
+
+def test_eviction(tmp_path: Path) -> None:
+    cache = ProofCache(tmp_path / "proofs.sqlite", capacity=2)
+
+    for i in range(proof_cache._EVICTION_INTERVAL):  # noqa: SLF001
+        cache.add(str(i), Outcome("SAT"))
+    cache.flush()
+
+    assert cache.get("0") is None
+    assert cache.get(str(proof_cache._EVICTION_INTERVAL - 1)) == Outcome("SAT")  # noqa: SLF001
+
+
+def test_eviction_multiple_processes(tmp_path: Path) -> None:
+    cache = ProofCache(tmp_path / "proofs.sqlite", capacity=2)
+    keys = [str(i) for i in range(2 * proof_cache._EVICTION_INTERVAL)]  # noqa: SLF001
+
+    list(process_pool.executor(2).map(cache.add, keys, repeat(Outcome("SAT"))))
+    # The changes of the processes are written when the processes exit
+    process_pool.shutdown()
+
+    with sqlite3.connect(tmp_path / "proofs.sqlite") as connection:
+        assert connection.execute("SELECT count(*) FROM proofs").fetchone() == (2,)
+
+
+def test_active(tmp_path: Path) -> None:
+    cache = ProofCache(tmp_path / "proofs.sqlite")
+
+    assert proof_cache.current() is None
+
+    with proof_cache.active(cache):
+        assert proof_cache.current() is cache
+        with proof_cache.active(None):
+            assert proof_cache.current() is None
+        assert proof_cache.current() is cache
+
+    assert proof_cache.current() is None
+
+
+def test_active_flush(tmp_path: Path) -> None:
+    cache = ProofCache(tmp_path / "proofs.sqlite")
+
+    with proof_cache.active(cache):
+        cache.add("A", Outcome("SAT"))
+        with proof_cache.active(cache):
+            cache.add("B", Outcome("SAT"))
+        assert ProofCache(tmp_path / "proofs.sqlite").get("B") is None
+
+    assert ProofCache(tmp_path / "proofs.sqlite").get("B") == Outcome("SAT")
+    assert ProofCache(tmp_path / "proofs.sqlite").get("A") == Outcome("SAT")
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import importlib
+import json
+from types import ModuleType
+
+import pytest
+
+from rflx.pyrflx import Columns, MessageView, PyRFLXError
+from rflx.pyrflx.batch import buffers
+
+
+def test_message_view() -> None:
+    view = MessageView("Message", ["A", "B"], {"A": 1})
+    assert view.name == "Message"
+    assert view.valid
+    assert view.error is None
+    assert view.fields == ["A", "B"]
+    assert view.valid_fields == ["A"]
+    assert view.get("A") == 1
+
+
+def test_message_view_get_error() -> None:
+    view = MessageView("Message", ["A", "B"], {"A": 1})
+    with pytest.raises(PyRFLXError, match=r'^error: "B" is not set$'):
+        view.get("B")
+    with pytest.raises(PyRFLXError, match=r'^error: "C" is not a field of this message$'):
+        view.get("C")
+
+
+def test_message_view_invalid() -> None:
+    error = PyRFLXError()
+    error.push_msg("invalid")
+    view = MessageView("Message", ["A"], {}, error)
+    assert not view.valid
+    assert view.error is error
+    assert view.valid_fields == []
+
+
+def test_columns() -> None:
+    error = PyRFLXError()
+    error.push_msg("invalid")
+    columns = Columns.from_views(
+        ["A", "B"],
+        [
+            MessageView("Message", ["A", "B"], {"A": 1, "B": 2}),
+            MessageView("Message", ["A", "B"], {}, error),
+            MessageView("Message", ["A", "B"], {"A": 3}),
+        ],
+    )
+    assert len(columns) == 3
+    assert columns.values == {"A": [1, None, 3], "B": [2, None, None]}
+    assert columns.valid == {"A": [True, False, True], "B": [True, False, False]}
+    assert columns.errors == [None, error, None]
+
+
+def test_columns_complete() -> None:
+    error = PyRFLXError()
+    error.push_msg("invalid")
+    columns = Columns({"A": [], "B": []}, {"A": [], "B": []}, [], {"A": []}, {"B": []})
+    columns._add("A", "X", 1)  # noqa: SLF001
+    columns._add("B", b"\x01", span=(1, 1))  # noqa: SLF001
+    columns._complete()  # noqa: SLF001
+    columns._add("A", "Y", 2)  # noqa: SLF001
+    columns._complete(error)  # noqa: SLF001
+    columns._add("A", "Z", 3)  # noqa: SLF001
+    columns._complete()  # noqa: SLF001
+    assert len(columns) == 3
+    assert columns.values == {"A": ["X", None, "Z"], "B": [b"\x01", None, None]}
+    assert columns.valid == {"A": [True, False, True], "B": [True, False, False]}
+    assert columns.codes == {"A": [1, None, 3]}
+    assert columns.spans == {"B": [(1, 1), None, None]}
+    assert columns.errors == [None, error, None]
+
+
+def columns_with_codes_and_spans() -> Columns:
+    return Columns(
+        {"A": ["X", None], "B": [2**64 - 1, 1], "C": [memoryview(b"\x01"), None], "D": [None, "Z"]},
+        {"A": [True, False], "B": [True, True], "C": [True, False], "D": [False, True]},
+        [None, None],
+        {"A": [1, None]},
+        {"C": [(4, 1), None]},
+        {"A": {"X": 1, "Y": 2}},
+    )
+
+
+def test_columns_to_numpy() -> None:
+    pytest.importorskip("numpy")
+    array = columns_with_codes_and_spans().to_numpy()
+    assert array.dtype.names == (
+        "A",
+        "A'Valid",
+        "B",
+        "B'Valid",
+        "C'Offset",
+        "C'Length",
+        "C'Valid",
+        "D",
+        "D'Valid",
+    )
+    assert array["A"].tolist() == [1, 0]
+    assert array["A'Valid"].tolist() == [True, False]
+    assert array["B"].tolist() == [2**64 - 1, 1]
+    assert array["C'Offset"].tolist() == [4, 0]
+    assert array["C'Length"].tolist() == [1, 0]
+    assert array["D"].tolist() == [None, "Z"]
+
+
+def test_columns_to_arrow() -> None:
+    pytest.importorskip("pyarrow")
+    batch = columns_with_codes_and_spans().to_arrow()
+    assert batch.schema.names == ["A", "B", "C'Offset", "C'Length", "D"]
+    assert batch.column("A").to_pylist() == [1, None]
+    assert json.loads(batch.schema.field("A").metadata[b"literals"]) == {"X": 1, "Y": 2}
+    assert batch.column("B").to_pylist() == [2**64 - 1, 1]
+    assert batch.column("C'Offset").to_pylist() == [4, None]
+    assert batch.column("C'Length").to_pylist() == [1, None]
+    assert batch.column("D").to_pylist() == [None, "Z"]
+
+
+def test_columns_export_missing_dependency(monkeypatch: pytest.MonkeyPatch) -> None:
+    def import_module(name: str) -> ModuleType:
+        raise ImportError(name)
+
+    monkeypatch.setattr(importlib, "import_module", import_module)
+    columns = columns_with_codes_and_spans()
+    with pytest.raises(
+        PyRFLXError,
+        match=r'^error: export of columns requires "numpy" to be installed$',
+    ):
+        columns.to_numpy()
+    with pytest.raises(
+        PyRFLXError,
+        match=r'^error: export of columns requires "pyarrow" to be installed$',
+    ):
+        columns.to_arrow()
+
+
+def test_buffers() -> None:
+    assert list(buffers([b"\x01", b"\x02\x03"])) == [b"\x01", b"\x02\x03"]
+    assert list(buffers(b"\x01\x02")) == [b"\x01\x02"]
+
+
+def test_buffers_offsets() -> None:
+    data = bytearray(b"\x01\x02\x03\x04\x05")
+    result = list(buffers(data, [0, 1, 3]))
+    assert [bytes(b) for b in result] == [b"\x01", b"\x02\x03", b"\x04\x05"]
+    assert all(isinstance(b, memoryview) and b.readonly for b in result)
+    data[0] = 0
+    assert bytes(result[0]) == b"\x00"
+
+
+def test_buffers_invalid_offsets() -> None:
+    with pytest.raises(
+        PyRFLXError,
+        match=r"^error: invalid message offsets 0 \.\. 3 in buffer of size 2$",
+    ):
+        list(buffers(b"\x01\x02", [0, 3]))
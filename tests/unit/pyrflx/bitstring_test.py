@@ -1,4 +1,8 @@
-from rflx.pyrflx import MessageValue
+from __future__ import annotations
+
+import pytest
+
+from rflx.pyrflx import MessageValue, PyRFLXError
 from rflx.pyrflx.bitstring import Bitstring
 
 
@@ -10,3 +14,127 @@ def test_message_value_bitstring(tlv_message_value: MessageValue) -> None:
     assert tlv_message_value.bitstring == Bitstring("000000010000000000000001")
     tlv_message_value.set("Value", b"\x01")
     assert tlv_message_value.bitstring == Bitstring("00000001000000000000000100000001")
+
+
+def test_bitstring_str() -> None:
+    assert str(Bitstring("")) == ""
+    assert str(Bitstring("0")) == "0"
+    assert str(Bitstring("0010110")) == "0010110"
+    assert str(Bitstring.from_bytes(b"\x0f\xf0")) == "0000111111110000"
+
+
+def test_bitstring_invalid() -> None:
+    with pytest.raises(PyRFLXError, match=r"^error: Bitstring does not consist of only 0 and 1$"):
+        Bitstring("0120")
+
+
+def test_bitstring_int() -> None:
+    assert int(Bitstring("")) == 0
+    assert int(Bitstring("101")) == 5
+    assert int(Bitstring.from_bytes(b"\x01\x02\x03")) == 0x010203
+    assert int(Bitstring.from_bytes(b"\x01\x02\x03")[4:20]) == 0x1020
+
+
+def test_bitstring_bytes() -> None:
+    assert bytes(Bitstring("")) == b""
+    assert bytes(Bitstring("0000000100000010")) == b"\x01\x02"
+    assert bytes(Bitstring("00000001001")) == b"\x01\x01"
+    assert bytes(Bitstring.from_bytes(b"\x01\x02\x03")[8:]) == b"\x02\x03"
+    assert bytes(Bitstring.from_bytes(b"\x01\x02\x03")[4:20]) == b"\x10\x20"
+
+
+@pytest.mark.parametrize(
+    ("key", "expected"),
+    [
+        (slice(0, 0), ""),
+        (slice(0, 4), "0001"),
+        (slice(4, 12), "11111010"),
+        (slice(12, None), "1010"),
+        (slice(-4, None), "1010"),
+        (slice(None, None, 2), "00111111"),
+        (3, "1"),
+        (-1, "0"),
+    ],
+)
+def test_bitstring_getitem(key: int | slice, expected: str) -> None:
+    assert Bitstring.from_bytes(b"\x1f\xaa")[key] == Bitstring(expected)
+
+
+def test_bitstring_getitem_out_of_range() -> None:
+    with pytest.raises(IndexError):
+        Bitstring("0101")[2:5]
+    with pytest.raises(IndexError):
+        Bitstring("0101")[4]
+
+
+def test_bitstring_add() -> None:
+    assert Bitstring("01") + Bitstring("") == Bitstring("01")
+    assert Bitstring("") + Bitstring("01") == Bitstring("01")
+    assert Bitstring("01") + Bitstring("110") == Bitstring("01110")
+    assert Bitstring.from_bytes(b"\x01") + Bitstring("1") == Bitstring("000000011")
+    assert Bitstring.from_bytes(b"\x01\x02")[:8] + Bitstring.from_bytes(b"\x01\x02")[8:] == (
+        Bitstring.from_bytes(b"\x01\x02")
+    )
+
+
+def test_bitstring_iadd() -> None:
+    bits = Bitstring("01")
+    other = bits + Bitstring("")
+    bits += Bitstring("1")
+    assert bits == Bitstring("011")
+    assert other == Bitstring("01")
+
+
+def test_bitstring_join() -> None:
+    assert Bitstring.join([]) == Bitstring("")
+    assert Bitstring.join([Bitstring("01"), Bitstring("1"), Bitstring("")]) == Bitstring("011")
+    assert Bitstring.join(
+        [Bitstring.from_bytes(b"\x01"), Bitstring.from_bytes(b"\x02\x03")[8:]],
+    ) == Bitstring.from_bytes(b"\x01\x03")
+
+
+def test_bitstring_swap() -> None:
+    assert Bitstring.from_bytes(b"\x01\x02\x03").swap() == Bitstring.from_bytes(b"\x03\x02\x01")
+    assert Bitstring.from_bytes(b"\x00\x01\x02\x03")[8:].swap() == Bitstring.from_bytes(
+        b"\x03\x02\x01",
+    )
+    assert Bitstring.swap_bitstring("0000000111111110") == "1111111000000001"
+
+
+def test_bitstring_from_int() -> None:
+    assert Bitstring.from_int(0, 0) == Bitstring("")
+    assert Bitstring.from_int(5, 4) == Bitstring("0101")
+    assert Bitstring.from_int(0x0102, 16) == Bitstring.from_bytes(b"\x01\x02")
+
+
+def test_bitstring_from_bytes_without_copy() -> None:
+    buffer = bytearray(b"\x01\x02\x03")
+    view = memoryview(buffer)
+    bits = Bitstring.from_bytes(view)
+    assert bytes(bits[8:16]) == b"\x02"
+    buffer[1] = 0xFF
+    assert bytes(bits[8:16]) == b"\xff"
+    assert Bitstring.from_bytes(bytearray(b"\x01")) == Bitstring("00000001")
+
+
+def test_bitstring_as_memoryview() -> None:
+    buffer = bytearray(b"\x01\x02\x03")
+    bits = Bitstring.from_bytes(memoryview(buffer))
+    view = bits[8:24].as_memoryview()
+    assert view.readonly
+    assert bytes(view) == b"\x02\x03"
+    assert bytes(bits[4:12].as_memoryview()) == b"\x10"
+    buffer[1] = 0xFF
+    assert bytes(view) == b"\xff\x03"
+
+
+def test_bitstring_write_into() -> None:
+    buffer = bytearray(b"\xff\x00")
+    Bitstring("0101").write_into(buffer, 2)
+    assert buffer == bytearray(b"\xd7\x00")
+    Bitstring.from_bytes(b"\x12").write_into(buffer, 8)
+    assert buffer == bytearray(b"\xd7\x12")
+    Bitstring("111").write_into(buffer, 15)
+    assert buffer == bytearray(b"\xd7\x13\xc0")
+    Bitstring().write_into(buffer, 40)
+    assert buffer == bytearray(b"\xd7\x13\xc0")
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import zlib
+
+import pytest
+
+from rflx.pyrflx import CRC32, IncrementalChecksumFunction, InternetChecksum, utils
+from rflx.pyrflx.checksum import changed_bytes
+
+MESSAGE = bytes(range(7, 7 + 64))
+
+
+@pytest.mark.parametrize(
+    "ranges",
+    [
+        {"Range": (0, 511)},
+        {"Range": (0, 503)},
+        {"First": (0, 15), "Second": (32, 511)},
+        {"First": (0, 23), "Second": (40, 503)},
+    ],
+)
+def test_internet_checksum(ranges: dict[str, tuple[int, int]]) -> None:
+    data = b"".join(MESSAGE[f // 8 : (l + 1) // 8] for f, l in ranges.values())
+    assert InternetChecksum()(MESSAGE, **ranges, Size=512) == utils.internet_checksum(
+        data if len(data) % 2 == 0 else data + b"\x00",
+    )
+
+
+@pytest.mark.parametrize(
+    "ranges",
+    [
+        {"Range": (0, 511)},
+        {"Range": (0, 503)},
+        {"First": (0, 15), "Second": (32, 511)},
+        {"First": (0, 23), "Second": (40, 503)},
+        {"First": (8, 31), "Second": (40, 495)},
+    ],
+)
+@pytest.mark.parametrize(
+    "changes",
+    [
+        [],
+        [(0, 1)],
+        [(1, 2)],
+        [(0, 1), (0, 1), (1, 3)],
+        [(3, 5), (10, 11), (62, 64)],
+        [(2, 4), (5, 64)],
+    ],
+)
+def test_internet_checksum_update(
+    ranges: dict[str, tuple[int, int]],
+    changes: list[tuple[int, int]],
+) -> None:
+    function = InternetChecksum()
+    new = bytearray(MESSAGE)
+    for start, end in changes:
+        for i in range(start, end):
+            new[i] = (new[i] * 31 + 17) % 256
+    assert function.update(
+        function(MESSAGE, **ranges),
+        MESSAGE,
+        bytes(new),
+        changes,
+        **ranges,
+    ) == function(bytes(new), **ranges)
+
+
+def test_crc32() -> None:
+    assert CRC32()(MESSAGE, Range=(0, 511)) == zlib.crc32(MESSAGE)
+    assert CRC32()(MESSAGE, First=(0, 15), Second=(32, 511)) == zlib.crc32(
+        MESSAGE[:2] + MESSAGE[4:],
+    )
+    assert CRC32().update(0, MESSAGE, MESSAGE[::-1], [(0, 64)], Range=(0, 511)) == zlib.crc32(
+        MESSAGE[::-1],
+    )
+
+
+def test_incremental_checksum_function() -> None:
+    class Sum(IncrementalChecksumFunction):
+        def __call__(self, message: bytes, **kwargs: object) -> int:  # noqa: ARG002
+            return sum(message)
+
+    assert Sum().update(sum(MESSAGE), MESSAGE, bytes(64), [(0, 64)]) == 0
+
+
+def test_changed_bytes() -> None:
+    new = bytearray(MESSAGE)
+    new[0] ^= 0x01
+    new[5] ^= 0x80
+    assert changed_bytes(MESSAGE, bytes(new), [(0, 4), (4, 4), (8, 24), (32, 480)]) == [
+        (0, 1),
+        (0, 1),
+        (4, 64),
+    ]
+    assert changed_bytes(MESSAGE, MESSAGE, [(0, 512)]) == []
@@ -0,0 +1,113 @@
+# ruff: noqa: SLF001
+
+from __future__ import annotations
+
+import pytest
+
+from rflx.pyrflx import LazyMessage, MessageValue, PyRFLXError
+
+ICMP_ECHO_REQUEST = (
+    b"\x08\x00\xe1\x1e\x00\x11\x00\x01\x4a\xfc\x0d\x00\x00\x00\x00\x00"
+    b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f"
+    b"\x20\x21\x22\x23\x24\x25\x26\x27\x28\x29\x2a\x2b\x2c\x2d\x2e\x2f"
+    b"\x30\x31\x32\x33\x34\x35\x36\x37"
+)
+
+IPV4_ICMP_PACKET = (
+    b"\x45\x00\x00\x4c\x00\x01\x00\x00\x40\x01\x00\x00\x7f\x00\x00\x01"
+    b"\x7f\x00\x00\x02" + ICMP_ECHO_REQUEST
+)
+
+
+def test_lazy_message(ipv4_packet_value: MessageValue) -> None:
+    message = ipv4_packet_value.parse_lazy(IPV4_ICMP_PACKET)
+    assert message.name == "Packet"
+    assert message.fields == ipv4_packet_value.fields
+    assert message.get("Protocol") == "IPv4::P_ICMP"
+    assert list(message._steps)[-1] == "Protocol"
+    assert message._values == {"Protocol": "IPv4::P_ICMP"}
+    assert message.get("Destination") == 0x7F000002
+    assert message.valid
+    assert message.error is None
+    assert message.valid_fields == ipv4_packet_value.fields
+    assert not ipv4_packet_value.valid_fields
+
+
+def test_lazy_message_refinement(ipv4_packet_value: MessageValue) -> None:
+    message = ipv4_packet_value.parse_lazy(IPV4_ICMP_PACKET)
+    payload = message.get("Payload")
+    assert isinstance(payload, LazyMessage)
+    assert payload.name == "Message"
+    assert payload.get("Tag") == "ICMP::Echo_Request"
+    assert payload.get("Identifier") == 17
+    data = payload.get("Data")
+    assert isinstance(data, memoryview)
+    assert data.readonly
+    assert data == ICMP_ECHO_REQUEST[8:]
+    assert message.get("Payload") is payload
+
+
+def test_lazy_message_opaque(icmp_message_value: MessageValue) -> None:
+    buffer = bytearray(ICMP_ECHO_REQUEST)
+    message = icmp_message_value.parse_lazy(memoryview(buffer).toreadonly())
+    data = message.get("Data")
+    assert isinstance(data, memoryview)
+    assert data.obj is buffer
+    assert data == ICMP_ECHO_REQUEST[8:]
+
+
+def test_lazy_message_get_error(icmp_message_value: MessageValue) -> None:
+    message = icmp_message_value.parse_lazy(ICMP_ECHO_REQUEST)
+    with pytest.raises(PyRFLXError, match=r'^error: "Pointer" is not set$'):
+        message.get("Pointer")
+    with pytest.raises(PyRFLXError, match=r'^error: "X" is not a field of this message$'):
+        message.get("X")
+
+
+def test_lazy_message_invalid(icmp_message_value: MessageValue) -> None:
+    message = icmp_message_value.parse_lazy(ICMP_ECHO_REQUEST[:5])
+    assert message.get("Tag") == "ICMP::Echo_Request"
+    assert not message.valid
+    assert isinstance(message.error, PyRFLXError)
+    assert message.valid_fields == []
+    with pytest.raises(PyRFLXError, match=r'^error: "Identifier" is not set$'):
+        message.get("Identifier")
+
+
+def test_lazy_message_invalid_validity_first(icmp_message_value: MessageValue) -> None:
+    message = icmp_message_value.parse_lazy(ICMP_ECHO_REQUEST[:5])
+    assert not message.valid
+    assert message.get("Tag") == "ICMP::Echo_Request"
+    assert message.get("Checksum") == 0xE11E
+    with pytest.raises(PyRFLXError, match=r'^error: "Identifier" is not set$'):
+        message.get("Identifier")
+
+
+def test_lazy_message_invalid_after_get(icmp_message_value: MessageValue) -> None:
+    message = icmp_message_value.parse_lazy(ICMP_ECHO_REQUEST[:5])
+    assert message.get("Code_Zero") == 0
+    assert not message.valid
+    assert message.get("Code_Zero") == 0
+    assert message.get("Tag") == "ICMP::Echo_Request"
+
+
+def test_lazy_message_fallback() -> None:
+    message = LazyMessage("Message", ["A", "B"], None, lambda _: None, lambda: {"A": 1})
+    assert message.valid
+    assert message.valid_fields == ["A"]
+    assert message.get("A") == 1
+    with pytest.raises(PyRFLXError, match=r'^error: "B" is not set$'):
+        message.get("B")
+
+
+def test_lazy_message_fallback_error() -> None:
+    error = PyRFLXError()
+    error.push_msg("invalid")
+
+    def fallback() -> dict[str, object]:
+        raise error
+
+    message = LazyMessage("Message", ["A"], None, lambda _: None, fallback)
+    assert not message.valid
+    assert message.error is error
+    assert message.valid_fields == []
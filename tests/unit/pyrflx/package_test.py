@@ -1,4 +1,17 @@
+import pytest
+
+from rflx.pyrflx import Columns, MessageValue
 from rflx.pyrflx.package import Package
+from tests.const import CAPTURED_DIR
+
+ICMP_ECHO_REQUEST = (
+    b"\x08\x00\xe1\x1e\x00\x11\x00\x01\x4a\xfc\x0d\x00\x00\x00\x00\x00"
+    b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f"
+)
+ICMP_ECHO_REPLY = (
+    b"\x00\x00\xe1\x1e\x00\x11\x00\x02\x4a\xfc\x0d\x00\x00\x00\x00\x00"
+    b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f"
+)
 
 
 def test_package_name() -> None:
@@ -8,3 +21,109 @@ def test_package_name() -> None:
 
 def test_package_iterator(tlv_package: Package) -> None:
     assert [m.name for m in tlv_package] == ["Message"]
+
+
+def test_package_build(tlv_package: Package) -> None:
+    message = tlv_package.build("Message", Tag="Msg_Data", Length=1, Value=b"\x05")
+    assert message.valid_message
+    assert message.bytestring == b"\x01\x00\x01\x05"
+    assert not tlv_package.new_message("Message").valid_fields
+
+
+def test_package_template(tlv_package: Package) -> None:
+    template = tlv_package.template("Message", Tag="Msg_Data", Length=1, Value=b"\x05")
+    assert template.render() == b"\x01\x00\x01\x05"
+    assert template.render(Value=b"\x06") == b"\x01\x00\x01\x06"
+
+
+def test_package_parse_many(icmp_package: Package) -> None:
+    views = list(icmp_package.parse_many("Message", [ICMP_ECHO_REQUEST, b"\x08", ICMP_ECHO_REPLY]))
+    assert [v.valid for v in views] == [True, False, True]
+    assert views[0].get("Tag") == "ICMP::Echo_Request"
+    assert views[0].get("Sequence_Number") == 1
+    assert views[0].valid_fields == [
+        "Tag",
+        "Code_Zero",
+        "Checksum",
+        "Identifier",
+        "Sequence_Number",
+        "Data",
+    ]
+    assert bytes(views[0].get("Data")) == ICMP_ECHO_REQUEST[8:]  # type: ignore[call-overload]
+    assert views[2].get("Tag") == "ICMP::Echo_Reply"
+    assert views[2].get("Sequence_Number") == 2
+
+
+def test_package_parse_many_refinement(ipv4_package: Package) -> None:
+    data = (CAPTURED_DIR / "ipv4_udp.raw").read_bytes()
+    message = ipv4_package.new_message("Packet")
+    message.parse(data)
+    assert isinstance(message.get("Payload"), MessageValue)
+    [view] = ipv4_package.parse_many("Packet", [data])
+    payload = view.get("Payload")
+    assert isinstance(payload, memoryview)
+    assert bytes(payload) == data[20:]
+    columns = ipv4_package.parse_columns("Packet", [data])
+    assert [bytes(v) for v in columns.values["Payload"] if isinstance(v, memoryview)] == [
+        data[20:],
+    ]
+
+
+def test_package_parse_many_offsets(icmp_package: Package) -> None:
+    data = ICMP_ECHO_REQUEST + ICMP_ECHO_REPLY
+    views = list(icmp_package.parse_many("Message", data, [0, len(ICMP_ECHO_REQUEST)]))
+    assert [v.get("Sequence_Number") for v in views] == [1, 2]
+    payload = views[1].get("Data")
+    assert isinstance(payload, memoryview)
+    assert payload.obj is data
+
+
+def test_package_parse_columns(icmp_package: Package) -> None:
+    columns = icmp_package.parse_columns("Message", [ICMP_ECHO_REQUEST, b"\x08"])
+    assert isinstance(columns, Columns)
+    assert len(columns) == 2
+    assert columns.values["Sequence_Number"] == [1, None]
+    assert columns.valid["Tag"] == [True, False]
+    assert columns.errors[0] is None
+    assert columns.errors[1] is not None
+    assert columns.codes["Tag"] == [8, None]
+    assert columns.literals["Tag"]["ICMP::Echo_Request"] == 8
+    assert columns.spans == {"Data": [(8, 24), None]}
+
+
+def test_package_parse_columns_offsets(icmp_package: Package) -> None:
+    data = ICMP_ECHO_REQUEST + ICMP_ECHO_REPLY
+    columns = icmp_package.parse_columns("Message", data, [0, len(ICMP_ECHO_REQUEST)])
+    assert columns.values["Tag"] == ["ICMP::Echo_Request", "ICMP::Echo_Reply"]
+    assert columns.codes["Tag"] == [8, 0]
+    assert [bytes(v) for v in columns.values["Data"] if isinstance(v, memoryview)] == [
+        ICMP_ECHO_REQUEST[8:],
+        ICMP_ECHO_REPLY[8:],
+    ]
+    assert columns.spans["Data"] == [(8, 24), (8, 24)]
+
+
+def test_package_parse_columns_to_numpy(icmp_package: Package) -> None:
+    pytest.importorskip("numpy")
+    array = icmp_package.parse_columns(
+        "Message",
+        [ICMP_ECHO_REQUEST, b"\x08", ICMP_ECHO_REPLY],
+    ).to_numpy()
+    assert array["Tag"].tolist() == [8, 0, 0]
+    assert array["Tag'Valid"].tolist() == [True, False, True]
+    assert array["Sequence_Number"].tolist() == [1, 0, 2]
+    assert array["Data'Offset"].tolist() == [8, 0, 8]
+    assert array["Data'Length"].tolist() == [24, 0, 24]
+
+
+def test_package_parse_columns_to_arrow(icmp_package: Package) -> None:
+    pytest.importorskip("pyarrow")
+    batch = icmp_package.parse_columns(
+        "Message",
+        [ICMP_ECHO_REQUEST, b"\x08", ICMP_ECHO_REPLY],
+    ).to_arrow()
+    assert batch.num_rows == 3
+    assert batch.column("Tag").to_pylist() == [8, None, 0]
+    assert batch.column("Sequence_Number").to_pylist() == [1, None, 2]
+    assert batch.column("Data'Offset").to_pylist() == [8, None, 8]
+    assert batch.column("Data'Length").to_pylist() == [24, None, 24]
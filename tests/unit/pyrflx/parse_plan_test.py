@@ -0,0 +1,153 @@
+# ruff: noqa: SLF001
+
+from __future__ import annotations
+
+import pytest
+
+from rflx import expr
+from rflx.pyrflx import Bitstring, MessageValue
+from rflx.pyrflx.parse_plan import ParsePlan, UnsupportedExpressionError
+from rflx.pyrflx.result import ParseStatus
+
+ICMP_ECHO_REQUEST = (
+    b"\x08\x00\xe1\x1e\x00\x11\x00\x01\x4a\xfc\x0d\x00\x00\x00\x00\x00"
+    b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f"
+    b"\x20\x21\x22\x23\x24\x25\x26\x27\x28\x29\x2a\x2b\x2c\x2d\x2e\x2f"
+    b"\x30\x31\x32\x33\x34\x35\x36\x37"
+)
+
+IPV4_PACKET = (
+    b"\x45\x00\x00\x1a\x00\x01\x00\x00\x40\x01\x00\x00\x7f\x00\x00\x01"
+    b"\x7f\x00\x00\x01\x01\x02\x03\x04\x05\x06"
+)
+
+
+def parse_plan(message: MessageValue) -> ParsePlan:
+    plan = message._get_parse_plan()
+    assert plan is not None
+    return plan
+
+
+def test_run(icmp_message_value: MessageValue) -> None:
+    result = parse_plan(icmp_message_value).run(Bitstring.from_bytes(ICMP_ECHO_REQUEST), {}, {})
+    assert result is not None
+    steps, path = result
+    assert [(s.field, s.first, len(s.value), s.sized) for s in steps] == [
+        ("Tag", 0, 8, True),
+        ("Code_Zero", 8, 8, True),
+        ("Checksum", 16, 16, True),
+        ("Identifier", 32, 16, True),
+        ("Sequence_Number", 48, 16, True),
+        ("Data", 64, len(ICMP_ECHO_REQUEST) * 8 - 64, False),
+    ]
+    assert [s.scalar for s in steps] == [
+        expr.Literal("ICMP::Echo_Request"),
+        0,
+        57630,
+        17,
+        1,
+        None,
+    ]
+    assert [(l.source.name, l.target.name) for l in path] == [
+        ("Initial", "Tag"),
+        ("Tag", "Code_Zero"),
+        ("Code_Zero", "Checksum"),
+        ("Checksum", "Identifier"),
+        ("Identifier", "Sequence_Number"),
+        ("Sequence_Number", "Data"),
+        ("Data", "Final"),
+    ]
+
+
+def test_run_size(ipv4_packet_value: MessageValue) -> None:
+    result = parse_plan(ipv4_packet_value).run(Bitstring.from_bytes(IPV4_PACKET), {}, {})
+    assert result is not None
+    steps, _ = result
+    assert [(s.field, s.first, len(s.value)) for s in steps][-2:] == [
+        ("Options", 160, 0),
+        ("Payload", 160, 48),
+    ]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        ICMP_ECHO_REQUEST[:5],
+        b"\xff" + ICMP_ECHO_REQUEST[1:],
+    ],
+)
+def test_run_unsupported_data(icmp_message_value: MessageValue, data: bytes) -> None:
+    assert parse_plan(icmp_message_value).run(Bitstring.from_bytes(data), {}, {}) is None
+
+
+def test_cursor(icmp_message_value: MessageValue) -> None:
+    cursor = parse_plan(icmp_message_value).cursor(Bitstring.from_bytes(ICMP_ECHO_REQUEST), {}, {})
+    step = cursor.advance()
+    assert step is not None
+    assert (step.field, step.scalar) == ("Tag", expr.Literal("ICMP::Echo_Request"))
+    assert [s.field for s in cursor.steps] == ["Tag"]
+    assert not cursor.complete
+    while cursor.advance() is not None:
+        pass
+    assert cursor.complete
+    assert not cursor.failed
+    assert [s.field for s in cursor.steps][-1] == "Data"
+    assert cursor.advance() is None
+
+
+def test_cursor_failed(icmp_message_value: MessageValue) -> None:
+    cursor = parse_plan(icmp_message_value).cursor(
+        Bitstring.from_bytes(ICMP_ECHO_REQUEST[:5]),
+        {},
+        {},
+    )
+    while cursor.advance() is not None:
+        pass
+    assert cursor.failed
+    assert not cursor.complete
+    assert [s.field for s in cursor.steps] == ["Tag", "Code_Zero", "Checksum"]
+    assert cursor.rejection == (ParseStatus.TOO_SHORT, "Identifier")
+
+
+def test_cursor_rejection(icmp_message_value: MessageValue) -> None:
+    plan = parse_plan(icmp_message_value)
+    cursor = plan.cursor(Bitstring.from_bytes(b"\xff" + ICMP_ECHO_REQUEST[1:]), {}, {})
+    while cursor.advance() is not None:
+        pass
+    assert cursor.failed
+    assert cursor.rejection == (ParseStatus.INVALID_VALUE, "Tag")
+    cursor = plan.cursor(Bitstring.from_bytes(ICMP_ECHO_REQUEST), {}, {})
+    while cursor.advance() is not None:
+        pass
+    assert cursor.rejection is None
+
+
+def test_condition(icmp_message_value: MessageValue) -> None:
+    plan = parse_plan(icmp_message_value)
+    assert plan.condition(expr.TRUE) is None
+    condition = plan.condition(
+        expr.And(
+            expr.Equal(expr.Variable("Tag"), expr.Literal("ICMP::Echo_Request")),
+            expr.Less(expr.Add(expr.Last("Checksum"), expr.Number(1)), expr.Number(64)),
+        ),
+    )
+    assert condition is not None
+    assert plan.condition(
+        expr.And(
+            expr.Equal(expr.Variable("Tag"), expr.Literal("ICMP::Echo_Request")),
+            expr.Less(expr.Add(expr.Last("Checksum"), expr.Number(1)), expr.Number(64)),
+        ),
+    ) is condition
+    assert condition(
+        {"Tag": expr.Literal("ICMP::Echo_Request"), "Checksum'First": 16, "Checksum'Size": 16},
+    )
+    assert not condition(
+        {"Tag": expr.Literal("ICMP::Echo_Reply"), "Checksum'First": 16, "Checksum'Size": 16},
+    )
+
+
+def test_condition_unsupported(icmp_message_value: MessageValue) -> None:
+    with pytest.raises(UnsupportedExpressionError, match=r"^Data$"):
+        parse_plan(icmp_message_value).condition(
+            expr.Equal(expr.Variable("Data"), expr.Aggregate(expr.Number(1), expr.Number(2))),
+        )
@@ -0,0 +1,26 @@
+from rflx.pyrflx import ParseResult, ParseStatus
+
+
+def test_parse_result() -> None:
+    result = ParseResult(ParseStatus.TOO_SHORT, "Length")
+    assert not result.valid
+    assert result.path == ("Length",)
+    assert str(result) == "too short at Length"
+
+
+def test_parse_result_valid() -> None:
+    result = ParseResult(ParseStatus.VALID)
+    assert result.valid
+    assert result.path == ()
+    assert str(result) == "valid"
+
+
+def test_parse_result_nested() -> None:
+    result = ParseResult(
+        ParseStatus.NESTED_FAILURE,
+        "Payload",
+        ParseResult(ParseStatus.INVALID_VALUE, "Code_Zero"),
+    )
+    assert not result.valid
+    assert result.path == ("Payload", "Code_Zero")
+    assert str(result) == "invalid value at Payload.Code_Zero"
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import pytest
+
+from rflx.pyrflx import InternetChecksum, MessageValue, PyRFLXError, Template
+from tests.unit.pyrflx.typevalue_test import icmp_checksum_function
+
+ICMP_DATA = (
+    b"\x47\xb4\x67\x5e\x00\x00\x00\x00"
+    b"\x4a\xfc\x0d\x00\x00\x00\x00\x00\x10\x11\x12\x13\x14\x15\x16\x17"
+    b"\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f\x20\x21\x22\x23\x24\x25\x26\x27"
+    b"\x28\x29\x2a\x2b\x2c\x2d\x2e\x2f\x30\x31\x32\x33\x34\x35\x36\x37"
+)
+
+ICMP_ECHO_REQUEST = (
+    b"\x08\x00\xe1\x1e\x00\x11\x00\x01\x4a\xfc\x0d\x00\x00\x00\x00\x00"
+    b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f"
+    b"\x20\x21\x22\x23\x24\x25\x26\x27\x28\x29\x2a\x2b\x2c\x2d\x2e\x2f"
+    b"\x30\x31\x32\x33\x34\x35\x36\x37"
+)
+
+IPV4_ICMP_PACKET = (
+    b"\x45\x00\x00\x4c\x00\x01\x00\x00\x40\x01\x00\x00\x7f\x00\x00\x01"
+    b"\x7f\x00\x00\x02" + ICMP_ECHO_REQUEST
+)
+
+
+def test_template_render(icmp_checksum_message_value: MessageValue) -> None:
+    icmp_checksum_message_value.set_checksum_function({"Checksum": icmp_checksum_function})
+    icmp_checksum_message_value.build(
+        {
+            "Tag": "Echo_Request",
+            "Code_Zero": 0,
+            "Identifier": 5,
+            "Sequence_Number": 1,
+            "Data": ICMP_DATA,
+        },
+    )
+    template = Template(icmp_checksum_message_value)
+    assert template.message is icmp_checksum_message_value
+    assert template.render() == b"\x08\x00\x32\x18\x00\x05\x00\x01" + ICMP_DATA
+    assert template.render(Sequence_Number=2) == b"\x08\x00\x32\x17\x00\x05\x00\x02" + ICMP_DATA
+    assert template.render(Checksum=1) == b"\x08\x00\x00\x01\x00\x05\x00\x01" + ICMP_DATA
+    assert template.render() == b"\x08\x00\x32\x18\x00\x05\x00\x01" + ICMP_DATA
+    assert icmp_checksum_message_value.get("Sequence_Number") == 1
+
+
+def test_template_render_incremental_checksum(icmp_checksum_message_value: MessageValue) -> None:
+    icmp_checksum_message_value.set_checksum_function({"Checksum": InternetChecksum()})
+    icmp_checksum_message_value.build(
+        {
+            "Tag": "Echo_Request",
+            "Code_Zero": 0,
+            "Identifier": 5,
+            "Sequence_Number": 1,
+            "Data": ICMP_DATA,
+        },
+    )
+    template = Template(icmp_checksum_message_value)
+    assert template.render(Sequence_Number=2) == b"\x08\x00\x32\x17\x00\x05\x00\x02" + ICMP_DATA
+    assert template.render(Identifier=6, Sequence_Number=2) == (
+        b"\x08\x00\x32\x16\x00\x06\x00\x02" + ICMP_DATA
+    )
+
+
+def test_template_render_layout(tlv_message_value: MessageValue) -> None:
+    tlv_message_value.build({"Tag": "Msg_Data", "Length": 2, "Value": b"\x01\x02"})
+    template = Template(tlv_message_value)
+    assert template.render(Tag="Msg_Data", Value=b"\x03\x04") == b"\x01\x00\x02\x03\x04"
+    with pytest.raises(
+        PyRFLXError,
+        match=r"^error: cannot change field Length: layout of message would change$",
+    ):
+        template.render(Length=3)
+    with pytest.raises(
+        PyRFLXError,
+        match=r"^error: cannot change field Value: layout of message would change$",
+    ):
+        template.render(Value=b"\x01")
+    with pytest.raises(
+        PyRFLXError,
+        match=r"^error: cannot change field Tag: layout of message would change$",
+    ):
+        template.render(Tag="Msg_Error")
+
+
+def test_template_render_error(tlv_message_value: MessageValue) -> None:
+    tlv_message_value.build({"Tag": "Msg_Data", "Length": 2, "Value": b"\x01\x02"})
+    template = Template(tlv_message_value)
+    with pytest.raises(PyRFLXError, match=r'^error: "X" is not a field of this message$'):
+        template.render(X=1)
+    with pytest.raises(
+        PyRFLXError,
+        match=(
+            "^"
+            "error: cannot set value for field Tag\n"
+            "error: cannot assign different types: str != int"
+            "$"
+        ),
+    ):
+        template.render(Tag=1)
+
+
+def test_template_render_refinement(ipv4_packet_value: MessageValue) -> None:
+    ipv4_packet_value.parse(IPV4_ICMP_PACKET)
+    template = Template(ipv4_packet_value)
+    reply = b"\x00" + ICMP_ECHO_REQUEST[1:]
+    assert template.render(Payload=reply, TTL=1) == (
+        IPV4_ICMP_PACKET[:8] + b"\x01" + IPV4_ICMP_PACKET[9:20] + reply
+    )
+    with pytest.raises(PyRFLXError, match=r"^error: cannot set value for field Payload\n"):
+        template.render(Payload=b"\xff" + ICMP_ECHO_REQUEST[1:])
+    with pytest.raises(
+        PyRFLXError,
+        match=r"^error: cannot change field Protocol: layout of message would change$",
+    ):
+        template.render(Protocol="P_UDP")
+
+
+def test_template_invalid(tlv_message_value: MessageValue) -> None:
+    with pytest.raises(
+        PyRFLXError,
+        match=r"^error: cannot create template of invalid message: TLV::Message$",
+    ):
+        Template(tlv_message_value)
@@ -24,9 +24,12 @@ from rflx.pyrflx import (
     Bitstring,
     EnumValue,
     IntegerValue,
+    InternetChecksum,
     MessageValue,
     OpaqueValue,
     Package,
+    ParseResult,
+    ParseStatus,
     PyRFLX,
     SequenceValue,
     TypeValue,
@@ -34,6 +37,7 @@ from rflx.pyrflx import (
 )
 from rflx.pyrflx.error import PyRFLXError
 from tests.const import SPEC_DIR
+from tests.data import models
 
 
 def assert_bytestring_error(msg: MessageValue, msg_name: ID) -> None:
@@ -215,6 +219,136 @@ def test_message_value_change_field(tlv_message_value: MessageValue) -> None:
     assert "Value" in tlv_message_value.valid_fields
 
 
+def test_message_value_bitstring_cached(tlv_message_value: MessageValue) -> None:
+    tlv_message_value.set("Tag", "Msg_Data")
+    tlv_message_value.set("Length", 2)
+    tlv_message_value.set("Value", b"\x01\x02")
+    bits = tlv_message_value.bitstring
+    assert tlv_message_value.bitstring is bits
+    assert tlv_message_value.bytestring == b"\x01\x00\x02\x01\x02"
+    tlv_message_value.set("Value", b"\x03\x04")
+    assert tlv_message_value.bitstring is not bits
+    assert tlv_message_value.bytestring == b"\x01\x00\x02\x03\x04"
+    tlv_message_value.set("Length", 1)
+    tlv_message_value.set("Value", b"\x05")
+    assert tlv_message_value.bytestring == b"\x01\x00\x01\x05"
+    tlv_message_value.set("Tag", "Msg_Error")
+    assert tlv_message_value.bytestring == b"\x03"
+
+
+def test_message_value_parse_prefix(tlv_message_value: MessageValue) -> None:
+    assert tlv_message_value.parse_prefix(b"\x01\x00\x01\x05\x03\x00") == 32
+    assert tlv_message_value.get("Value") == b"\x05"
+    assert tlv_message_value.parse_prefix(Bitstring.from_bytes(b"\x03\x01")) == 8
+    assert tlv_message_value.get("Tag") == "TLV::Msg_Error"
+
+
+def test_message_value_try_parse(tlv_message_value: MessageValue) -> None:
+    assert tlv_message_value.clone().try_parse(b"\x02") == ParseResult(
+        ParseStatus.INVALID_VALUE,
+        "Tag",
+    )
+    assert tlv_message_value.clone().try_parse(b"\x01\x00") == ParseResult(
+        ParseStatus.TOO_SHORT,
+        "Length",
+    )
+    assert tlv_message_value.clone().try_parse(b"\x01\x00\x02\x01") == ParseResult(
+        ParseStatus.TOO_SHORT,
+        "Value",
+    )
+    result = tlv_message_value.try_parse(b"\x01\x00\x01\x05")
+    assert result.valid
+    assert tlv_message_value.get("Value") == b"\x05"
+
+
+def test_message_value_try_parse_refinement(ipv4_packet_value: MessageValue) -> None:
+    icmp = (
+        b"\x08\x00\xe1\x1e\x00\x11\x00\x01\x4a\xfc\x0d\x00\x00\x00\x00\x00"
+        b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f"
+        b"\x20\x21\x22\x23\x24\x25\x26\x27\x28\x29\x2a\x2b\x2c\x2d\x2e\x2f"
+        b"\x30\x31\x32\x33\x34\x35\x36\x37"
+    )
+    header = (
+        b"\x45\x00\x00\x4c\x00\x01\x00\x00\x40\x01\x00\x00\x7f\x00\x00\x01"
+        b"\x7f\x00\x00\x02"
+    )
+    assert ipv4_packet_value.clone().try_parse(
+        header[:2] + b"\x00\x04" + header[4:] + icmp,
+    ) == ParseResult(ParseStatus.CONDITION_FAILED, "Total_Length")
+    result = ipv4_packet_value.clone().try_parse(header + icmp[:1] + b"\x01" + icmp[2:])
+    assert result == ParseResult(
+        ParseStatus.NESTED_FAILURE,
+        "Payload",
+        ParseResult(ParseStatus.INVALID_VALUE, "Code_Zero"),
+    )
+    assert result.path == ("Payload", "Code_Zero")
+    assert ipv4_packet_value.try_parse(header + icmp).valid
+    payload = ipv4_packet_value.get("Payload")
+    assert isinstance(payload, MessageValue)
+    assert payload.get("Identifier") == 17
+
+
+def test_message_value_new() -> None:
+    message = MessageValue(models.tlv_message())
+    assert message.accessible_fields == ["Tag"]
+    message.set("Tag", "Msg_Data")
+    message.set("Length", 1)
+    message.set("Value", b"\x01")
+    assert message.valid_message
+    assert message.bytestring == b"\x01\x00\x01\x01"
+    parsed = MessageValue(models.tlv_message())
+    parsed.parse(b"\x01\x00\x01\x01")
+    assert parsed.valid_message
+    assert parsed.get("Value") == b"\x01"
+
+
+def test_message_value_clone_initialized(tlv_message_value: MessageValue) -> None:
+    tlv_message_value.set("Tag", "Msg_Data")
+    tlv_message_value.set("Length", 1)
+    clone = tlv_message_value.clone()
+    assert clone.accessible_fields == ["Tag"]
+    assert clone.valid_fields == []
+    clone.set("Tag", "Msg_Data")
+    clone.set("Length", 2)
+    clone.set("Value", b"\x01\x02")
+    assert clone.bytestring == b"\x01\x00\x02\x01\x02"
+    assert tlv_message_value.accessible_fields == ["Tag", "Length", "Value"]
+
+
+def test_message_value_clone_shared(tlv_message_value: MessageValue) -> None:
+    first = tlv_message_value.clone()
+    second = first.clone()
+    assert first._fields is second._fields
+    assert first.accessible_fields == ["Tag"]
+    first.set("Tag", "Msg_Data")
+    first.set("Length", 1)
+    first.set("Value", b"\x01")
+    assert first._fields is not second._fields
+    assert first.bytestring == b"\x01\x00\x01\x01"
+    assert second.accessible_fields == ["Tag"]
+    assert second.valid_fields == []
+    second.parse(b"\x03")
+    assert second.get("Tag") == "TLV::Msg_Error"
+    assert first.get("Tag") == "TLV::Msg_Data"
+    third = first.clone()
+    assert third.valid_fields == []
+    assert third.accessible_fields == ["Tag"]
+    assert tlv_message_value.valid_fields == []
+
+
+def test_message_value_slots(tlv_message_value: MessageValue) -> None:
+    tlv_message_value.set("Tag", "Msg_Data")
+    tlv_message_value.set("Length", 1)
+    tlv_message_value.set("Value", b"\x01")
+    clone = tlv_message_value.clone()
+    for message in [tlv_message_value, clone]:
+        assert not hasattr(message, "__dict__")
+        for field in message._fields.values():
+            assert not hasattr(field, "__dict__")
+            assert not hasattr(field.typeval, "__dict__")
+        assert not hasattr(message.bitstring, "__dict__")
+
+
 def test_message_value_binary_length(tlv_message_value: MessageValue) -> None:
     tlv_message_value.set("Tag", "Msg_Data")
     tlv_message_value.set("Length", 8)
@@ -278,6 +412,52 @@ def test_message_value_invalid_value(tlv_message_value: MessageValue) -> None:
         tlv_message_value.set("Length", "blubb")
 
 
+def test_message_value_build(tlv_message_value: MessageValue) -> None:
+    tlv_message_value.build({"Tag": "Msg_Data", "Length": 2, "Value": b"\x01\x02"})
+    assert tlv_message_value.valid_message
+    assert tlv_message_value.valid_fields == ["Tag", "Length", "Value"]
+    assert tlv_message_value.bytestring == b"\x01\x00\x02\x01\x02"
+    tlv_message_value.set("Value", b"\x03\x04")
+    assert tlv_message_value.bytestring == b"\x01\x00\x02\x03\x04"
+
+
+def test_message_value_build_incomplete(tlv_message_value: MessageValue) -> None:
+    tlv_message_value.build({"Tag": "Msg_Data", "Length": 2})
+    assert not tlv_message_value.valid_message
+    assert tlv_message_value.valid_fields == ["Tag", "Length"]
+    tlv_message_value.set("Value", b"\x01\x02")
+    assert tlv_message_value.bytestring == b"\x01\x00\x02\x01\x02"
+
+
+def test_message_value_build_invalid(tlv_message_value: MessageValue) -> None:
+    with pytest.raises(PyRFLXError, match=r'^error: "X" is not a field of this message$'):
+        tlv_message_value.clone().build({"Tag": "Msg_Data", "X": 1})
+    message = tlv_message_value.clone()
+    with pytest.raises(
+        PyRFLXError,
+        match=(
+            "^"
+            "error: cannot set value for field Tag\n"
+            "error: cannot assign different types: str != int"
+            "$"
+        ),
+    ):
+        message.build({"Tag": 1, "Length": 1})
+    assert message.valid_fields == []
+    with pytest.raises(PyRFLXError, match=r"^error: cannot access field Length$"):
+        tlv_message_value.clone().build({"Tag": "Msg_Error", "Length": 1})
+    with pytest.raises(
+        PyRFLXError,
+        match=(
+            "^"
+            "error: cannot set value for field Value\n"
+            "error: invalid data size: input size is 8 while expected input size is 16"
+            "$"
+        ),
+    ):
+        tlv_message_value.clone().build({"Tag": "Msg_Data", "Length": 2, "Value": b"\x01"})
+
+
 def test_message_value_next(tlv_message_value: MessageValue) -> None:
     tlv_message_value.set("Tag", "Msg_Data")
     assert tlv_message_value._next_field(INITIAL.name) == "Tag"
@@ -359,6 +539,63 @@ def test_message_value_parse(ethernet_frame_value: MessageValue) -> None:
     assert ethernet_frame_value.bytestring == test_bytes
 
 
+@pytest.mark.parametrize(
+    ("package", "message", "data"),
+    [
+        (
+            "ICMP",
+            "Message",
+            b"\x08\x00\xe1\x1e\x00\x11\x00\x01\x4a\xfc\x0d\x00\x00\x00\x00\x00\x10\x11",
+        ),
+        (
+            "IPv4",
+            "Packet",
+            b"\x45\x00\x00\x26\x00\x01\x00\x00\x40\x01\x00\x00\x7f\x00\x00\x01"
+            b"\x7f\x00\x00\x01\x08\x00\xe1\x1e\x00\x11\x00\x01\x4a\xfc\x0d\x00"
+            b"\x00\x00\x00\x00\x10\x11",
+        ),
+        (
+            "Ethernet",
+            "Frame",
+            b"\xe0\x28\x6d\x39\x80\x1e\x1c\x1b\x0d\xe0\xd8\xa8\x08\x00\x45\x00"
+            b"\x00\x4c\x1f\x04\x40\x00\x40\x01\xe1\x6a\xc0\xa8\xbc\x3d\xac\xd9"
+            b"\x10\x83\x08\x00\xe1\x26\x00\x09\x00\x01\x4a\xfc\x0d\x00\x00\x00"
+            b"\x00\x00\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d"
+            b"\x1e\x1f\x20\x21\x22\x23\x24\x25\x26\x27\x28\x29\x2a\x2b\x2c\x2d"
+            b"\x2e\x2f\x30\x31\x32\x33\x34\x35\x36\x37",
+        ),
+    ],
+)
+def test_message_value_parse_plan(pyrflx_: PyRFLX, package: str, message: str, data: bytes) -> None:
+    planned = pyrflx_.package(package).new_message(message)
+    assert planned._get_parse_plan() is not None
+    generic = pyrflx_.package(package).new_message(message)
+    generic._parse_plan = None
+    generic._parse_plan_unsupported = True
+
+    run = planned._run_plan(Bitstring.from_bytes(data))
+    assert run is not None
+    assert not run[0].failed
+
+    planned.parse(data)
+    generic.parse(data)
+
+    assert planned._path == generic._path
+    assert planned.accessible_fields == generic.accessible_fields
+    assert planned._fields == generic._fields
+    assert planned._simplified_mapping == generic._simplified_mapping
+    assert planned.valid_message
+    assert planned.bytestring == data
+    assert planned.as_json() == generic.as_json()
+
+
+def test_message_value_parse_plan_shared(icmp_package: Package) -> None:
+    assert (
+        icmp_package.new_message("Message")._get_parse_plan()
+        is icmp_package.new_message("Message")._get_parse_plan()
+    )
+
+
 def test_message_value_parse_incorrect_nested_message(ethernet_frame_value: MessageValue) -> None:
     incorrect_message = (
         b"\xff\xff\xff\xff\xff\xff\x00\x00\x00\x00\x00\x00"
@@ -501,6 +738,16 @@ def test_enum_value_parse(enum_value: EnumValue) -> None:
         enum_value.parse(Bitstring("1111"))
 
 
+def test_enum_value_clone(enum_value: EnumValue) -> None:
+    enum_value.assign("One")
+    clone = enum_value.clone()
+    assert not clone.initialized
+    assert clone.literals is enum_value.literals
+    clone.assign("Two")
+    assert clone.value == "Test::Two"
+    assert enum_value.value == "Test::One"
+
+
 @pytest.fixture(name="enum_value_imported")
 def fixture_enum_value_imported() -> EnumValue:
     return EnumValue(
@@ -642,6 +889,19 @@ def test_sequence_messages(
     assert message_sequence_value.bytestring == b"\x02\x05\x06"
 
 
+def test_sequence_messages_changed(
+    message_sequence_value: MessageValue,
+    sequence_message_package: Package,
+) -> None:
+    sequence_element = sequence_message_package.new_message("Sequence_Element")
+    sequence_element.set("Byte", 5)
+    message_sequence_value.set("Length", 1)
+    message_sequence_value.set("Sequence_Field", [sequence_element])
+    assert message_sequence_value.bytestring == b"\x01\x05"
+    sequence_element.set("Byte", 6)
+    assert message_sequence_value.bytestring == b"\x01\x06"
+
+
 @pytest.fixture(name="sequence_type_package", scope="session")
 def fixture_sequence_type_package(pyrflx_: PyRFLX) -> Package:
     return pyrflx_.package("Sequence_Type")
@@ -703,6 +963,47 @@ def test_sequence_parse_from_bytes(
     sequence_message_value = message_sequence_value.clone()
     sequence_message_value.parse(b"\x02\x05\x06")
     assert sequence_message_value.bytestring == b"\x02\x05\x06"
+    sequence_message_value.parse(b"\x02\x07\x08")
+    assert sequence_message_value.bytestring == b"\x02\x07\x08"
+    sequence = sequence_message_value.get("Sequence_Field")
+    assert isinstance(sequence, list)
+    assert len(sequence) == 2
+
+
+def test_sequence_element_changed_in_place(sequence_type_foo_value: MessageValue) -> None:
+    sequence_type_foo_value.parse(b"\x03\x05\x06\x07")
+    assert sequence_type_foo_value.bytestring == b"\x03\x05\x06\x07"
+    sequence = sequence_type_foo_value.get("Bytes")
+    assert isinstance(sequence, list)
+    sequence[0].assign(9)
+    assert sequence_type_foo_value.bytestring == b"\x03\x09\x06\x07"
+
+
+def test_sequence_not_walked_on_repeated_reads(sequence_type_foo_value: MessageValue) -> None:
+    class CountingList(list[TypeValue]):
+        iterations = 0
+
+        def __iter__(self) -> abc.Iterator[TypeValue]:
+            self.iterations += 1
+            return super().__iter__()
+
+    elements = CountingList()
+    for i in range(255):
+        element = IntegerValue(UnsignedInteger("Sequence_Type::Byte_One", expr.Number(8)))
+        element.assign(i)
+        elements.append(element)
+    sequence_type_foo_value.set("Length", 255)
+    sequence_type_foo_value.set("Bytes", elements)
+    assert sequence_type_foo_value.bytestring == b"\xff" + bytes(range(255))
+
+    iterations = elements.iterations
+    for _ in range(100):
+        assert sequence_type_foo_value.bytestring == b"\xff" + bytes(range(255))
+    assert elements.iterations == iterations
+
+    elements[0].assign(255)
+    assert sequence_type_foo_value.bytestring == b"\xff\xff" + bytes(range(1, 255))
+    assert elements.iterations == iterations + 1
 
 
 def test_sequence_assign_invalid(
@@ -930,6 +1231,100 @@ def test_checksum_auto_change_field(icmp_checksum_message_value: MessageValue) -
     assert icmp_checksum_message_value.valid_message
 
 
+def test_checksum_build(icmp_checksum_message_value: MessageValue) -> None:
+    test_data = (
+        b"\x47\xb4\x67\x5e\x00\x00\x00\x00"
+        b"\x4a\xfc\x0d\x00\x00\x00\x00\x00\x10\x11\x12\x13\x14\x15\x16\x17"
+        b"\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f\x20\x21\x22\x23\x24\x25\x26\x27"
+        b"\x28\x29\x2a\x2b\x2c\x2d\x2e\x2f\x30\x31\x32\x33\x34\x35\x36\x37"
+    )
+    icmp_checksum_message_value.set_checksum_function({"Checksum": icmp_checksum_function})
+    icmp_checksum_message_value.build(
+        {
+            "Tag": "Echo_Request",
+            "Code_Zero": 0,
+            "Identifier": 5,
+            "Sequence_Number": 1,
+            "Data": test_data,
+        },
+    )
+    assert icmp_checksum_message_value.get("Checksum") == 12824
+    assert icmp_checksum_message_value.bytestring == b"\x08\x00\x32\x18\x00\x05\x00\x01" + test_data
+    assert icmp_checksum_message_value.valid_message
+
+
+def test_checksum_incremental(icmp_checksum_message_value: MessageValue) -> None:
+    test_data = (
+        b"\x47\xb4\x67\x5e\x00\x00\x00\x00"
+        b"\x4a\xfc\x0d\x00\x00\x00\x00\x00\x10\x11\x12\x13\x14\x15\x16\x17"
+        b"\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f\x20\x21\x22\x23\x24\x25\x26\x27"
+        b"\x28\x29\x2a\x2b\x2c\x2d\x2e\x2f\x30\x31\x32\x33\x34\x35\x36\x37"
+    )
+    changes: list[abc.Sequence[tuple[int, int]]] = []
+
+    class Checksum(InternetChecksum):
+        def update(
+            self,
+            checksum: int,
+            old: bytes,
+            new: bytes,
+            changes_: abc.Sequence[tuple[int, int]],
+            **kwargs: object,
+        ) -> int:
+            changes.append(changes_)
+            return super().update(checksum, old, new, changes_, **kwargs)
+
+    icmp_checksum_message_value.set_checksum_function({"Checksum": Checksum()})
+    icmp_checksum_message_value.build(
+        {
+            "Tag": "Echo_Request",
+            "Code_Zero": 0,
+            "Identifier": 5,
+            "Sequence_Number": 1,
+            "Data": test_data,
+        },
+    )
+    assert icmp_checksum_message_value.get("Checksum") == 12824
+    icmp_checksum_message_value.set("Sequence_Number", 2)
+    icmp_checksum_message_value.set("Data", test_data)
+    assert icmp_checksum_message_value.get("Checksum") == 12823
+    assert any((6, 8) in c for c in changes)
+    assert icmp_checksum_message_value.bytestring == b"\x08\x00\x32\x17\x00\x05\x00\x02" + test_data
+    assert icmp_checksum_message_value.valid_message
+
+
+def test_checksum_incremental_clone(icmp_checksum_message_value: MessageValue) -> None:
+    updates: list[bytes] = []
+
+    class Checksum(InternetChecksum):
+        def update(
+            self,
+            checksum: int,
+            old: bytes,
+            new: bytes,
+            changes: abc.Sequence[tuple[int, int]],
+            **kwargs: object,
+        ) -> int:
+            updates.append(old)
+            return super().update(checksum, old, new, changes, **kwargs)
+
+    icmp_checksum_message_value.set_checksum_function({"Checksum": Checksum()})
+    values = {
+        "Tag": "Echo_Request",
+        "Code_Zero": 0,
+        "Identifier": 5,
+        "Sequence_Number": 1,
+        "Data": bytes(8),
+    }
+    first = icmp_checksum_message_value.clone()
+    first.build(values)
+    second = icmp_checksum_message_value.clone()
+    second.build({**values, "Sequence_Number": 2})
+    assert first.get("Checksum") == 0xF7F9
+    assert second.get("Checksum") == 0xF7F8
+    assert updates == []
+
+
 def test_checksum_parse(icmp_checksum_message_value: MessageValue) -> None:
     test_data = (
         b"\x08\x00\x32\x18\x00\x05\x00\x01\x47\xb4\x67\x5e\x00\x00\x00\x00"
@@ -3945,6 +3945,117 @@ def test_parse_order_of_include_paths(tmp_path: Path) -> None:
         parser.Parser().parse(b, a)
 
 
+def test_parse_concurrently(tmp_path: Path) -> None:
+    (tmp_path / "a.rflx").write_text(
+        "with B;\nwith C;\n\npackage A is\n\n   type T is unsigned 8;\n\nend A;\n",
+    )
+    (tmp_path / "b.rflx").write_text(
+        "with D;\n\npackage B is\n\n   type T is unsigned 16;\n\nend B;\n",
+    )
+    (tmp_path / "c.rflx").write_text(
+        "with D;\n\npackage C is\n\n   type T is unsigned 24;\n\nend C;\n",
+    )
+    (tmp_path / "d.rflx").write_text("package D is\n\n   type T is unsigned 32;\n\nend D;\n")
+    (tmp_path / "e.rflx").write_text("package E is\n\n   type T is unsigned 64;\n\nend E;\n")
+
+    sequential = parser.Parser()
+    sequential.parse(tmp_path / "a.rflx", tmp_path / "e.rflx")
+    expected = sequential.create_unchecked_model()
+
+    concurrent = parser.Parser(workers=2)
+    concurrent.parse(tmp_path / "a.rflx", tmp_path / "e.rflx")
+    result = concurrent.create_unchecked_model()
+
+    assert [str(d.identifier) for d in result.declarations] == [
+        str(d.identifier) for d in expected.declarations
+    ]
+    assert result.declarations == expected.declarations
+    assert result.style_checks == expected.style_checks
+    assert not result.error.entries
+
+
+def test_parse_concurrently_error(tmp_path: Path) -> None:
+    (tmp_path / "a.rflx").write_text(
+        "with B;\nwith X;\nwith C;\n\npackage A is\n\n   type T is unsigned 8;\n\nend A;\n",
+    )
+    (tmp_path / "b.rflx").write_text("package B is\n\n   type T is unsigned 16; \n\nend B;\n")
+    (tmp_path / "c.rflx").write_text("package D is\n\n   type T is unsigned 24;\n\nend D;\n")
+    (tmp_path / "e.rflx").write_text("package E is\n\n   type T is unsigned 0x;\n\nend E;\n")
+
+    errors = []
+    for workers in [1, 2]:
+        with pytest.raises(RecordFluxError) as e:
+            parser.Parser(workers=workers).parse(tmp_path / "a.rflx", tmp_path / "e.rflx")
+        errors.append(str(e.value))
+
+    assert errors[0] == errors[1]
+    assert "trailing whitespace" in errors[0]
+    assert 'cannot find specification "X"' in errors[0]
+    assert 'source file name does not match the package name "D"' in errors[0]
+
+
+def test_parse_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    a = tmp_path / "a.rflx"
+    a.write_text("with B;\n\npackage A is\n\n   type T is unsigned 8;\n\nend A;\n")
+    b = tmp_path / "b.rflx"
+    b.write_text("package B is\n\n   type T is unsigned 16;\n\nend B;\n")
+    cache_file = tmp_path / "cache" / "verification.sqlite"
+
+    p = parser.Parser(model.Cache(cache_file))
+    p.parse(a)
+    expected = p.create_unchecked_model()
+
+    def analysis_context() -> None:
+        raise AssertionError("unexpected parsing of specification file")
+
+    monkeypatch.setattr(lang, "AnalysisContext", analysis_context)
+
+    p = parser.Parser(model.Cache(cache_file))
+    p.parse(a)
+    unchecked_model = p.create_unchecked_model()
+
+    assert unchecked_model.declarations == expected.declarations
+    assert unchecked_model.style_checks == expected.style_checks
+    assert not unchecked_model.error.entries
+    assert not p.specifications
+
+    b.write_text("package B is\n\n   type T is unsigned 32;\n\nend B;\n")
+
+    with pytest.raises(AssertionError, match=r"^unexpected parsing of specification file$"):
+        parser.Parser(model.Cache(cache_file)).parse(a)
+
+
+def test_parse_cache_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    a = tmp_path / "b.rflx"
+    a.write_text("package A is\n\n   type T is unsigned 8;\n\nend A;\n")
+    cache_file = tmp_path / "cache" / "verification.sqlite"
+
+    p = parser.Parser(model.Cache(cache_file))
+    with pytest.raises(
+        RecordFluxError,
+        match=r'error: source file name does not match the package name "A"',
+    ):
+        p.parse(a)
+    p.create_unchecked_model()
+
+    def analysis_context() -> None:
+        raise AssertionError("unexpected parsing of specification file")
+
+    monkeypatch.setattr(lang, "AnalysisContext", analysis_context)
+
+    p = parser.Parser(model.Cache(cache_file))
+    with pytest.raises(
+        RecordFluxError,
+        match=r'error: source file name does not match the package name "A"',
+    ):
+        p.parse(a)
+    assert [str(d.identifier) for d in p.create_unchecked_model().declarations] == [
+        "__BUILTINS__::Boolean",
+        "__INTERNAL__::Opaque",
+        "A::T",
+    ]
+
+
 def test_parse_non_existent_dependencies(tmp_path: Path) -> None:
     a = tmp_path / "a" / "a.rflx"
     a.parent.mkdir()
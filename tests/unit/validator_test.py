@@ -323,11 +323,13 @@ def test_validate_output_not_writable(tmp_path: Path) -> None:
         )
 
 
-def test_validate_abort_on_error() -> None:
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_abort_on_error(workers: int) -> None:
     validator = Validator(
         [SPEC_DIR / "in_ethernet.rflx"],
         CHECKSUM_MODULE,
         NeverVerify(),
+        workers=workers,
     )
     with pytest.raises(
         ValidationError,
@@ -374,7 +376,8 @@ def test_validate_positive_only() -> None:
     )
 
 
-def test_validate_positive_output(tmp_path: Path) -> None:
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_positive_output(tmp_path: Path, workers: int) -> None:
     """
     Test the JSON output on correctly classified samples.
 
@@ -385,6 +388,7 @@ def test_validate_positive_output(tmp_path: Path) -> None:
         [SPEC_DIR / "in_ethernet.rflx"],
         CHECKSUM_MODULE,
         NeverVerify(),
+        workers=workers,
     )
     validator.validate(
         ID("Ethernet::Frame"),
@@ -474,11 +478,13 @@ def test_validate_negative_output(tmp_path: Path) -> None:
     )
 
 
-def test_validate_coverage(capfd: pytest.CaptureFixture[str]) -> None:
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_coverage(capfd: pytest.CaptureFixture[str], workers: int) -> None:
     validator = Validator(
         [SPEC_DIR / "ethernet.rflx"],
         CHECKSUM_MODULE,
         NeverVerify(),
+        workers=workers,
     )
     validator.validate(
         ID("Ethernet::Frame"),
@@ -647,6 +653,9 @@ def test_validate_message_original_and_parsed_not_equal() -> None:
         validation_result.parser_error
         == "message parsed by PyRFLX is shorter than the original message"
     )
+    assert validation_result.parsed_bytes is not None
+    assert validation_result.original_message.startswith(validation_result.parsed_bytes)
+    assert validation_result.parsed_bytes != validation_result.original_message
 
 
 def test_validate_message_parameterized_message() -> None:
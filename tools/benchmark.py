@@ -3,26 +3,63 @@
 import argparse
 import cProfile
 import sys
-from collections.abc import Generator
+import tracemalloc
+from collections.abc import Generator, Iterator
 from pathlib import Path
 from time import perf_counter
 
 from rflx.model import NeverVerify
-from rflx.pyrflx import PyRFLX
+from rflx.pyrflx import (
+    Bitstring,
+    InternetChecksum,
+    LazyMessage,
+    MessageValue,
+    PyRFLX,
+    PyRFLXError,
+    Template,
+)
+
+CORPORA_DIR = Path("tests/examples/data")
+
+WORKLOADS = {
+    "generate": "messages",
+    "build": "messages",
+    "template": "messages",
+    "dissect": "field values",
+    "parse": "messages",
+    "parse_checked": "messages",
+    "filter": "messages",
+    "filter_lazy": "messages",
+    # The parse plan, which detects invalid messages without raising an exception, is only used
+    # with runtime checks enabled
+    "reject": "messages",
+    "reject_result": "messages",
+}
 
 
 class Benchmark:
-    def __init__(self) -> None:
+    def __init__(self, checked: bool = False) -> None:
         print("Loading...")  # noqa: T201
         start = perf_counter()
+        self.__checked = checked
         spec_dir = Path("examples/specs")
         self.__pyrflx = PyRFLX.from_specs(
-            [str(spec_dir / "ipv4.rflx"), str(spec_dir / "icmp.rflx")],
+            [
+                str(spec_dir / "ipv4.rflx"),
+                str(spec_dir / "icmp.rflx"),
+                str(spec_dir / "udp.rflx"),
+                str(spec_dir / "in_ipv4.rflx"),
+            ],
             NeverVerify(),
-            skip_message_verification=True,
+            skip_message_verification=not checked,
         )
         self.__ipv4 = self.__pyrflx.package("IPv4")
         self.__icmp = self.__pyrflx.package("ICMP")
+        self.__ipv4.set_checksum_functions({"Packet": {"Header_Checksum": InternetChecksum()}})
+        self.__icmp.set_checksum_functions({"Message": {"Checksum": InternetChecksum()}})
+        # Checksums are calculated automatically if runtime checks are enabled
+        self.__checksum = {} if checked else {"Checksum": 0}
+        self.__header_checksum = {} if checked else {"Header_Checksum": 0}
         print(f"Loaded in {perf_counter() - start} seconds")  # noqa: T201
 
     def generate(self, count: int = 2**16) -> Generator[bytes, None, None]:
@@ -33,7 +70,8 @@ class Benchmark:
             pkt = self.__ipv4.new_message("Packet")
             msg.set("Tag", "Echo_Request")
             msg.set("Code_Zero", 0)
-            msg.set("Checksum", 0)
+            for field, value in self.__checksum.items():
+                msg.set(field, value)
             msg.set("Identifier", 0)
             msg.set("Sequence_Number", ident)
             msg.set("Data", bytes(8))
@@ -50,19 +88,216 @@ class Benchmark:
             pkt.set("Fragment_Offset", 0)
             pkt.set("TTL", 64)
             pkt.set("Protocol", "Protocol_Numbers.ICMP")
-            pkt.set("Header_Checksum", 0)
+            for field, value in self.__header_checksum.items():
+                pkt.set(field, value)
             pkt.set("Source", 0)
             pkt.set("Destination", 0)
             pkt.set("Options", [])
             pkt.set("Payload", msg.bytestring)
             yield pkt.bytestring
 
-    def run(self, duration: int = 1) -> None:
+    def build(self, count: int = 2**16) -> Generator[bytes, None, None]:
+        """Generate the same messages as `generate` by setting all fields at once."""
+        if count > 2**16:
+            raise ValueError
+        for ident in range(count):
+            msg = self.__build_icmp(ident)
+            yield self.__build_ipv4(1, msg.bytestring).bytestring
+
+    def template(self, count: int = 2**16) -> Generator[bytes, None, None]:
+        """Generate the same messages as `generate` by changing the fields of templates."""
+        if count > 2**16:
+            raise ValueError
+        msg = self.__build_icmp(0)
+        msg.update_checksums()
+        icmp = Template(msg)
+        pkt = self.__build_ipv4(1, msg.bytestring)
+        pkt.update_checksums()
+        ipv4 = Template(pkt)
+        for ident in range(count):
+            yield ipv4.render(Payload=icmp.render(Sequence_Number=ident))
+
+    def __build_icmp(self, ident: int) -> MessageValue:
+        return self.__icmp.build(
+            "Message",
+            Tag="Echo_Request",
+            Code_Zero=0,
+            Identifier=0,
+            Sequence_Number=ident,
+            Data=bytes(8),
+            **self.__checksum,
+        )
+
+    def __build_ipv4(self, ident: int, payload: bytes) -> MessageValue:
+        return self.__ipv4.build(
+            "Packet",
+            Version=4,
+            IHL=5,
+            DSCP=0,
+            ECN=0,
+            Total_Length=20 + len(payload),
+            Identification=ident,
+            Flag_R="False",
+            Flag_DF="False",
+            Flag_MF="False",
+            Fragment_Offset=0,
+            TTL=64,
+            Protocol="Protocol_Numbers.ICMP",
+            Source=0,
+            Destination=0,
+            Options=[],
+            Payload=payload,
+            **self.__header_checksum,
+        )
+
+    def dissect(self, count: int = 2**16) -> Generator[int, None, None]:
+        """Extract the header fields and the payload of a 1500 byte IPv4 packet."""
+        header = next(self.generate(1))[:20]
+        packet = header + bytes(1480)
+        # Sizes of the IPv4 header fields from Version to Destination
+        field_sizes = [4, 4, 6, 2, 16, 16, 1, 1, 1, 13, 8, 8, 16, 32, 32]
+        for _ in range(count):
+            bits = Bitstring.from_bytes(packet)
+            first = 0
+            for size in field_sizes:
+                yield int(bits[first : first + size])
+                first += size
+            yield len(bytes(bits[first:]))
+
+    def parse(self, count: int = 2**16) -> Generator[MessageValue, None, None]:
+        """Parse an IPv4 packet containing an ICMP message."""
+        packet = next(self.generate(1))
+        for _ in range(count):
+            pkt = self.__ipv4.new_message("Packet")
+            pkt.parse(packet)
+            yield pkt
+
+    def parse_checked(self, count: int = 2**16) -> Iterator[MessageValue]:
+        """Parse an IPv4 packet containing an ICMP message using the compiled parse plan."""
+        # The parse plan is only used with runtime checks enabled. The checked specifications are
+        # loaded before the returned generator is started, so that loading is not measured.
+        benchmark = self if self.__checked else Benchmark(checked=True)
+        return benchmark.parse(count)
+
+    def filter(self, count: int = 2**16) -> Generator[object, None, None]:
+        """Read the protocol, the destination and the ICMP tag of a parsed IPv4 packet."""
+        packet = next(self.generate(1))
+        for _ in range(count):
+            pkt = self.__ipv4.new_message("Packet")
+            pkt.parse(packet)
+            pkt.get("Protocol")
+            pkt.get("Destination")
+            msg = pkt.get("Payload")
+            assert isinstance(msg, MessageValue)
+            yield msg.get("Tag")
+
+    def filter_lazy(self, count: int = 2**16) -> Generator[object, None, None]:
+        """Read the protocol, the destination and the ICMP tag of a lazily parsed IPv4 packet."""
+        packet = next(self.generate(1))
+        prototype = self.__ipv4.new_message("Packet")
+        for _ in range(count):
+            pkt = prototype.parse_lazy(packet)
+            pkt.get("Protocol")
+            pkt.get("Destination")
+            msg = pkt.get("Payload")
+            assert isinstance(msg, LazyMessage)
+            yield msg.get("Tag")
+
+    def reject(self, count: int = 2**16) -> Generator[object, None, None]:
+        """Parse invalid IPv4 packets and catch the raised errors."""
+        packets = self.__invalid_packets()
+        prototype = self.__ipv4.new_message("Packet")
+        for i in range(count):
+            pkt = prototype.clone()
+            try:
+                pkt.parse(packets[i % len(packets)])
+            except PyRFLXError as e:
+                yield e
+            else:
+                yield pkt
+
+    def reject_result(self, count: int = 2**16) -> Generator[object, None, None]:
+        """Parse invalid IPv4 packets and check the returned results."""
+        packets = self.__invalid_packets()
+        prototype = self.__ipv4.new_message("Packet")
+        for i in range(count):
+            result = prototype.clone().try_parse(packets[i % len(packets)])
+            assert not result.valid
+            yield result
+
+    def __invalid_packets(self) -> list[bytes]:
+        """Return IPv4 packets which are too short or contain invalid values."""
+        packet = next(self.generate(1))
+        return [
+            # Truncated header
+            packet[:10],
+            # Total length smaller than header length
+            packet[:2] + b"\x00\x04" + packet[4:],
+            # Invalid code in ICMP message
+            packet[:21] + b"\x01" + packet[22:],
+        ]
+
+    def allocations(self, workload: str = "generate", count: int = 1000) -> None:
+        """Determine the peak of the memory allocated while processing a single item."""
+        items = getattr(self, workload)(count)
+        total = 0
+        tracemalloc.start()
+        for _ in range(count):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            next(items)
+            total += tracemalloc.get_traced_memory()[1] - current
+        tracemalloc.stop()
+        print(  # noqa: T201
+            f"\nAllocated {total / count:.0f} bytes at peak per {WORKLOADS[workload][:-1]}",
+        )
+
+    def footprint(self, count: int = 10000) -> float:
+        """Determine the memory retained by parsed messages and allocated by cloning them."""
+        corpus = [
+            (prototype, p.read_bytes())
+            for prototype in [
+                self.__ipv4.new_message("Packet"),
+                self.__icmp.new_message("Message"),
+            ]
+            for p in sorted(
+                (
+                    CORPORA_DIR
+                    / str(prototype.package).lower()
+                    / prototype.name.lower()
+                    / "valid"
+                ).glob("*.raw"),
+            )
+        ]
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+        messages = []
+        for i in range(count):
+            prototype, data = corpus[i % len(corpus)]
+            message = prototype.clone()
+            message.parse(data)
+            messages.append(message)
+        parsed, _ = tracemalloc.get_traced_memory()
+        clones = [m.clone() for m in messages]
+        cloned, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(clones) == count
+        retained = (parsed - start) / count
+        print(  # noqa: T201
+            f"\nRetained {retained:.0f} bytes per parsed message"
+            f"\nAllocated {(cloned - parsed) / count:.0f} bytes per clone of a parsed message",
+        )
+        return retained
+
+    def run(self, workload: str = "generate", duration: int = 1) -> None:
+        items = getattr(self, workload)()
         start = perf_counter()
-        for i, _ in enumerate(self.generate()):
+        for i, _ in enumerate(items):
             runtime = perf_counter() - start
             if runtime >= duration:
-                print(f"\nGenerated {i/runtime:.1f} messages per second")  # noqa: T201
+                print(  # noqa: T201
+                    f"\nProcessed {i/runtime:.1f} {WORKLOADS[workload]} per second",
+                )
                 return
 
 
@@ -71,15 +306,52 @@ if __name__ == "__main__":
     parser.add_argument("-p", "--profile", action="store_true", help="run profiler")
     parser.add_argument("-o", "--outfile", type=str, help="print profiler output to file")
     parser.add_argument("-d", "--duration", type=int, default=1, help="duration of benchmark")
+    parser.add_argument(
+        "-c",
+        "--checked",
+        action="store_true",
+        help="enable runtime checks of messages",
+    )
+    parser.add_argument(
+        "-a",
+        "--allocations",
+        action="store_true",
+        help="measure memory allocations instead of throughput",
+    )
+    parser.add_argument(
+        "-f",
+        "--footprint",
+        action="store_true",
+        help=f"measure memory retained by messages parsed from samples in {CORPORA_DIR}",
+    )
+    parser.add_argument(
+        "-l",
+        "--limit",
+        type=int,
+        help="fail if more bytes than the limit are retained per message (with --footprint)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workload",
+        choices=WORKLOADS,
+        default="generate",
+        help="benchmarked workload (default: %(default)s)",
+    )
     args = parser.parse_args(sys.argv[1:])
-    benchmark = Benchmark()
+    benchmark = Benchmark(args.checked)
     if args.profile:
         print("Profiling...")  # noqa: T201
 
         def run() -> None:
-            for _ in benchmark.generate(100):
+            for _ in getattr(benchmark, args.workload)(100):
                 pass
 
         cProfile.run("run()", args.outfile, "tottime")
+    elif args.footprint:
+        retained = benchmark.footprint()
+        if args.limit is not None and retained > args.limit:
+            sys.exit(f"Retained memory per message exceeds limit of {args.limit} bytes")
+    elif args.allocations:
+        benchmark.allocations(args.workload)
     else:
-        benchmark.run(args.duration)
+        benchmark.run(args.workload, args.duration)
@@ -0,0 +1,89 @@
+#!/usr/bin/env -S python3 -O
+
+import argparse
+import cProfile
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from rflx import process_pool
+from rflx.model import AlwaysVerify
+from rflx.specification import Parser
+
+SPEC_DIR = Path("examples/specs")
+
+SPECS = {
+    "http_2": [SPEC_DIR / "http_2.rflx"],
+    "tls": [
+        SPEC_DIR / "tls_alert.rflx",
+        SPEC_DIR / "tls_handshake.rflx",
+        SPEC_DIR / "tls_heartbeat.rflx",
+        SPEC_DIR / "tls_record.rflx",
+    ],
+    "ipv4": [SPEC_DIR / "ipv4.rflx"],
+}
+
+
+def check(specs: list[Path], workers: int) -> None:
+    parser = Parser(AlwaysVerify(), workers=workers)
+    parser.parse(*specs)
+    parser.create_model()
+
+
+def run(names: list[str], workers: int, repetitions: int) -> None:
+    total = 0.0
+    for name in names:
+        runtimes = []
+        for _ in range(repetitions):
+            start = perf_counter()
+            check(SPECS[name], workers)
+            runtimes.append(perf_counter() - start)
+        total += min(runtimes)
+        print(f"{name}: {min(runtimes):.2f} seconds")  # noqa: T201
+    print(f"Total: {total:.2f} seconds")  # noqa: T201
+    statistics = process_pool.statistics()
+    print(  # noqa: T201
+        f"Process pools: {statistics.starts} started in {statistics.startup_time:.2f} seconds, "
+        f"reused {statistics.reuses} times, saved about {statistics.saved_time:.2f} seconds",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the time needed for checking and verifying specifications.",
+    )
+    parser.add_argument("-p", "--profile", action="store_true", help="run profiler")
+    parser.add_argument("-o", "--outfile", type=str, help="print profiler output to file")
+    parser.add_argument(
+        "-r",
+        "--repetitions",
+        type=int,
+        default=1,
+        help="number of runs per specification, the fastest run is reported (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of parallel processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "specs",
+        nargs="*",
+        default=list(SPECS),
+        help=f"benchmarked specifications: {', '.join(SPECS)} (default: all)",
+    )
+    args = parser.parse_args(sys.argv[1:])
+    for name in args.specs:
+        if name not in SPECS:
+            parser.error(f"unknown specification: {name}")
+    if args.profile:
+        print("Profiling...")  # noqa: T201
+
+        def profile() -> None:
+            for name in args.specs:
+                check(SPECS[name], args.workers)
+
+        cProfile.run("profile()", args.outfile, "tottime")
+    else:
+        run(args.specs, args.workers, args.repetitions)
@@ -7,23 +7,13 @@ from cobrafuzz.main import CobraFuzz
 def fuzz(buf: bytes) -> None:
     import sys
 
-    from rflx.model import Cache, Digest
+    from rflx.model import NeverVerify
     from rflx.rapidflux import RecordFluxError
     from rflx.specification import parser
 
-    class SilentlyNeverVerify(Cache):
-        def __init__(self) -> None:
-            pass
-
-        def is_verified(self, _: Digest) -> bool:
-            return True
-
-        def add_verified(self, _digest: Digest) -> None:
-            pass
-
     try:
         string = buf.decode("utf-8")
-        p = parser.Parser(cache=SilentlyNeverVerify())
+        p = parser.Parser(cache=NeverVerify(warn_skipped=False))
         p.parse_string(string)
         p.create_model()
     except (UnicodeDecodeError, RecordFluxError):